@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
+
+    def ready(self):
+        from django.core import checks
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+        from .database import close_unusable_connections
+        from .metrics import install_query_counter
+        from .response_cache import check_response_cache
+        request_started.connect(close_unusable_connections)
+        connection_created.connect(install_query_counter)
+        checks.register(check_response_cache, checks.Tags.caches)
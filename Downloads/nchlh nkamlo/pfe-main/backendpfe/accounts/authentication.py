@@ -0,0 +1,105 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    """
+    Short-lived cache of authenticated users, keyed by ``(user id, version)``.
+
+    Users are kept ``ttl`` seconds in an in-process LRU of ``max_entries``
+    and, when ``alias`` names an entry of ``CACHES``, in that shared backend
+    too. ``invalidate()`` bumps the version of a user, which orphans all its
+    cached entries at once; with a shared backend the version lives there,
+    so every worker sees the bump on its next request.
+    """
+
+    def __init__(self, ttl=60, max_entries=1024, alias=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.alias = alias
+        self.entries = OrderedDict()
+        self.versions = {}
+        self.lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.alias] if self.alias else None
+
+    def get_version(self, user_id):
+        if self.shared is not None:
+            return self.shared.get('auth-user-version:%s' % user_id, 0)
+        return self.versions.get(user_id, 0)
+
+    def get_or_load(self, user_id, load):
+        """The cached user, or ``load()`` (whose exceptions propagate) stored."""
+        version = self.get_version(user_id)
+        key = (user_id, version)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.entries.move_to_end(key)
+                return copy.copy(entry[1])
+
+        shared_key = 'auth-user:%s:%s' % key
+        user = self.shared.get(shared_key) if self.shared is not None else None
+        if user is None:
+            user = load()
+            if self.shared is not None:
+                self.shared.set(shared_key, user, self.ttl)
+
+        with self.lock:
+            self.entries[key] = (now + self.ttl, user)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return copy.copy(user)
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.versions[user_id] = self.versions.get(user_id, 0) + 1
+            for key in [key for key in self.entries if key[0] == user_id]:
+                del self.entries[key]
+        if self.shared is not None:
+            version_key = 'auth-user-version:%s' % user_id
+            try:
+                self.shared.incr(version_key)
+            except ValueError:
+                self.shared.set(version_key, 1, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache(
+    ttl=getattr(settings, 'AUTH_USER_CACHE_TTL', 60),
+    max_entries=getattr(settings, 'AUTH_USER_CACHE_SIZE', 1024),
+    alias=getattr(settings, 'AUTH_USER_CACHE_ALIAS', None),
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that resolves the user of a token from
+    ``user_cache`` instead of reading the user row on every request.
+    Views that modify a user must call ``user_cache.invalidate(user.pk)``.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        load = super().get_user
+        return user_cache.get_or_load(user_id, lambda: load(validated_token))
@@ -0,0 +1,41 @@
+import asyncio
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def call_with_own_connection(function, *args, **kwargs):
+    """
+    ``function(*args, **kwargs)`` for a thread outside the request cycle,
+    closing the connections it opened before returning.
+
+    Django's request_finished handler only recycles the connections of the
+    thread that handles the request, and under WSGI every async_to_sync()
+    call starts an event loop with an executor of its own: a connection
+    left open in one of its threads (CONN_MAX_AGE) would never be reused,
+    only closed when the garbage collector gets to it.
+    """
+    try:
+        return function(*args, **kwargs)
+    finally:
+        connections.close_all()
+
+
+async def gather_in_threads(functions):
+    return await asyncio.gather(*[
+        sync_to_async(call_with_own_connection, thread_sensitive=False)(function) for function in functions
+    ])
+
+
+def run_concurrently(*functions, using=DEFAULT_DB_ALIAS):
+    """
+    The results of ``functions``, each called in a thread of its own with
+    its own database connection, so that their queries run at the same
+    time. Each function must evaluate its querysets itself.
+
+    Inside a transaction they are called one after the other on the current
+    connection instead: other connections would not see its writes.
+    """
+    if len(functions) < 2 or connections[using].in_atomic_block:
+        return [function() for function in functions]
+    return async_to_sync(gather_in_threads)(functions)
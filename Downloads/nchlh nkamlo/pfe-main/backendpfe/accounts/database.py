@@ -0,0 +1,99 @@
+import asyncio
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Set once the current request (or thread, outside requests) has written.
+primary_pinned = ContextVar('primary_pinned', default=False)
+
+
+def get_replica_alias():
+    return getattr(settings, 'READ_REPLICA_ALIAS', None)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends the reads of the accounts models to ``settings.READ_REPLICA_ALIAS``
+    and everything else to the primary (``default``).
+
+    Reads stay on the primary once the request has written anything, so
+    that it reads its own writes despite the replication lag, and inside a
+    transaction of the primary (its reads may be locking or depend on
+    uncommitted rows). Queries run on an explicit alias (``using()``, raw
+    cursors) are not routed.
+    """
+    app_label = 'accounts'
+
+    def db_for_read(self, model, **hints):
+        replica = get_replica_alias()
+        if not replica or model._meta.app_label != self.app_label:
+            return None
+        if primary_pinned.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        primary_pinned.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, get_replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets the schema through replication.
+        if db == get_replica_alias():
+            return False
+        return None
+
+
+class PrimaryPinningMiddleware:
+    """
+    Starts every request with its reads on the replica (see PrimaryReplicaRouter).
+
+    Async capable: under ASGI a sync-only middleware would run every request
+    on the one thread Django 3.2 shares between the sync code of all of them.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # How Django's MiddlewareMixin marks itself as a coroutine.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        token = primary_pinned.set(False)
+        try:
+            return self.get_response(request)
+        finally:
+            primary_pinned.reset(token)
+
+    async def __acall__(self, request):
+        token = primary_pinned.set(False)
+        try:
+            return await self.get_response(request)
+        finally:
+            primary_pinned.reset(token)
+
+
+def close_unusable_connections(**kwargs):
+    """
+    Health check of the persistent connections (CONN_MAX_AGE): one whose
+    database entry has ``CONN_HEALTH_CHECKS`` is pinged before it is reused
+    by a new request and closed if the server dropped it (e.g. after MySQL's
+    wait_timeout), instead of failing the request's first query.
+
+    Django 4.1 does this itself for the same setting; 3.2 ignores it.
+    """
+    for connection in connections.all():
+        if connection.connection is None or not connection.settings_dict.get('CONN_HEALTH_CHECKS'):
+            continue
+        if not connection.is_usable():
+            connection.close()
@@ -0,0 +1,161 @@
+from decimal import Decimal
+from functools import partial
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F, Q, Sum
+from .concurrency import run_concurrently
+from .models import Ap, Facture, Marche, Projet, ProjetFinancialRollup, SousProjet
+
+ZERO = Decimal('0')
+
+TOTAL_FIELDS = ['total_ap', 'total_marche', 'total_facture_ttc', 'total_facture_net_ht', 'total_paye']
+
+# Rollup rows are keyed by (scope, pk), scope being 'projet' or 'sous_projet'.
+ROLLUP_SCOPES = {
+    'projet': (Projet, 'id_projet', 'id_sous_projet'),
+    'sous_projet': (SousProjet, 'id_sous_projet', 'id_projet'),
+}
+
+
+def get_project_financials(projet_ids, date_from=None, date_to=None):
+    """
+    Financial totals of each project, keyed by ``id_projet``.
+
+    Without a date window the totals are read from the incrementally
+    maintained ``projet_financial_rollup`` table (one query). Otherwise one
+    grouped query per table (ap, marche, facture) is run, whatever the
+    number of projects; the three run concurrently. ``Ap`` has no date column, so the date window only
+    applies to ``Marche.date_marche`` and ``Facture.date_facturation``.
+    """
+    totals = {pk: dict.fromkeys(TOTAL_FIELDS, ZERO) for pk in projet_ids}
+    if not totals:
+        return totals
+
+    if date_from is None and date_to is None:
+        rollups = (ProjetFinancialRollup.objects
+                   .filter(id_projet__in=projet_ids, id_sous_projet__isnull=True)
+                   .values('id_projet', *TOTAL_FIELDS))
+        for row in rollups:
+            totals[row.pop('id_projet')].update(row)
+        return totals
+
+    marche_filter = Q(id_projet__in=projet_ids)
+    facture_filter = Q(id_projet__in=projet_ids)
+    if date_from:
+        marche_filter &= Q(date_marche__gte=date_from)
+        facture_filter &= Q(date_facturation__gte=date_from)
+    if date_to:
+        marche_filter &= Q(date_marche__lte=date_to)
+        facture_filter &= Q(date_facturation__lte=date_to)
+
+    aps = (Ap.objects.filter(id_projet__in=projet_ids)
+           .values('id_projet').order_by()
+           .annotate(total_ap=Sum('montant_ap')))
+    marches = (Marche.objects.filter(marche_filter)
+               .values('id_projet').order_by()
+               .annotate(total_marche=Sum('prix_da')))
+    factures = (Facture.objects.filter(facture_filter)
+                .values('id_projet').order_by()
+                .annotate(total_facture_ttc=Sum('montant_ttc'),
+                          total_facture_net_ht=Sum('montant_net_ht'),
+                          total_paye=Sum('montant_ttc', filter=Q(date_ordre_virement__isnull=False))))
+
+    for rows in run_concurrently(*[partial(list, queryset) for queryset in (aps, marches, factures)]):
+        for row in rows:
+            projet_totals = totals[row.pop('id_projet')]
+            for field, value in row.items():
+                projet_totals[field] = value or ZERO
+    return totals
+
+
+def add_rollup_contributions(deltas, instance, sign=1):
+    """Adds what one Ap, Marche or Facture row weighs in the rollup to ``deltas``."""
+    if isinstance(instance, Ap):
+        contributions = [('projet', instance.id_projet_id, {'total_ap': instance.montant_ap})]
+    elif isinstance(instance, Marche):
+        contributions = [('projet', instance.id_projet_id, {'total_marche': instance.prix_da})]
+    else:
+        amounts = {
+            'total_facture_ttc': instance.montant_ttc,
+            'total_facture_net_ht': instance.montant_net_ht,
+            'total_paye': instance.montant_ttc if instance.date_ordre_virement else None,
+        }
+        contributions = [
+            ('projet', instance.id_projet_id, amounts),
+            ('sous_projet', instance.id_sous_projet_id, amounts),
+        ]
+
+    for scope, pk, amounts in contributions:
+        if pk is None:
+            continue
+        key_deltas = deltas.setdefault((scope, pk), {})
+        for field, amount in amounts.items():
+            if amount:
+                key_deltas[field] = key_deltas.get(field, ZERO) + sign * Decimal(amount)
+    return deltas
+
+
+def apply_rollup_change(previous, current, using=DEFAULT_DB_ALIAS):
+    """Moves the rollup from the ``previous`` to the ``current`` version of a row."""
+    deltas = {}
+    if previous is not None:
+        add_rollup_contributions(deltas, previous, -1)
+    if current is not None:
+        add_rollup_contributions(deltas, current, 1)
+    apply_rollup_deltas(deltas, using)
+
+
+def apply_rollup_deltas(deltas, using=DEFAULT_DB_ALIAS):
+    """
+    Adds ``{(scope, pk): {field: amount}}`` to the rollup rows with in-place
+    ``UPDATE ... SET total = total + delta`` statements. Must run inside the
+    transaction of the write it accounts for.
+    """
+    rollups = ProjetFinancialRollup.objects.using(using)
+    for (scope, pk), fields in deltas.items():
+        fields = {field: amount for field, amount in fields.items() if amount}
+        if not fields:
+            continue
+        parent_model, key_field, other_field = ROLLUP_SCOPES[scope]
+        lookup = {key_field: pk, other_field: None}
+        updates = {field: F(field) + amount for field, amount in fields.items()}
+        if rollups.filter(**lookup).update(**updates):
+            continue
+        # First write for this key: lock the parent row so that concurrent
+        # writers cannot both insert it.
+        list(parent_model.objects.using(using).select_for_update().filter(pk=pk).values_list('pk'))
+        if not rollups.filter(**lookup).update(**updates):
+            rollups.create(**{key_field + '_id': pk}, **fields)
+
+
+def compute_financial_rollup(using=DEFAULT_DB_ALIAS):
+    """Totals of every project and sub-project, computed from scratch."""
+    rollup = {}
+
+    def add(scope, rows):
+        for row in rows:
+            pk = row.pop('key')
+            if pk is not None:
+                totals = rollup.setdefault((scope, pk), dict.fromkeys(TOTAL_FIELDS, ZERO))
+                totals.update({field: value or ZERO for field, value in row.items()})
+
+    facture_totals = dict(
+        total_facture_ttc=Sum('montant_ttc'),
+        total_facture_net_ht=Sum('montant_net_ht'),
+        total_paye=Sum('montant_ttc', filter=Q(date_ordre_virement__isnull=False)),
+    )
+    aps, marches, factures = (model.objects.using(using).order_by() for model in (Ap, Marche, Facture))
+    add('projet', aps.values(key=F('id_projet')).annotate(total_ap=Sum('montant_ap')))
+    add('projet', marches.values(key=F('id_projet')).annotate(total_marche=Sum('prix_da')))
+    add('projet', factures.values(key=F('id_projet')).annotate(**facture_totals))
+    add('sous_projet', factures.values(key=F('id_sous_projet')).annotate(**facture_totals))
+    return rollup
+
+
+def get_stored_financial_rollup(using=DEFAULT_DB_ALIAS):
+    rollup = {}
+    for row in ProjetFinancialRollup.objects.using(using).values('id_projet', 'id_sous_projet', *TOTAL_FIELDS):
+        projet_id, sous_projet_id = row.pop('id_projet'), row.pop('id_sous_projet')
+        key = ('projet', projet_id) if sous_projet_id is None else ('sous_projet', sous_projet_id)
+        rollup[key] = row
+    return rollup
@@ -0,0 +1,249 @@
+import csv
+import decimal
+import io
+import time
+import zipfile
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from .financials import add_rollup_contributions, apply_rollup_deltas
+from .models import Facture, Marche, Projet
+
+# Marker for lookup keys (project name, numero de marche) shared by several rows.
+AMBIGUOUS = object()
+
+
+class ImportFileError(Exception):
+    pass
+
+
+def read_rows(fileobj, filename):
+    """
+    Yields ``(line_number, {column: value})`` from a CSV or XLSX file, one row
+    at a time, without loading the file in memory.
+    """
+    try:
+        if filename.lower().endswith('.xlsx'):
+            yield from read_xlsx_rows(fileobj)
+        else:
+            reader = csv.DictReader(io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline=''))
+            for row in reader:
+                yield reader.line_num, row
+    except (csv.Error, UnicodeDecodeError, zipfile.BadZipFile) as exc:
+        raise ImportFileError('Unreadable file: %s' % exc)
+
+
+def read_xlsx_rows(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError('XLSX import requires the openpyxl package')
+
+    rows = load_workbook(fileobj, read_only=True, data_only=True).active.iter_rows(values_only=True)
+    headers = ['' if header is None else str(header).strip() for header in next(rows, ())]
+    for line, values in enumerate(rows, start=2):
+        if any(value not in (None, '') for value in values):
+            yield line, dict(zip(headers, map(read_xlsx_value, values)))
+
+
+def read_xlsx_value(value):
+    # Number cells come back as floats: 19.99 is 19.989999999999998436805981327779591083526611328125
+    # as a Decimal, more decimal places than the money columns hold. The
+    # shortest repr is the number as typed in the sheet.
+    if isinstance(value, float):
+        return decimal.Decimal(repr(value))
+    return value
+
+
+def build_lookup(pairs):
+    """``{normalized key: pk}``; a key found on several rows maps to AMBIGUOUS."""
+    lookup = {}
+    for key, pk in pairs:
+        lookup[key] = AMBIGUOUS if key in lookup else pk
+    return lookup
+
+
+def normalize_name(value):
+    # Same matching as the MySQL case-insensitive collation.
+    return str(value).strip().casefold()
+
+
+class ImportReport:
+    max_kept_errors = 1000
+
+    def __init__(self, error_writer=None):
+        self.rows = 0
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []
+        self.error_writer = error_writer
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+
+    def add_error(self, line, row, errors):
+        self.error_count += 1
+        if len(self.errors) < self.max_kept_errors:
+            self.errors.append({'line': line, 'errors': errors})
+        if self.error_writer is not None:
+            self.error_writer.write(line, row, errors)
+
+    def finish(self):
+        self.elapsed = time.monotonic() - self.started
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'imported': self.imported,
+            'rejected': self.error_count,
+            'seconds': round(self.elapsed, 3),
+            'rows_per_second': round(self.rows / self.elapsed) if self.elapsed else None,
+            'errors': self.errors,
+        }
+
+
+class ErrorFileWriter:
+    """Writes every rejected row, with its line number and errors, to a CSV file."""
+
+    def __init__(self, stream):
+        self.writer = csv.writer(stream)
+        self.headers = None
+
+    def write(self, line, row, errors):
+        if self.headers is None:
+            self.headers = list(row)
+            self.writer.writerow(['line', 'errors'] + self.headers)
+        messages = '; '.join('%s: %s' % (column, ' '.join(errors[column])) for column in errors)
+        self.writer.writerow([line, messages] + [row.get(header) for header in self.headers])
+
+
+class SpreadsheetImporter:
+    """
+    Imports spreadsheet rows into ``model`` in chunks of ``batch_size``.
+
+    Each value of ``columns`` is validated with the model field's ``clean()``.
+    References (project names, numeros de marche) are resolved through
+    lookup dicts built once before the import. Valid rows are written with
+    ``bulk_create``; the financial rollup is updated in the same transaction.
+    """
+    model = None
+    columns = []
+    batch_size = 2000
+
+    def __init__(self, batch_size=None):
+        if batch_size:
+            self.batch_size = batch_size
+        self.fields = [self.model._meta.get_field(name) for name in self.columns]
+        self.projets = build_lookup(
+            (normalize_name(nom), pk) for pk, nom in Projet.objects.values_list('id_projet', 'nom_projet')
+        )
+
+    def run(self, rows, error_writer=None):
+        report = ImportReport(error_writer)
+        batch = []
+        for line, row in rows:
+            report.rows += 1
+            instance, errors = self.build_instance(row)
+            if errors:
+                report.add_error(line, row, errors)
+                continue
+            batch.append(instance)
+            if len(batch) >= self.batch_size:
+                self.write(batch)
+                report.imported += len(batch)
+                batch = []
+        if batch:
+            self.write(batch)
+            report.imported += len(batch)
+        report.finish()
+        return report
+
+    def build_instance(self, row):
+        values, errors = {}, {}
+        for field in self.fields:
+            raw = row.get(field.name)
+            if isinstance(raw, str):
+                raw = raw.strip() or None
+            if raw is None and field.null:
+                continue
+            try:
+                values[field.attname] = field.clean(raw, None)
+            except ValidationError as exc:
+                errors[field.name] = exc.messages
+        self.resolve_references(row, values, errors)
+        if errors:
+            return None, errors
+        return self.model(**values), None
+
+    def resolve_references(self, row, values, errors):
+        projet = row.get('nom_projet')
+        if projet not in (None, ''):
+            values['id_projet_id'] = self.resolve(self.projets, projet, normalize_name(projet), 'nom_projet', errors)
+
+    def resolve(self, lookup, value, key, column, errors):
+        pk = lookup.get(key)
+        if pk is None:
+            errors[column] = ['Unknown value "%s".' % value]
+        elif pk is AMBIGUOUS:
+            errors[column] = ['"%s" matches several rows.' % value]
+            return None
+        return pk
+
+    def write(self, batch):
+        deltas = {}
+        for instance in batch:
+            add_rollup_contributions(deltas, instance)
+        with transaction.atomic():
+            self.model.objects.bulk_create(batch, batch_size=self.batch_size)
+            apply_rollup_deltas(deltas)
+
+
+class MarcheImporter(SpreadsheetImporter):
+    """Columns: the Marche fields below, plus ``nom_projet``."""
+    model = Marche
+    columns = [
+        'numero_marche', 'date_marche', 'description_marche', 'numero_appel_dof', 'visa_cme',
+        'date_visa_cme', 'prix_da', 'prix_devise', 'type', 'date_notification',
+    ]
+
+
+class FactureImporter(SpreadsheetImporter):
+    """
+    Columns: the Facture fields below, plus ``nom_projet`` and
+    ``numero_marche`` (as in the factures export). Without a ``nom_projet``
+    the project of the marche is used; a ``nom_projet`` naming another
+    project than the marche's rejects the row.
+    """
+    model = Facture
+    columns = [
+        'numero_facture', 'designation', 'date_facturation', 'date_reception', 'brut_ht', 'montant_net_ht',
+        'montant_tva', 'montant_ttc', 'date_ordre_virement', 'numero_ordre_virement',
+    ]
+
+    def __init__(self, batch_size=None):
+        super().__init__(batch_size)
+        marches = Marche.objects.values_list('numero_marche', 'id_marche', 'id_projet')
+        self.marches = build_lookup((numero, (pk, projet_id)) for numero, pk, projet_id in marches)
+        self.numero_field = Marche._meta.get_field('numero_marche')
+
+    def resolve_references(self, row, values, errors):
+        super().resolve_references(row, values, errors)
+        numero = row.get('numero_marche')
+        if numero in (None, ''):
+            return
+        try:
+            key = self.numero_field.to_python(numero)
+        except ValidationError as exc:
+            errors['numero_marche'] = exc.messages
+            return
+        marche = self.resolve(self.marches, numero, key, 'numero_marche', errors)
+        if marche:
+            values['id_marche_id'], marche_projet_id = marche
+            projet_id = values.setdefault('id_projet_id', marche_projet_id)
+            if None not in (projet_id, marche_projet_id) and projet_id != marche_projet_id:
+                errors['nom_projet'] = ['Marche "%s" belongs to another project.' % numero]
+
+
+IMPORTERS = {
+    'factures': FactureImporter,
+    'marches': MarcheImporter,
+}
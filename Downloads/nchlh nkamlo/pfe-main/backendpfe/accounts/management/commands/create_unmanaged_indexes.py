@@ -0,0 +1,39 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates the Meta.indexes of the unmanaged accounts models (managed = False), "
+        "which migrations never touch. Indexes that already exist are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--dry-run', action='store_true', help='Print the DDL instead of running it.')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        dry_run = options['dry_run']
+        created = 0
+
+        with connection.schema_editor(collect_sql=dry_run) as schema_editor:
+            for model in apps.get_app_config('accounts').get_models():
+                if model._meta.managed or not model._meta.indexes:
+                    continue
+                with connection.cursor() as cursor:
+                    existing = connection.introspection.get_constraints(cursor, model._meta.db_table)
+                for index in model._meta.indexes:
+                    if index.name in existing:
+                        continue
+                    schema_editor.add_index(model, index)
+                    created += 1
+                    if not dry_run:
+                        self.stdout.write('Created %s on %s' % (index.name, model._meta.db_table))
+
+        if dry_run:
+            for statement in schema_editor.collected_sql:
+                self.stdout.write(statement)
+        else:
+            self.stdout.write(self.style.SUCCESS('%d indexes created' % created))
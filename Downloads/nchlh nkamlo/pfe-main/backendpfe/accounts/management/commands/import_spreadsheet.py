@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from accounts.importers import IMPORTERS, ErrorFileWriter, ImportFileError, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports factures or marches from a CSV or XLSX file in chunks, writes the "
+        "rejected rows to an error file and reports the throughput."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTERS))
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--errors-file', help='Defaults to <path>.errors.csv')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        errors_path = options['errors_file'] or path + '.errors.csv'
+        importer = IMPORTERS[options['kind']](batch_size=options['batch_size'])
+
+        try:
+            with open(path, 'rb') as source, open(errors_path, 'w', newline='', encoding='utf-8') as errors_file:
+                report = importer.run(read_rows(source, path), ErrorFileWriter(errors_file))
+        except (OSError, ImportFileError) as exc:
+            raise CommandError(str(exc))
+
+        stats = report.as_dict()
+        self.stdout.write('%(rows)d rows read in %(seconds)ss (%(rows_per_second)s rows/s)' % stats)
+        if report.error_count:
+            self.stdout.write(self.style.WARNING(
+                '%d rows imported, %d rejected: see %s' % (report.imported, report.error_count, errors_path)))
+        else:
+            self.stdout.write(self.style.SUCCESS('%d rows imported' % report.imported))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from accounts.financials import TOTAL_FIELDS, ZERO, compute_financial_rollup, get_stored_financial_rollup
+from accounts.models import ProjetFinancialRollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the projet_financial_rollup table from the ap, marche and facture "
+        "tables, or with --verify only reports the rows that have drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help='Compare instead of rebuilding; exit 1 on drift.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        expected = compute_financial_rollup(using)
+
+        if options['verify']:
+            self.verify(expected, using)
+            return
+
+        rows = []
+        for (scope, pk), totals in expected.items():
+            key = {'id_projet_id': pk} if scope == 'projet' else {'id_sous_projet_id': pk}
+            rows.append(ProjetFinancialRollup(**key, **totals))
+
+        with transaction.atomic(using=using):
+            rollups = ProjetFinancialRollup.objects.using(using)
+            rollups.all().delete()
+            rollups.bulk_create(rows, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS('Rebuilt %d rollup rows' % len(rows)))
+
+    def verify(self, expected, using):
+        stored = get_stored_financial_rollup(using)
+        empty = dict.fromkeys(TOTAL_FIELDS, ZERO)
+        drifted = 0
+        for key in sorted(set(expected) | set(stored)):
+            should_be, actual = expected.get(key, empty), stored.get(key, empty)
+            for field in TOTAL_FIELDS:
+                if should_be[field] != actual[field]:
+                    drifted += 1
+                    self.stdout.write('%s %s %s: stored %s, expected %s' % (
+                        key[0], key[1], field, actual[field], should_be[field]))
+
+        if drifted:
+            raise CommandError('%d rollup totals have drifted; run rebuild_financial_rollup' % drifted)
+        self.stdout.write(self.style.SUCCESS('Rollup is consistent (%d rows)' % len(stored)))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from accounts.search import rebuild_search_index, uses_fulltext
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the search_term inverted index used by /api/search/ on databases "
+        "without MySQL FULLTEXT indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if uses_fulltext(using):
+            raise CommandError('%s is searched through its FULLTEXT indexes; there is nothing to rebuild' % using)
+
+        with transaction.atomic(using=using):
+            created = rebuild_search_index(using, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS('Indexed %d terms' % created))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+from accounts.response_cache import response_cache
+
+
+class Command(BaseCommand):
+    help = "Prints the hit and miss counters of the GET response cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them.')
+
+    def handle(self, *args, **options):
+        if response_cache.cache is None:
+            raise CommandError('The response cache is disabled (RESPONSE_CACHE_ALIAS is None)')
+
+        stats = response_cache.stats()
+        ratio = '-' if stats['hit_ratio'] is None else '%.1f%%' % (stats['hit_ratio'] * 100)
+        self.stdout.write('hits: %d, misses: %d, hit ratio: %s' % (stats['hits'], stats['misses'], ratio))
+        if options['reset']:
+            response_cache.reset_stats()
@@ -0,0 +1,55 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+from accounts.search import uses_fulltext
+from accounts.seeding import DEFAULT_SIZES, SeedPlan, get_offsets, seed_database
+
+# Tables every other one points to.
+REQUIRED_TABLES = ('utilisateurs', 'projets', 'sous_projets')
+
+
+class Command(BaseCommand):
+    help = (
+        "Appends a synthetic dataset (5k projets, 50k sous-projets, 2M factures... at "
+        "--scale 1) to the database, the same for the same --seed, then rebuilds the "
+        "financial rollup and the search index."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiplies every table size')
+        parser.add_argument('--size', action='append', default=[], metavar='TABLE=ROWS',
+                            help='Rows of one table, e.g. factures=100000 (repeatable): %s' % ', '.join(DEFAULT_SIZES))
+        parser.add_argument('--skew', type=float, default=1.0, help='Zipf exponent of the projet sizes')
+        parser.add_argument('--workers', type=int, default=1, help='Processes writing at once')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--skip-rebuild', action='store_true', help='Leave the rollup and search index alone')
+
+    def handle(self, *args, **options):
+        sizes = self.get_sizes(options['scale'], options['size'])
+        using = options['database']
+        plan = SeedPlan(sizes, options['seed'], get_offsets(using), skew=options['skew'], using=using,
+                        batch_size=options['batch_size'])
+        seed_database(plan, workers=options['workers'], progress=self.report)
+
+        if not options['skip_rebuild']:
+            call_command('rebuild_financial_rollup', database=using, stdout=self.stdout)
+            if not uses_fulltext(using):
+                call_command('rebuild_search_index', database=using, stdout=self.stdout)
+
+    def get_sizes(self, scale, overrides):
+        sizes = {name: int(round(rows * scale)) for name, rows in DEFAULT_SIZES.items()}
+        for override in overrides:
+            name, _, rows = override.partition('=')
+            if name not in sizes or not rows.isdigit():
+                raise CommandError('Invalid --size %r: expected TABLE=ROWS with TABLE in %s'
+                                   % (override, ', '.join(DEFAULT_SIZES)))
+            sizes[name] = int(rows)
+        empty = [name for name in REQUIRED_TABLES if not sizes[name]]
+        if empty:
+            raise CommandError('At least one row is needed in %s' % ', '.join(empty))
+        return sizes
+
+    def report(self, name, rows, seconds):
+        self.stdout.write('%-18s %9d rows %8.1fs %10.0f rows/s' % (name, rows, seconds, rows / seconds if seconds else 0))
@@ -0,0 +1,230 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+# Upper bounds of the latency histogram buckets, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METHODS = {'GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'}
+
+# The fields of a row of EndpointMetrics, followed by one count per bucket
+# and one for +Inf.
+COUNT, SECONDS, QUERIES, DB_SECONDS, RESPONSE_BYTES, FIRST_BUCKET = range(6)
+
+# [queries, seconds] of the database work of the request being recorded.
+# sync_to_async copies it into the threads of run_concurrently, so their
+# queries count too (an increment racing another one may be lost there).
+current_queries = ContextVar('current_queries', default=None)
+
+
+class EndpointMetrics:
+    """
+    Request metrics of this process by (URL name, method).
+
+    Every thread adds to a shard of its own, so recording a request takes
+    no lock and never waits for another thread; ``collect()`` sums the
+    shards when the metrics are scraped. When a thread is gone, its shard
+    is added to ``retired`` and dropped, so that the counters never go down
+    and the executor threads of async_to_sync() leave nothing behind.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.reset()
+
+    def reset(self):
+        self.lock = threading.Lock()
+        self.shards = {}
+        self.retired = {}
+        self.local = threading.local()
+
+    def get_row(self, key):
+        try:
+            shard = self.local.shard
+        except AttributeError:
+            shard = self.local.shard = {}
+            with self.lock:
+                self.shards[id(shard)] = shard
+            weakref.finalize(threading.current_thread(), self.retire, shard)
+        row = shard.get(key)
+        if row is None:
+            row = shard[key] = [0] * (FIRST_BUCKET + len(self.buckets) + 1)
+        return row
+
+    def record(self, endpoint, method, seconds, queries, db_seconds, response_bytes):
+        row = self.get_row((endpoint, method))
+        row[COUNT] += 1
+        row[SECONDS] += seconds
+        row[QUERIES] += queries
+        row[DB_SECONDS] += db_seconds
+        row[RESPONSE_BYTES] += response_bytes
+        row[FIRST_BUCKET + bisect_left(self.buckets, seconds)] += 1
+
+    def add_response_bytes(self, endpoint, method, response_bytes):
+        self.get_row((endpoint, method))[RESPONSE_BYTES] += response_bytes
+
+    def retire(self, shard):
+        """Adds the shard of a finished thread to ``retired``, unless reset() dropped it already."""
+        with self.lock:
+            if self.shards.pop(id(shard), None) is shard:
+                add_rows(self.retired, shard)
+
+    def collect(self):
+        """``{(endpoint, method): row}`` summed over the shards."""
+        totals = {}
+        with self.lock:
+            for shard in [self.retired, *self.shards.values()]:
+                add_rows(totals, shard)
+        return totals
+
+    def render(self, sample_rate=1.0):
+        """The metrics in the Prometheus text exposition format."""
+        rows = sorted(self.collect().items())
+        lines = [
+            '# HELP http_request_duration_seconds Latency of the sampled requests.',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        for (endpoint, method), row in rows:
+            labels = 'endpoint="%s",method="%s"' % (escape_label(endpoint), method)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), row[FIRST_BUCKET:]):
+                cumulative += count
+                lines.append('http_request_duration_seconds_bucket{%s,le="%s"} %d' % (labels, bound, cumulative))
+            lines.append('http_request_duration_seconds_sum{%s} %r' % (labels, row[SECONDS]))
+            lines.append('http_request_duration_seconds_count{%s} %d' % (labels, row[COUNT]))
+
+        for name, field, kind, help_text in [
+            ('http_request_db_queries_total', QUERIES, '%d', 'Database queries of the sampled requests.'),
+            ('http_request_db_seconds_total', DB_SECONDS, '%r', 'Time spent in the database by the sampled requests.'),
+            ('http_response_size_bytes_total', RESPONSE_BYTES, '%d', 'Body bytes of the sampled responses.'),
+        ]:
+            lines.append('# HELP %s %s' % (name, help_text))
+            lines.append('# TYPE %s counter' % name)
+            for (endpoint, method), row in rows:
+                lines.append(('%s{endpoint="%s",method="%s"} ' + kind) % (
+                    name, escape_label(endpoint), method, row[field]))
+
+        lines.append('# HELP http_metrics_sample_rate Share of the requests that are recorded.')
+        lines.append('# TYPE http_metrics_sample_rate gauge')
+        lines.append('http_metrics_sample_rate %r' % float(sample_rate))
+        return '\n'.join(lines) + '\n'
+
+
+def add_rows(totals, shard):
+    for key, row in list(shard.items()):
+        total = totals.get(key)
+        if total is None:
+            totals[key] = list(row)
+        else:
+            totals[key] = [a + b for a, b in zip(total, row)]
+
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+endpoint_metrics = EndpointMetrics()
+
+
+def count_query(execute, sql, params, many, context):
+    """Database execute wrapper adding each query to the request being recorded, if any."""
+    queries = current_queries.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        queries[0] += 1
+        queries[1] += time.perf_counter() - started
+
+
+def install_query_counter(connection, **kwargs):
+    """connection_created receiver: counts the queries of every connection (see count_query)."""
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+class MetricsMiddleware:
+    """
+    Records the latency, database queries and time, and response size of
+    a ``METRICS_SAMPLE_RATE`` share of the requests in ``endpoint_metrics``,
+    by URL name; requests that resolve to no URL are recorded as
+    ``unmatched``. The body of a streaming response is counted as it is
+    sent, its queries are not.
+
+    Put it first in MIDDLEWARE, to time the other middleware too. It is
+    async capable, so that it does not hold every ASGI request on the one
+    thread Django 3.2 shares between their sync code.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'METRICS_SAMPLE_RATE', 1.0)
+        if not self.sample_rate:
+            raise MiddlewareNotUsed
+        if asyncio.iscoroutinefunction(get_response):
+            # How Django's MiddlewareMixin marks itself as a coroutine.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def is_sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not self.is_sampled():
+            return self.get_response(request)
+
+        queries = [0, 0.0]
+        token = current_queries.set(queries)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_queries.reset(token)
+        return self.record(request, response, time.perf_counter() - started, queries)
+
+    async def __acall__(self, request):
+        if not self.is_sampled():
+            return await self.get_response(request)
+
+        queries = [0, 0.0]
+        token = current_queries.set(queries)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_queries.reset(token)
+        return self.record(request, response, time.perf_counter() - started, queries)
+
+    def record(self, request, response, seconds, queries):
+        match = request.resolver_match
+        endpoint = match.view_name if match else 'unmatched'
+        method = request.method if request.method in METHODS else 'other'
+        if response.streaming:
+            response.streaming_content = count_bytes(response.streaming_content, endpoint, method)
+            response_bytes = 0
+        else:
+            response_bytes = len(response.content)
+        endpoint_metrics.record(endpoint, method, seconds, queries[0], queries[1], response_bytes)
+        return response
+
+
+def count_bytes(chunks, endpoint, method):
+    sent = 0
+    try:
+        for chunk in chunks:
+            sent += len(chunk)
+            yield chunk
+    finally:
+        endpoint_metrics.add_response_bytes(endpoint, method, sent)
@@ -0,0 +1,129 @@
+# Generated by Django 3.2 on 2026-10-18 20:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    # These tables already exist in the database (they were switched to
+    # managed=True without a migration), so only the migration state is
+    # brought up to date here.
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Utilisateur',
+                    fields=[
+                        ('id_utilisateur', models.AutoField(primary_key=True, serialize=False)),
+                        ('email', models.EmailField(max_length=100, unique=True)),
+                        ('nom', models.CharField(max_length=100)),
+                        ('password', models.CharField(max_length=255)),
+                        ('role_de_utilisateur', models.CharField(max_length=50)),
+                        ('numero_de_tel', models.CharField(blank=True, max_length=10, null=True, unique=True)),
+                        ('created_at', models.DateTimeField(auto_now_add=True)),
+                        ('sexe', models.CharField(blank=True, max_length=10, null=True)),
+                        ('etat', models.CharField(blank=True, max_length=20, null=True)),
+                        ('prenom', models.CharField(blank=True, max_length=20, null=True)),
+                        ('matricule', models.IntegerField(blank=True, null=True, unique=True)),
+                        ('is_superuser', models.BooleanField(default=False)),
+                        ('is_active', models.BooleanField(default=True)),
+                        ('is_staff', models.BooleanField(default=False)),
+                        ('last_login', models.DateTimeField(blank=True, null=True)),
+                        ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.Group', verbose_name='groups')),
+                        ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.Permission', verbose_name='user permissions')),
+                    ],
+                    options={
+                        'db_table': 'utilisateur',
+                    },
+                ),
+                migrations.CreateModel(
+                    name='Projet',
+                    fields=[
+                        ('id_projet', models.AutoField(primary_key=True, serialize=False)),
+                        ('nom_projet', models.CharField(max_length=30)),
+                        ('description_de_projet', models.CharField(max_length=30)),
+                        ('date_debut_de_projet', models.DateField()),
+                        ('date_fin_de_projet', models.DateField()),
+                        ('statut', models.CharField(max_length=30)),
+                        ('id_utilisateur', models.ForeignKey(blank=True, db_column='id_utilisateur', null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='accounts.chefprojet')),
+                    ],
+                    options={
+                        'db_table': 'projet',
+                        'managed': True,
+                    },
+                ),
+                migrations.CreateModel(
+                    name='Administrateur',
+                    fields=[
+                        ('id_utilisateur', models.OneToOneField(db_column='id_utilisateur', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, serialize=False, to='accounts.utilisateur')),
+                    ],
+                    options={
+                        'db_table': 'administrateur',
+                        'managed': True,
+                    },
+                ),
+                migrations.CreateModel(
+                    name='SousProjet',
+                    fields=[
+                        ('id_sous_projet', models.AutoField(primary_key=True, serialize=False)),
+                        ('nom_sous_projet', models.CharField(max_length=30)),
+                        ('date_debut_sousprojet', models.DateField()),
+                        ('date_finsousprojet', models.DateField()),
+                        ('statut_sous_projet', models.CharField(max_length=15)),
+                        ('description_sous_projet', models.CharField(blank=True, max_length=2000, null=True)),
+                        ('id_projet', models.ForeignKey(blank=True, db_column='id_projet', null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='accounts.projet')),
+                        ('id_utilisateur', models.ForeignKey(blank=True, db_column='id_utilisateur', null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='accounts.chefprojet')),
+                    ],
+                    options={
+                        'db_table': 'sous_projet',
+                        'managed': True,
+                    },
+                ),
+                migrations.CreateModel(
+                    name='Reunion',
+                    fields=[
+                        ('id_reunion', models.AutoField(primary_key=True, serialize=False)),
+                        ('date_reunion', models.DateField(blank=True, null=True)),
+                        ('ordre_de_jour', models.CharField(blank=True, max_length=2000, null=True)),
+                        ('numpv_reunion', models.IntegerField(blank=True, null=True, unique=True)),
+                        ('heure_re', models.TimeField(blank=True, null=True)),
+                        ('lieu_reunion', models.CharField(blank=True, max_length=50, null=True)),
+                        ('id_projet', models.ForeignKey(blank=True, db_column='id_projet', null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='accounts.projet')),
+                        ('id_utilisateur', models.ForeignKey(blank=True, db_column='id_utilisateur', null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='accounts.chefprojet')),
+                    ],
+                    options={
+                        'db_table': 'reunion',
+                        'managed': True,
+                    },
+                ),
+                migrations.CreateModel(
+                    name='Marche',
+                    fields=[
+                        ('id_marche', models.AutoField(primary_key=True, serialize=False)),
+                        ('date_marche', models.DateField()),
+                        ('description_marche', models.CharField(max_length=100)),
+                        ('numero_marche', models.IntegerField()),
+                        ('numero_appel_dof', models.IntegerField()),
+                        ('visa_cme', models.CharField(max_length=30)),
+                        ('date_visa_cme', models.DateField(blank=True, null=True)),
+                        ('prix_da', models.DecimalField(blank=True, decimal_places=30, max_digits=65, null=True)),
+                        ('prix_devise', models.DecimalField(blank=True, decimal_places=30, max_digits=65, null=True)),
+                        ('type', models.CharField(blank=True, max_length=30, null=True)),
+                        ('date_notification', models.DateField(blank=True, null=True)),
+                        ('id_md', models.ForeignKey(blank=True, db_column='id_md', null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='accounts.maitredoeuve')),
+                        ('id_projet', models.ForeignKey(blank=True, db_column='id_projet', null=True, on_delete=django.db.models.deletion.DO_NOTHING, to='accounts.projet')),
+                    ],
+                    options={
+                        'db_table': 'marche',
+                        'managed': True,
+                    },
+                ),
+            ],
+        ),
+    ]
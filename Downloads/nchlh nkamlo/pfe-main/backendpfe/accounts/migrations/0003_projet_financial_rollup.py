@@ -0,0 +1,31 @@
+# Generated by Django 3.2 on 2026-10-18 20:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_sync_managed_models_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjetFinancialRollup',
+            fields=[
+                ('id_rollup', models.AutoField(primary_key=True, serialize=False)),
+                ('total_ap', models.DecimalField(decimal_places=30, default=0, max_digits=65)),
+                ('total_marche', models.DecimalField(decimal_places=30, default=0, max_digits=65)),
+                ('total_facture_ttc', models.DecimalField(decimal_places=30, default=0, max_digits=65)),
+                ('total_facture_net_ht', models.DecimalField(decimal_places=30, default=0, max_digits=65)),
+                ('total_paye', models.DecimalField(decimal_places=30, default=0, max_digits=65)),
+                ('id_projet', models.ForeignKey(blank=True, db_column='id_projet', null=True, on_delete=django.db.models.deletion.CASCADE, to='accounts.projet')),
+                ('id_sous_projet', models.ForeignKey(blank=True, db_column='id_sous_projet', null=True, on_delete=django.db.models.deletion.CASCADE, to='accounts.sousprojet')),
+            ],
+            options={
+                'db_table': 'projet_financial_rollup',
+                'managed': True,
+            },
+        ),
+    ]
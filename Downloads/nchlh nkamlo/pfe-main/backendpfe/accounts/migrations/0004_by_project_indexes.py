@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-18 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_projet_financial_rollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='marche',
+            index=models.Index(fields=['id_projet', 'date_marche'], name='marche_projet_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projet',
+            index=models.Index(fields=['statut', 'id_projet'], name='projet_statut_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sousprojet',
+            index=models.Index(fields=['id_projet', 'id_sous_projet'], name='sous_projet_projet_idx'),
+        ),
+    ]
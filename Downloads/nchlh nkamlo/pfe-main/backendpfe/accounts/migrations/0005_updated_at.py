@@ -0,0 +1,61 @@
+# Generated by Django 3.2 on 2026-10-18 21:02
+
+from django.db import migrations, models
+
+# Unmanaged tables that get an updated_at column too. Migrations never alter
+# them, so the column is added here, and only where the table exists (it
+# comes from the SQL dump).
+UNMANAGED_TABLES = ['MaitreOuvrage', 'MaitreDoeuve']
+
+
+def updated_at_field():
+    field = models.DateTimeField(auto_now=True)
+    field.set_attributes_from_name('updated_at')
+    return field
+
+
+def get_unmanaged_tables(apps, connection):
+    """(model, column names) of the unmanaged tables that exist."""
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        for model_name in UNMANAGED_TABLES:
+            model = apps.get_model('accounts', model_name)
+            if model._meta.db_table in tables:
+                description = connection.introspection.get_table_description(cursor, model._meta.db_table)
+                yield model, [column.name for column in description]
+
+
+def add_unmanaged_columns(apps, schema_editor):
+    for model, columns in list(get_unmanaged_tables(apps, schema_editor.connection)):
+        if 'updated_at' not in columns:
+            schema_editor.add_field(model, updated_at_field())
+
+
+def remove_unmanaged_columns(apps, schema_editor):
+    for model, columns in list(get_unmanaged_tables(apps, schema_editor.connection)):
+        if 'updated_at' in columns:
+            # The historical model has no such field; give it one to remove.
+            field = models.DateTimeField(auto_now=True)
+            field.contribute_to_class(model, 'updated_at')
+            schema_editor.remove_field(model, field)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_by_project_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projet',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='sousprojet',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(add_unmanaged_columns, remove_unmanaged_columns),
+    ]
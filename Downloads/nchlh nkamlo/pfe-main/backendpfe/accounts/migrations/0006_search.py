@@ -0,0 +1,78 @@
+# Generated by Django 3.2 on 2026-10-18 21:40
+
+from django.db import migrations, models
+
+# (table, column) of the FULLTEXT indexes behind /api/search/ on MySQL. The
+# tables come from the SQL dump (incident is unmanaged), so an index is only
+# created where its table exists.
+FULLTEXT_INDEXES = {
+    'projet_nom_ft': ('projet', 'nom_projet'),
+    'sous_projet_description_ft': ('sous_projet', 'description_sous_projet'),
+    'incident_description_ft': ('incident', 'description_incident'),
+    'reunion_ordre_de_jour_ft': ('reunion', 'ordre_de_jour'),
+}
+
+
+def get_existing_indexes(connection):
+    """Names of the FULLTEXT_INDEXES whose table exists, mapped to whether the index does."""
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        existing = {}
+        for name, (table, column) in FULLTEXT_INDEXES.items():
+            if table in tables:
+                existing[name] = name in connection.introspection.get_constraints(cursor, table)
+        return existing
+
+
+def create_fulltext_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'mysql':
+        return
+    quote = schema_editor.quote_name
+    for name, exists in get_existing_indexes(connection).items():
+        if not exists:
+            table, column = FULLTEXT_INDEXES[name]
+            schema_editor.execute('CREATE FULLTEXT INDEX %s ON %s (%s)' % (quote(name), quote(table), quote(column)))
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'mysql':
+        return
+    quote = schema_editor.quote_name
+    for name, exists in get_existing_indexes(connection).items():
+        if exists:
+            schema_editor.execute('DROP INDEX %s ON %s' % (quote(name), quote(FULLTEXT_INDEXES[name][0])))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id_search_term', models.AutoField(primary_key=True, serialize=False)),
+                ('term', models.CharField(max_length=64)),
+                ('kind', models.CharField(max_length=16)),
+                ('object_id', models.IntegerField()),
+                ('weight', models.PositiveIntegerField()),
+            ],
+            options={
+                'db_table': 'search_term',
+                'managed': True,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='searchterm',
+            index=models.Index(fields=['term', 'kind', 'object_id', 'weight'], name='search_term_term_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchterm',
+            index=models.Index(fields=['kind', 'object_id'], name='search_term_document_idx'),
+        ),
+        migrations.RunPython(create_fulltext_indexes, drop_fulltext_indexes),
+    ]
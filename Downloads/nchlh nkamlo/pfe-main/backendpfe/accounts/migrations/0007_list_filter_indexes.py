@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-18 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projet',
+            index=models.Index(fields=['date_debut_de_projet', 'id_projet'], name='projet_debut_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sousprojet',
+            index=models.Index(fields=['statut_sous_projet', 'id_sous_projet'], name='sous_projet_statut_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sousprojet',
+            index=models.Index(fields=['date_finsousprojet', 'id_sous_projet'], name='sous_projet_fin_idx'),
+        ),
+    ]
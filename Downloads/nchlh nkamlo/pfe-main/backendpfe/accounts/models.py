@@ -6,7 +6,64 @@
 #   * Remove `managed = False` lines if you wish to allow Django to create, modify, and delete the table
 # Feel free to rename the models, but don't rename db_table values or field names.
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
-from django.db import models
+from django.db import models, router, transaction
+
+
+class FinancialRollupMixin:
+    """
+    Keeps ``ProjetFinancialRollup`` in step with Ap, Marche and Facture rows,
+    in the same transaction as the save/delete. Bulk queryset operations
+    (bulk_create, update, delete) bypass this and must apply their own
+    deltas with ``accounts.financials.apply_rollup_deltas``.
+    """
+
+    def save(self, *args, **kwargs):
+        from .financials import apply_rollup_change
+
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            previous = self.get_locked_previous(using)
+            super().save(*args, **kwargs)
+            apply_rollup_change(previous, self, using)
+
+    def delete(self, using=None, keep_parents=False):
+        from .financials import apply_rollup_change
+
+        using = using or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            apply_rollup_change(self.get_locked_previous(using), None, using)
+            return super().delete(using=using, keep_parents=keep_parents)
+
+    def get_locked_previous(self, using):
+        if self.pk is None:
+            return None
+        return type(self)._base_manager.using(using).select_for_update().filter(pk=self.pk).first()
+
+
+class SearchIndexMixin:
+    """
+    Keeps the ``SearchTerm`` postings of a searchable row (see
+    ``accounts.search.SEARCH_SOURCES``) in step with its save/delete, on the
+    databases that are searched through that table instead of MySQL
+    FULLTEXT indexes. Bulk queryset operations bypass this and must call
+    ``accounts.search.index_documents`` themselves.
+    """
+
+    def save(self, *args, **kwargs):
+        from .search import index_documents
+
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            index_documents([self], using)
+
+    def delete(self, using=None, keep_parents=False):
+        from .search import unindex_documents
+
+        using = using or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            unindex_documents(type(self), [self.pk], using)
+            return super().delete(using=using, keep_parents=keep_parents)
 
 
 class Administrateur(models.Model):
@@ -17,7 +74,7 @@ class Administrateur(models.Model):
         db_table = 'administrateur'
 
 
-class Ap(models.Model):
+class Ap(FinancialRollupMixin, models.Model):
     id_ap = models.AutoField(primary_key=True)
     montant_ap = models.DecimalField(max_digits=65, decimal_places=30, blank=True, null=True)
     id_projet = models.ForeignKey('Projet', models.DO_NOTHING, db_column='id_projet', blank=True, null=True)
@@ -25,6 +82,7 @@ class Ap(models.Model):
     class Meta:
         managed = False
         db_table = 'ap'
+        indexes = [models.Index(fields=['id_projet'], name='ap_projet_idx')]
 
 
 class AuthGroup(models.Model):
@@ -178,6 +236,7 @@ class Document(models.Model):
     class Meta:
         managed = False
         db_table = 'document'
+        indexes = [models.Index(fields=['id_projet', 'date_ajout'], name='document_projet_date_idx')]
 
 
 class Employe(models.Model):
@@ -188,6 +247,7 @@ class Employe(models.Model):
     class Meta:
         managed = False
         db_table = 'employe'
+        indexes = [models.Index(fields=['id_projet', 'id_sous_projet'], name='employe_projet_idx')]
 
 
 class EtatDavancementDeprojet(models.Model):
@@ -200,9 +260,10 @@ class EtatDavancementDeprojet(models.Model):
     class Meta:
         managed = False
         db_table = 'etat_davancement_deprojet'
+        indexes = [models.Index(fields=['id_projet', 'id_etat'], name='etat_avancement_projet_idx')]
 
 
-class Facture(models.Model):
+class Facture(FinancialRollupMixin, models.Model):
     id_facture = models.AutoField(primary_key=True)
     numero_facture = models.IntegerField(blank=True, null=True)
     designation = models.CharField(max_length=300, blank=True, null=True)
@@ -223,6 +284,10 @@ class Facture(models.Model):
     class Meta:
         managed = False
         db_table = 'facture'
+        indexes = [
+            models.Index(fields=['id_projet', 'date_facturation'], name='facture_projet_date_idx'),
+            models.Index(fields=['id_sous_projet', 'date_facturation'], name='facture_sous_projet_date_idx'),
+        ]
 
 
 class Financier(models.Model):
@@ -246,7 +311,7 @@ class Fournisseur(models.Model):
         db_table = 'fournisseur'
 
 
-class Incident(models.Model):
+class Incident(SearchIndexMixin, models.Model):
     id_incident = models.AutoField(primary_key=True)
     description_incident = models.CharField(max_length=2000)
     date_incident = models.DateField()
@@ -260,6 +325,7 @@ class Incident(models.Model):
     class Meta:
         managed = False
         db_table = 'incident'
+        indexes = [models.Index(fields=['id_projet', 'date_incident'], name='incident_projet_date_idx')]
 
 
 class MaitreDoeuve(models.Model):
@@ -267,10 +333,15 @@ class MaitreDoeuve(models.Model):
     id_projet = models.ForeignKey('Projet', models.DO_NOTHING, db_column='id_projet', blank=True, null=True)
     nom_fournisseur = models.CharField(max_length=30, blank=True, null=True)
     prenom_fournisseur = models.CharField(max_length=30, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         managed = False
         db_table = 'maitre_doeuve'
+        indexes = [
+            models.Index(fields=['id_projet', 'id_md'], name='maitre_doeuve_projet_idx'),
+            models.Index(fields=['nom_fournisseur', 'id_md'], name='maitre_doeuve_nom_idx'),
+        ]
 
 
 class MaitreOuvrage(models.Model):
@@ -282,13 +353,18 @@ class MaitreOuvrage(models.Model):
     adress_mo = models.CharField(max_length=50, blank=True, null=True)
     email_mo = models.CharField(unique=True, max_length=30, blank=True, null=True)
     tel_mo = models.CharField(unique=True, max_length=10, blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         managed = False
         db_table = 'maitre_ouvrage'
+        indexes = [
+            models.Index(fields=['id_projet', 'id_mo'], name='maitre_ouvrage_projet_idx'),
+            models.Index(fields=['type_mo', 'id_mo'], name='maitre_ouvrage_type_idx'),
+        ]
 
 
-class Marche(models.Model):
+class Marche(FinancialRollupMixin, models.Model):
     id_marche = models.AutoField(primary_key=True)
     date_marche = models.DateField()
     description_marche = models.CharField(max_length=100)
@@ -306,9 +382,10 @@ class Marche(models.Model):
     class Meta:
         managed = True
         db_table = 'marche'
+        indexes = [models.Index(fields=['id_projet', 'date_marche'], name='marche_projet_date_idx')]
 
 
-class Projet(models.Model):
+class Projet(SearchIndexMixin, models.Model):
     id_projet = models.AutoField(primary_key=True)
     nom_projet = models.CharField(max_length=30)
     description_de_projet = models.CharField(max_length=30)
@@ -316,13 +393,35 @@ class Projet(models.Model):
     date_fin_de_projet = models.DateField()
     statut = models.CharField(max_length=30)
     id_utilisateur = models.ForeignKey(Chefprojet, models.DO_NOTHING, db_column='id_utilisateur', blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         managed = True
         db_table = 'projet'
+        indexes = [
+            models.Index(fields=['statut', 'id_projet'], name='projet_statut_idx'),
+            models.Index(fields=['date_debut_de_projet', 'id_projet'], name='projet_debut_idx'),
+        ]
+
+
+class ProjetFinancialRollup(models.Model):
+    # A row holds the running totals of one Projet (id_sous_projet is NULL)
+    # or of one SousProjet (id_projet is NULL).
+    id_rollup = models.AutoField(primary_key=True)
+    id_projet = models.ForeignKey(Projet, models.CASCADE, db_column='id_projet', blank=True, null=True)
+    id_sous_projet = models.ForeignKey('SousProjet', models.CASCADE, db_column='id_sous_projet', blank=True, null=True)
+    total_ap = models.DecimalField(max_digits=65, decimal_places=30, default=0)
+    total_marche = models.DecimalField(max_digits=65, decimal_places=30, default=0)
+    total_facture_ttc = models.DecimalField(max_digits=65, decimal_places=30, default=0)
+    total_facture_net_ht = models.DecimalField(max_digits=65, decimal_places=30, default=0)
+    total_paye = models.DecimalField(max_digits=65, decimal_places=30, default=0)
+
+    class Meta:
+        managed = True
+        db_table = 'projet_financial_rollup'
 
 
-class Reunion(models.Model):
+class Reunion(SearchIndexMixin, models.Model):
     id_reunion = models.AutoField(primary_key=True)
     date_reunion = models.DateField(blank=True, null=True)
     ordre_de_jour = models.CharField(max_length=2000, blank=True, null=True)
@@ -337,7 +436,28 @@ class Reunion(models.Model):
         db_table = 'reunion'
 
 
-class SousProjet(models.Model):
+class SearchTerm(models.Model):
+    """
+    Inverted index of the searchable text columns: one posting per (term,
+    document), ``weight`` being the number of occurrences of the term. Used
+    by ``/api/search/`` where MySQL FULLTEXT indexes are not available.
+    """
+    id_search_term = models.AutoField(primary_key=True)
+    term = models.CharField(max_length=64)
+    kind = models.CharField(max_length=16)
+    object_id = models.IntegerField()
+    weight = models.PositiveIntegerField()
+
+    class Meta:
+        managed = True
+        db_table = 'search_term'
+        indexes = [
+            models.Index(fields=['term', 'kind', 'object_id', 'weight'], name='search_term_term_idx'),
+            models.Index(fields=['kind', 'object_id'], name='search_term_document_idx'),
+        ]
+
+
+class SousProjet(SearchIndexMixin, models.Model):
     id_sous_projet = models.AutoField(primary_key=True)
     nom_sous_projet = models.CharField(max_length=30)
     date_debut_sousprojet = models.DateField()
@@ -346,10 +466,16 @@ class SousProjet(models.Model):
     id_projet = models.ForeignKey(Projet, models.DO_NOTHING, db_column='id_projet', blank=True, null=True)
     description_sous_projet = models.CharField(max_length=2000, blank=True, null=True)
     id_utilisateur = models.ForeignKey(Chefprojet, models.DO_NOTHING, db_column='id_utilisateur', blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         managed = True
         db_table = 'sous_projet'
+        indexes = [
+            models.Index(fields=['id_projet', 'id_sous_projet'], name='sous_projet_projet_idx'),
+            models.Index(fields=['statut_sous_projet', 'id_sous_projet'], name='sous_projet_statut_idx'),
+            models.Index(fields=['date_finsousprojet', 'id_sous_projet'], name='sous_projet_fin_idx'),
+        ]
 
 
 class SuivieSousProjet(models.Model):
@@ -362,6 +488,7 @@ class SuivieSousProjet(models.Model):
     class Meta:
         managed = False
         db_table = 'suivie_sous_projet'
+        indexes = [models.Index(fields=['id_sous_projet', 'id_suivie_sous_projet'], name='suivie_sous_projet_idx')]
 
 
 
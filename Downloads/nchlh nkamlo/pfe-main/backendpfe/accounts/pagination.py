@@ -0,0 +1,140 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class StandardPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = 'per_page'
+    page_query_param = 'page'
+    max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in keyset (cursor) pagination, selected with ``?cursor=``.
+
+    A page is located with a WHERE clause on the ordering columns instead of
+    an OFFSET, and no COUNT(*) is issued, so the cost of a page stays the same
+    however deep the client scrolls. The primary key is always appended to
+    the ordering as a tiebreaker, which makes every position unique.
+
+    The ordering is taken from the queryset; its columns must not be NULL.
+    """
+    page_size = 10
+    page_size_query_param = 'per_page'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        position, reverse = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(position, reverse))
+
+        ordering = [self.invert(field) for field in self.ordering] if reverse else self.ordering
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        if rows:
+            self.first_position = self.get_position(rows[0])
+            self.last_position = self.get_position(rows[-1])
+        else:
+            self.first_position = self.last_position = position
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_ordering(self, queryset):
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        pk_name = queryset.model._meta.pk.name
+        if not {'pk', pk_name} & {field.lstrip('-') for field in ordering}:
+            direction = '-' if ordering and ordering[0].startswith('-') else ''
+            ordering.append(direction + pk_name)
+        return ordering
+
+    def get_keyset_filter(self, position, reverse):
+        # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y)
+        keyset_filter = Q()
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip('-')
+            operator = 'lt' if field.startswith('-') != reverse else 'gt'
+            clause = Q(**{'%s__%s' % (name, operator): position[index]})
+            for previous_field, previous_value in zip(self.ordering[:index], position[:index]):
+                clause &= Q(**{previous_field.lstrip('-'): previous_value})
+            keyset_filter |= clause
+        return keyset_filter
+
+    def get_position(self, row):
+        # ``row`` is a model instance or a named values_list() row.
+        return [
+            getattr(row, self.model._meta.get_field(field.lstrip('-')).attname)
+            for field in self.ordering
+        ]
+
+    def invert(self, field):
+        return field[1:] if field.startswith('-') else '-' + field
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = cursor['p'], bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        cursor = json.dumps({'p': position, 'r': int(reverse)}, cls=DjangoJSONEncoder)
+        encoded = base64.urlsafe_b64encode(cursor.encode('utf-8')).decode('ascii')
+        url = remove_query_param(self.request.build_absolute_uri(), 'page')
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.encode_cursor(self.last_position, False)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self.encode_cursor(self.first_position, True)
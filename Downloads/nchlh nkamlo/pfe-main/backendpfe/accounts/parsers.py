@@ -0,0 +1,10 @@
+from rest_framework.parsers import JSONParser as BaseJSONParser
+from .renderers import MoneyJSONRenderer
+
+
+class JSONParser(BaseJSONParser):
+    """
+    ``JSONParser`` whose ``renderer_class``, which the browsable API uses to
+    fill its raw data form, keeps money as strings.
+    """
+    renderer_class = MoneyJSONRenderer
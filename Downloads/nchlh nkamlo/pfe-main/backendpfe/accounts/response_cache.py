@@ -0,0 +1,188 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+from .database import primary_pinned
+
+ALL_PROJECTS = 'all'
+
+
+def get_project_id(instance):
+    """The project of a Projet (its pk) or of a row that references one."""
+    return getattr(instance, type(instance)._meta.get_field('id_projet').attname)
+
+
+class ResponseCache:
+    """
+    Shared cache of rendered JSON GET responses, keyed by path, query
+    string, renderer and user role.
+
+    Each key also holds the version counter of the scope the response
+    depends on: one project, or ``ALL_PROJECTS`` for the responses that may
+    span several. A write bumps the counters of its projects and of
+    ``ALL_PROJECTS``, so the entries built before it are never read again
+    and just expire after ``RESPONSE_CACHE_TTL``; nothing is scanned.
+
+    ``RESPONSE_CACHE_ALIAS`` names the entry of ``CACHES`` to use (``None``
+    turns the cache off). It must be a backend shared by the workers
+    (Redis, Memcached) for their versions to agree, which
+    ``check_response_cache`` enforces; the tests and the in-process
+    benchmark override it with the local-memory backend.
+    """
+
+    @property
+    def cache(self):
+        alias = getattr(settings, 'RESPONSE_CACHE_ALIAS', None)
+        return caches[alias] if alias else None
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'RESPONSE_CACHE_TTL', 300)
+
+    def get_version(self, scope):
+        key = 'response-version:%s' % scope
+        version = self.cache.get(key)
+        if version is None:
+            # A counter that was evicted must not restart at a value it
+            # already had, or the entries cached under it would come back.
+            self.cache.add(key, time.time_ns(), None)
+            version = self.cache.get(key)
+        return version
+
+    def bump(self, scopes):
+        for scope in scopes:
+            try:
+                self.cache.incr('response-version:%s' % scope)
+            except ValueError:
+                pass  # Missing: get_version() starts it over from the clock.
+
+    def invalidate(self, project_ids):
+        """
+        Bumps the versions of ``project_ids`` and of ``ALL_PROJECTS`` now
+        and again once the transaction commits, which also retires what
+        was cached from the old rows before the commit.
+        """
+        if self.cache is None:
+            return
+        scopes = {ALL_PROJECTS} | {project_id for project_id in project_ids if project_id is not None}
+        self.bump(scopes)
+        transaction.on_commit(lambda: self.bump(scopes))
+
+    def make_key(self, request, scope):
+        parts = [
+            request.path,
+            sorted(request.query_params.lists()),
+            request.accepted_media_type,
+            getattr(request.user, 'role_de_utilisateur', None),
+        ]
+        digest = hashlib.md5(repr(parts).encode()).hexdigest()
+        return 'response:%s:%s:%s' % (scope, self.get_version(scope), digest)
+
+    def count(self, name):
+        key = 'response-cache:%s' % name
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            if not self.cache.add(key, 1, None):
+                self.cache.incr(key)
+
+    def stats(self):
+        counts = self.cache.get_many(['response-cache:hits', 'response-cache:misses'])
+        hits, misses = counts.get('response-cache:hits', 0), counts.get('response-cache:misses', 0)
+        ratio = round(hits / (hits + misses), 4) if hits + misses else None
+        return {'hits': hits, 'misses': misses, 'hit_ratio': ratio}
+
+    def reset_stats(self):
+        self.cache.delete_many(['response-cache:hits', 'response-cache:misses'])
+
+
+response_cache = ResponseCache()
+
+# Backends whose entries live in one process: each worker would keep
+# versions of its own and serve the responses that another one retired.
+PROCESS_LOCAL_BACKENDS = {
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+}
+
+
+def check_response_cache(app_configs, **kwargs):
+    """Only lets ``RESPONSE_CACHE_ALIAS`` name a cache shared by the workers."""
+    alias = getattr(settings, 'RESPONSE_CACHE_ALIAS', None)
+    if not alias:
+        return []
+    if alias not in settings.CACHES:
+        return [checks.Error(
+            'RESPONSE_CACHE_ALIAS names %r, which is not in CACHES.' % alias, id='accounts.E001',
+        )]
+    if settings.CACHES[alias]['BACKEND'] in PROCESS_LOCAL_BACKENDS:
+        return [checks.Error(
+            'RESPONSE_CACHE_ALIAS names %r, a cache local to each process.' % alias,
+            hint='Point it at a cache shared by the workers (Redis, Memcached), or set it to None.',
+            id='accounts.E002',
+        )]
+    return []
+
+
+def cached_get(get):
+    """
+    Serves a ``PaginatedListView.get`` from ``response_cache``.
+
+    The scope is the project named by the URL kwarg
+    ``view.cache_project_kwarg``, else ``ALL_PROJECTS``. Only JSON 200
+    responses are stored, along with the view's ETag / Last-Modified
+    validators, so a hit still answers conditional requests with a 304.
+    Writes must call ``view.invalidate_cached_responses()``.
+
+    A miss is read from the primary: right after a write bumped the
+    version, the read replica may still hold the old rows, which would
+    otherwise be cached under the new version for ``RESPONSE_CACHE_TTL``.
+    """
+
+    @wraps(get)
+    def wrapper(view, request, *args, **kwargs):
+        if response_cache.cache is None or request.accepted_renderer.media_type != 'application/json':
+            return get(view, request, *args, **kwargs)
+
+        key = response_cache.make_key(request, kwargs.get(view.cache_project_kwarg) or ALL_PROJECTS)
+        entry = response_cache.cache.get(key)
+        if entry is not None:
+            response_cache.count('hits')
+            view.validators = entry['validators']
+            if view.validators:
+                etag, last_modified = view.validators
+                not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if not_modified is not None:
+                    return not_modified
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response_cache.count('misses')
+        pin = primary_pinned.set(True)
+        try:
+            response = get(view, request, *args, **kwargs)
+        finally:
+            primary_pinned.reset(pin)
+        if isinstance(response, Response) and response.status_code == 200:
+            response['X-Cache'] = 'MISS'
+
+            def store(rendered):
+                response_cache.cache.set(key, {
+                    'content': rendered.content,
+                    'content_type': rendered['Content-Type'],
+                    'validators': view.validators,
+                }, response_cache.ttl)
+
+            response.add_post_render_callback(store)
+        return response
+
+    return wrapper
@@ -1,2 +1 @@
-from .error_api_response import ErrorAPIResponse
-from .success_api_response import SuccessAPIResponse
\ No newline at end of file
+from .api_response import api_response, error_response, success_response
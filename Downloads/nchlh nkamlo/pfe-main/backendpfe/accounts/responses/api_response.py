@@ -0,0 +1,23 @@
+from rest_framework import status as http_status
+from rest_framework.response import Response
+
+
+def api_response(success, message, status=http_status.HTTP_200_OK, **fields):
+    """
+    ``Response`` wrapping ``fields`` in the API envelope
+    ``{'success': ..., 'message': ..., <fields>}``. Fields left to None
+    (e.g. no ``data``) are omitted.
+    """
+    body = {'success': success, 'message': message}
+    for name, value in fields.items():
+        if value is not None:
+            body[name] = value
+    return Response(body, status=status)
+
+
+def success_response(message, data=None, status=http_status.HTTP_200_OK, **fields):
+    return api_response(True, message, status, data=data, **fields)
+
+
+def error_response(message, errors=None, status=http_status.HTTP_400_BAD_REQUEST, **fields):
+    return api_response(False, message, status, errors=errors, **fields)
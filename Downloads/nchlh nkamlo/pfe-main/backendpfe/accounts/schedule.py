@@ -0,0 +1,151 @@
+import math
+from collections import Counter, namedtuple
+
+from django.db.models import Case, Count, DateField, F, Func, IntegerField, Value, When
+from django.db.models.functions import Greatest
+from .models import EtatDavancementDeprojet, SousProjet, SuivieSousProjet
+
+WORST_MILESTONES = 10
+
+MilestoneSource = namedtuple('MilestoneSource', ['model', 'label_field', 'projet_field', 'sous_projet_field'])
+
+# Milestone tables by kind: project-level etats d'avancement and sous-projet
+# suivis, both with a planned (date_prevu) and an actual (date_realiser) date.
+MILESTONE_SOURCES = {
+    'projet': MilestoneSource(EtatDavancementDeprojet, 'type_etat', 'id_projet', None),
+    'sous_projet': MilestoneSource(
+        SuivieSousProjet, 'description_suivie_sousprojet', 'id_sous_projet__id_projet', 'id_sous_projet'),
+}
+
+
+class DaysBetween(Func):
+    """Whole days from the second date expression to the first one."""
+    arity = 2
+    output_field = IntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, template='(%(expressions)s)', arg_joiner=' - ', **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, function='DATEDIFF', **extra_context)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, template='CAST(julianday(%(expressions)s) AS INTEGER)',
+            arg_joiner=') - julianday(', **extra_context)
+
+
+def get_delay_expression(today):
+    """
+    Slip of a milestone in days: actual minus planned date once reached,
+    otherwise how long it is overdue (0 while it is not due yet).
+    """
+    return Case(
+        When(date_realiser__isnull=False, then=DaysBetween('date_realiser', 'date_prevu')),
+        default=Greatest(DaysBetween(Value(today, output_field=DateField()), 'date_prevu'), Value(0)),
+        output_field=IntegerField(),
+    )
+
+
+def get_milestones(kind, today):
+    """The milestones of ``kind`` that have a planned date, annotated with their ``delay_days``."""
+    source = MILESTONE_SOURCES[kind]
+    return (source.model.objects
+            .filter(date_prevu__isnull=False)
+            .annotate(delay_days=get_delay_expression(today)))
+
+
+def get_milestone_rows(kind, today, **filters):
+    """``get_milestones()`` as dicts: id, label, id_projet (and id_sous_projet), dates and delay_days."""
+    source = MILESTONE_SOURCES[kind]
+    fields = ['date_prevu', 'date_realiser', 'delay_days']
+    expressions = {'id': F(source.model._meta.pk.name), 'label': F(source.label_field)}
+    for name, path in [('id_projet', source.projet_field), ('id_sous_projet', source.sous_projet_field)]:
+        if path == name:
+            fields.append(name)
+        elif path:
+            expressions[name] = F(path)
+    return get_milestones(kind, today).filter(**filters).values(*fields, **expressions)
+
+
+def get_project_timelines(projets, today):
+    """
+    The milestones of ``projets`` and of their sous-projets, with their
+    delays, as nested dicts. Three queries for the whole page.
+    """
+    timelines = {
+        projet.id_projet: {
+            'id_projet': projet.id_projet, 'nom_projet': projet.nom_projet, 'statut': projet.statut,
+            'delay_days': None, 'milestones': [], 'sous_projets': [],
+        }
+        for projet in projets
+    }
+    sous_projets = {}
+    rows = (SousProjet.objects.filter(id_projet__in=list(timelines))
+            .order_by('id_sous_projet').values('id_sous_projet', 'nom_sous_projet', 'id_projet'))
+    for row in rows:
+        sous_projet = dict(row, delay_days=None, milestones=[])
+        sous_projets[row['id_sous_projet']] = sous_projet
+        timelines[row['id_projet']]['sous_projets'].append(sous_projet)
+
+    milestones = [
+        (timelines, 'id_projet', get_milestone_rows('projet', today, id_projet__in=list(timelines))),
+        (sous_projets, 'id_sous_projet',
+         get_milestone_rows('sous_projet', today, id_sous_projet__in=list(sous_projets))),
+    ]
+    for parents, key, rows in milestones:
+        for row in rows.order_by('date_prevu', 'id'):
+            parent = parents[row[key]]
+            parent['milestones'].append(row)
+            if parent['delay_days'] is None or row['delay_days'] > parent['delay_days']:
+                parent['delay_days'] = row['delay_days']
+
+    # A project is as late as its latest milestone, its sous-projets' included.
+    for timeline in timelines.values():
+        delays = [timeline['delay_days']] + [sous_projet['delay_days'] for sous_projet in timeline['sous_projets']]
+        delays = [delay for delay in delays if delay is not None]
+        timeline['delay_days'] = max(delays) if delays else None
+    return [timelines[projet.id_projet] for projet in projets]
+
+
+def get_delay_stats(today):
+    """
+    Slip statistics over every milestone of the portfolio: count, number
+    late, mean and 90th percentile delay, and the ``WORST_MILESTONES``
+    latest of the late ones (delay above 0).
+
+    The delays are computed by the database. Each table returns one row per
+    distinct delay (a histogram, a few hundred rows at most, whatever the
+    number of milestones) and its ``WORST_MILESTONES`` worst rows; the
+    tables are then merged.
+    """
+    histogram, worst = Counter(), []
+    for kind in MILESTONE_SOURCES:
+        rows = get_milestones(kind, today).values('delay_days').order_by().annotate(milestones=Count('*'))
+        for row in rows:
+            histogram[row['delay_days']] += row['milestones']
+        late = get_milestone_rows(kind, today).filter(delay_days__gt=0)
+        for row in late.order_by('-delay_days', 'id')[:WORST_MILESTONES]:
+            worst.append(dict(type=kind, **row))
+
+    count = sum(histogram.values())
+    worst.sort(key=lambda row: (-row['delay_days'], row['type'], row['id']))
+    return {
+        'milestones': count,
+        'late': sum(milestones for delay, milestones in histogram.items() if delay > 0),
+        'mean_delay_days': round(sum(delay * n for delay, n in histogram.items()) / count, 2) if count else None,
+        'p90_delay_days': get_percentile(histogram, count, 90),
+        'worst': worst[:WORST_MILESTONES],
+    }
+
+
+def get_percentile(histogram, count, percent):
+    """Nearest-rank percentile of the values counted in ``histogram``."""
+    if not count:
+        return None
+    rank = math.ceil(count * percent / 100.0)
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= rank:
+            return value
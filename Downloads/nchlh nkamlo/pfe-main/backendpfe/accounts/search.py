@@ -0,0 +1,171 @@
+import re
+import unicodedata
+from collections import Counter, namedtuple
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count, Sum
+from .models import Incident, Projet, Reunion, SearchTerm, SousProjet
+
+# MySQL skips shorter words (innodb_ft_min_token_size); the fallback does too.
+MIN_TERM_LENGTH = 3
+MAX_TERM_LENGTH = 64
+SNIPPET_LENGTH = 200
+
+SearchSource = namedtuple('SearchSource', ['model', 'text_field', 'label_field'])
+
+# Searchable documents by kind. Each text column has a FULLTEXT index on MySQL.
+SEARCH_SOURCES = {
+    'projet': SearchSource(Projet, 'nom_projet', 'nom_projet'),
+    'sous_projet': SearchSource(SousProjet, 'description_sous_projet', 'nom_sous_projet'),
+    'incident': SearchSource(Incident, 'description_incident', 'type_incident'),
+    'reunion': SearchSource(Reunion, 'ordre_de_jour', 'lieu_reunion'),
+}
+KINDS_BY_MODEL = {source.model: kind for kind, source in SEARCH_SOURCES.items()}
+
+Hit = namedtuple('Hit', ['kind', 'pk', 'score'])
+
+
+def fold(text):
+    """``text`` lower-cased and without accents, character for character."""
+    return ''.join(unicodedata.normalize('NFKD', char)[0].casefold()[:1] for char in text)
+
+
+def tokenize(text):
+    """The folded words of ``text``, short words dropped."""
+    words = re.findall(r'\w+', fold(text or ''))
+    return [word[:MAX_TERM_LENGTH] for word in words if len(word) >= MIN_TERM_LENGTH]
+
+
+def uses_fulltext(using):
+    return connections[using].vendor == 'mysql'
+
+
+def search(query, kinds, offset, limit, using=DEFAULT_DB_ALIAS):
+    """
+    Hits ``offset`` to ``offset + limit`` (one more when there is a next page)
+    of the documents of ``kinds`` that match ``query``, best first.
+    """
+    if uses_fulltext(using):
+        return fulltext_search(query, kinds, offset, limit, using)
+    return inverted_index_search(tokenize(query), kinds, offset, limit, using)
+
+
+def fulltext_search(query, kinds, offset, limit, using):
+    """
+    One MATCH ... AGAINST query per kind, each reading only the ids and
+    scores of its ``offset + limit + 1`` best rows off the FULLTEXT index;
+    the lists are then merged by score.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    hits = []
+    with connection.cursor() as cursor:
+        for kind in kinds:
+            source = SEARCH_SOURCES[kind]
+            opts = source.model._meta
+            column = quote(opts.get_field(source.text_field).column)
+            match = 'MATCH (%s) AGAINST (%%s IN NATURAL LANGUAGE MODE)' % column
+            cursor.execute(
+                'SELECT %s, %s AS score FROM %s WHERE %s ORDER BY score DESC, %s LIMIT %%s' % (
+                    quote(opts.pk.column), match, quote(opts.db_table), match, quote(opts.pk.column)),
+                [query, query, offset + limit + 1])
+            hits.extend(Hit(kind, pk, float(score)) for pk, score in cursor.fetchall())
+
+    # Same tie-break as the inverted index ranking.
+    hits.sort(key=lambda hit: (-hit.score, hit.kind, hit.pk))
+    return hits[offset:offset + limit + 1]
+
+
+def inverted_index_search(terms, kinds, offset, limit, using):
+    """
+    Ranks the documents by the number of distinct query terms they contain,
+    then by their total number of occurrences, with one grouped query on
+    ``SearchTerm``.
+    """
+    rows = (SearchTerm.objects.using(using)
+            .filter(term__in=set(terms), kind__in=kinds)
+            .values('kind', 'object_id')
+            .annotate(matched=Count('term'), occurrences=Sum('weight'))
+            .order_by('-matched', '-occurrences', 'kind', 'object_id'))
+    return [Hit(row['kind'], row['object_id'], row['matched'] + row['occurrences'] / (row['occurrences'] + 1.0))
+            for row in rows[offset:offset + limit + 1]]
+
+
+def make_snippet(text, terms):
+    """About ``SNIPPET_LENGTH`` characters of ``text`` around the first term found."""
+    if len(text) <= SNIPPET_LENGTH:
+        return text
+    folded = fold(text)
+    positions = [position for position in (folded.find(term) for term in terms) if position >= 0]
+    start = max(0, min(positions, default=0) - SNIPPET_LENGTH // 4)
+    end = start + SNIPPET_LENGTH
+    return ('…' if start else '') + text[start:end].strip() + ('…' if end < len(text) else '')
+
+
+def load_hits(hits, query, using=DEFAULT_DB_ALIAS):
+    """The rows of ``hits``, in order, with one query per kind."""
+    terms = tokenize(query)
+    pks_by_kind = {}
+    for hit in hits:
+        pks_by_kind.setdefault(hit.kind, []).append(hit.pk)
+
+    rows = {}
+    for kind, pks in pks_by_kind.items():
+        source = SEARCH_SOURCES[kind]
+        queryset = source.model.objects.using(using).only(source.text_field, source.label_field, 'id_projet')
+        for pk, instance in queryset.in_bulk(pks).items():
+            rows[kind, pk] = instance
+
+    results = []
+    for hit in hits:
+        instance = rows.get((hit.kind, hit.pk))
+        if instance is None:
+            continue  # Deleted since it was ranked.
+        source = SEARCH_SOURCES[hit.kind]
+        results.append({
+            'type': hit.kind,
+            'id': hit.pk,
+            'id_projet': getattr(instance, source.model._meta.get_field('id_projet').attname),
+            'label': getattr(instance, source.label_field),
+            'snippet': make_snippet(getattr(instance, source.text_field) or '', terms),
+            'score': round(hit.score, 4),
+        })
+    return results
+
+
+def get_postings(kind, instance):
+    source = SEARCH_SOURCES[kind]
+    counts = Counter(tokenize(getattr(instance, source.text_field)))
+    return [SearchTerm(term=term, kind=kind, object_id=instance.pk, weight=weight) for term, weight in counts.items()]
+
+
+def index_documents(instances, using=DEFAULT_DB_ALIAS):
+    """(Re)writes the postings of ``instances``, all rows of one searchable model."""
+    if not instances or uses_fulltext(using):
+        return
+    kind = KINDS_BY_MODEL[type(instances[0])]
+    unindex_documents(type(instances[0]), [instance.pk for instance in instances], using)
+    postings = [posting for instance in instances for posting in get_postings(kind, instance)]
+    SearchTerm.objects.using(using).bulk_create(postings, batch_size=1000)
+
+
+def unindex_documents(model, pks, using=DEFAULT_DB_ALIAS):
+    if uses_fulltext(using):
+        return
+    SearchTerm.objects.using(using).filter(kind=KINDS_BY_MODEL[model], object_id__in=pks).delete()
+
+
+def rebuild_search_index(using=DEFAULT_DB_ALIAS, batch_size=1000):
+    """Rebuilds ``SearchTerm`` from the searchable tables; returns the number of postings."""
+    SearchTerm.objects.using(using).all().delete()
+    created = 0
+    for kind, source in SEARCH_SOURCES.items():
+        queryset = source.model.objects.using(using).exclude(**{source.text_field: None}).only(source.text_field)
+        postings = []
+        for instance in queryset.iterator(chunk_size=batch_size):
+            postings.extend(get_postings(kind, instance))
+            if len(postings) >= batch_size:
+                created += len(SearchTerm.objects.using(using).bulk_create(postings, batch_size=batch_size))
+                postings = []
+        created += len(SearchTerm.objects.using(using).bulk_create(postings, batch_size=batch_size))
+    return created
@@ -0,0 +1,351 @@
+import multiprocessing
+import random
+import time
+from bisect import bisect
+from collections import OrderedDict, namedtuple
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max
+from .models import (
+    Ap, Chefprojet, Document, Employe, EtatDavancementDeprojet, Facture, Incident, MaitreDoeuve, MaitreOuvrage,
+    Marche, Projet, Reunion, SousProjet, SuivieSousProjet, Utilisateur,
+)
+
+# Rows generated from one random stream: the data only depends on the seed,
+# not on the number of workers or the batch size.
+CHUNK_SIZE = 20000
+
+# Rows per table at --scale 1.
+DEFAULT_SIZES = OrderedDict([
+    ('utilisateurs', 2000),
+    ('projets', 5000),
+    ('sous_projets', 50000),
+    ('maitres_ouvrage', 5000),
+    ('maitres_doeuvre', 5000),
+    ('marches', 20000),
+    ('aps', 10000),
+    ('factures', 2000000),
+    ('incidents', 20000),
+    ('reunions', 20000),
+    ('documents', 50000),
+    ('etats_davancement', 20000),
+    ('suivis', 50000),
+])
+
+STATUTS = ['en cours', 'termine', 'en attente', 'suspendu']
+ROADS = ['RN1', 'RN3', 'RN5', 'RN6', 'RN11', 'RN46', 'CW12', 'CW42', 'A1', 'A2']
+WORKS = ['Elargissement', 'Renforcement', 'Dedoublement', 'Rehabilitation', 'Evitement', 'Modernisation']
+
+
+def random_date(rng, start=date(2015, 1, 1), days=3650):
+    return start + timedelta(days=rng.randrange(days))
+
+
+def random_amount(rng, low, high):
+    return Decimal(rng.randrange(low * 100, high * 100)) / 100
+
+
+def random_text(rng, index):
+    return '%s de la %s lot %d' % (rng.choice(WORKS), rng.choice(ROADS), index)
+
+
+def zipf_cum_weights(rng, count, skew):
+    """The cumulative Zipf weights of ``count`` rows, shuffled so that the big ones are spread out."""
+    weights = [1.0 / rank ** skew for rank in range(1, count + 1)]
+    rng.shuffle(weights)
+    return list(accumulate(weights))
+
+
+def pick_weighted(rng, cum_weights):
+    return min(bisect(cum_weights, rng.random() * cum_weights[-1]), len(cum_weights) - 1)
+
+
+class SeedPlan:
+    """
+    The shape of the generated dataset: how many rows of each table, the
+    primary key of the first one (rows are appended after the existing ones)
+    and the projet of every row that other rows point to, so that the rows
+    of a chunk can be built without reading the database back.
+
+    Projet sizes are Zipf-distributed with exponent ``skew``: a few huge
+    projets and a long tail of small ones. So are the suivis of the
+    sous-projets.
+    """
+
+    def __init__(self, sizes, seed, offsets, skew=1.0, using=DEFAULT_DB_ALIAS, batch_size=5000):
+        self.sizes = dict(sizes)
+        self.sizes['chefs'] = max(1, self.sizes['utilisateurs'] // 10)
+        self.sizes['employes'] = self.sizes['utilisateurs'] - self.sizes['chefs']
+        self.seed = seed
+        self.offsets = offsets
+        self.using = using
+        self.batch_size = batch_size
+        self.password = make_password('seed', salt='seed%d' % seed)
+
+        rng = random.Random(seed)
+        self.cum_weights = zipf_cum_weights(rng, self.sizes['projets'], skew)
+
+        # The children that other rows pick among, by projet index.
+        self.sous_projet_projets = self.assign_projets(rng, 'sous_projets')
+        self.marche_projets = self.assign_projets(rng, 'marches')
+        self.ap_projets = self.assign_projets(rng, 'aps')
+        self.maitre_doeuvre_projets = self.assign_projets(rng, 'maitres_doeuvre')
+        self.sous_projets_by_projet = self.group_by_projet(self.sous_projet_projets)
+        self.marches_by_projet = self.group_by_projet(self.marche_projets)
+        self.aps_by_projet = self.group_by_projet(self.ap_projets)
+        self.maitres_doeuvre_by_projet = self.group_by_projet(self.maitre_doeuvre_projets)
+        self.sous_projet_cum_weights = zipf_cum_weights(rng, self.sizes['sous_projets'], skew)
+
+    def assign_projets(self, rng, name):
+        if not self.sizes['projets']:
+            return []
+        return rng.choices(range(self.sizes['projets']), cum_weights=self.cum_weights, k=self.sizes[name])
+
+    def group_by_projet(self, projets):
+        children = [[] for _ in range(self.sizes['projets'])]
+        for index, projet in enumerate(projets):
+            children[projet].append(index)
+        return children
+
+    def pick_projet(self, rng):
+        return pick_weighted(rng, self.cum_weights)
+
+    def pick_sous_projet(self, rng):
+        return pick_weighted(rng, self.sous_projet_cum_weights)
+
+    def pick_child(self, rng, table, children):
+        """The pk of one of ``children`` (indexes into ``table``), or None when there are none."""
+        return self.pk(table, rng.choice(children)) if children else None
+
+    def pk(self, table, index):
+        return self.offsets[table] + index
+
+    def chef_pk(self, rng):
+        return self.pk('utilisateurs', rng.randrange(self.sizes['chefs']))
+
+
+def build_utilisateur(plan, rng, index):
+    pk = plan.pk('utilisateurs', index)
+    return Utilisateur(
+        id_utilisateur=pk, email='seed%d@example.com' % pk, nom='Nom %d' % pk, prenom='Prenom %d' % index,
+        password=plan.password, role_de_utilisateur='chef de projet' if index < plan.sizes['chefs'] else 'employee',
+        sexe=rng.choice(['homme', 'femme']), etat='actif', matricule=pk,
+    )
+
+
+def build_chef(plan, rng, index):
+    return Chefprojet(id_utilisateur_id=plan.pk('utilisateurs', index))
+
+
+def build_projet(plan, rng, index):
+    debut = random_date(rng)
+    return Projet(
+        id_projet=plan.pk('projets', index), nom_projet='Projet %d' % index,
+        description_de_projet='%s %s' % (rng.choice(WORKS), rng.choice(ROADS)), statut=rng.choice(STATUTS),
+        date_debut_de_projet=debut, date_fin_de_projet=debut + timedelta(days=rng.randint(180, 2500)),
+        id_utilisateur_id=plan.chef_pk(rng),
+    )
+
+
+def build_sous_projet(plan, rng, index):
+    debut = random_date(rng)
+    return SousProjet(
+        id_sous_projet=plan.pk('sous_projets', index), nom_sous_projet='Lot %d' % index,
+        date_debut_sousprojet=debut, date_finsousprojet=debut + timedelta(days=rng.randint(30, 900)),
+        statut_sous_projet=rng.choice(STATUTS), id_projet_id=plan.pk('projets', plan.sous_projet_projets[index]),
+        description_sous_projet=random_text(rng, index), id_utilisateur_id=plan.chef_pk(rng),
+    )
+
+
+def build_employe(plan, rng, index):
+    projet = plan.pick_projet(rng)
+    return Employe(
+        id_utilisateur_id=plan.pk('utilisateurs', plan.sizes['chefs'] + index), id_projet_id=plan.pk('projets', projet),
+        id_sous_projet_id=plan.pick_child(rng, 'sous_projets', plan.sous_projets_by_projet[projet]),
+    )
+
+
+def build_maitre_ouvrage(plan, rng, index):
+    return MaitreOuvrage(
+        id_mo=plan.pk('maitres_ouvrage', index), id_projet_id=plan.pk('projets', plan.pick_projet(rng)),
+        description_mo='Direction des travaux publics', nom_mo='DTP %d' % index,
+        type_mo=rng.choice(['public', 'prive', 'collectivite']), adress_mo='Wilaya %d' % rng.randint(1, 58),
+    )
+
+
+def build_maitre_doeuvre(plan, rng, index):
+    return MaitreDoeuve(
+        id_md=plan.pk('maitres_doeuvre', index), id_projet_id=plan.pk('projets', plan.maitre_doeuvre_projets[index]),
+        nom_fournisseur='Bureau %d' % rng.randrange(500), prenom_fournisseur='Etudes',
+    )
+
+
+def build_marche(plan, rng, index):
+    projet = plan.marche_projets[index]
+    # Numbered after the primary key, which no earlier run has used: the
+    # importers look marches up by numero_marche.
+    pk = plan.pk('marches', index)
+    return Marche(
+        id_marche=pk, date_marche=random_date(rng), description_marche=random_text(rng, index),
+        id_projet_id=plan.pk('projets', projet), numero_marche=pk, numero_appel_dof=rng.randrange(10 ** 6),
+        visa_cme='CME/%d' % pk, prix_da=random_amount(rng, 10 ** 6, 10 ** 9), type=rng.choice(['travaux', 'etudes']),
+        id_md_id=plan.pick_child(rng, 'maitres_doeuvre', plan.maitres_doeuvre_by_projet[projet]),
+    )
+
+
+def build_ap(plan, rng, index):
+    return Ap(
+        id_ap=plan.pk('aps', index), montant_ap=random_amount(rng, 10 ** 7, 10 ** 10),
+        id_projet_id=plan.pk('projets', plan.ap_projets[index]),
+    )
+
+
+def build_facture(plan, rng, index):
+    projet = plan.pick_projet(rng)
+    net = random_amount(rng, 10 ** 4, 10 ** 7)
+    tva = (net * Decimal('0.19')).quantize(Decimal('0.01'))
+    facturation = random_date(rng)
+    return Facture(
+        id_facture=plan.pk('factures', index), numero_facture=index, designation='Situation %d' % rng.randint(1, 40),
+        date_facturation=facturation, date_reception=facturation + timedelta(days=rng.randint(0, 30)),
+        brut_ht=net, montant_net_ht=net, montant_tva=tva, montant_ttc=net + tva,
+        id_projet_id=plan.pk('projets', projet),
+        id_sous_projet_id=plan.pick_child(rng, 'sous_projets', plan.sous_projets_by_projet[projet]),
+        id_marche_id=plan.pick_child(rng, 'marches', plan.marches_by_projet[projet]),
+        id_ap_id=plan.pick_child(rng, 'aps', plan.aps_by_projet[projet]),
+    )
+
+
+def build_incident(plan, rng, index):
+    projet = plan.pick_projet(rng)
+    return Incident(
+        id_incident=plan.pk('incidents', index), description_incident='Affaissement sur la %s' % rng.choice(ROADS),
+        date_incident=random_date(rng), id_projet_id=plan.pk('projets', projet),
+        id_sous_projet_id=plan.pick_child(rng, 'sous_projets', plan.sous_projets_by_projet[projet]),
+        type_incident=rng.choice(['technique', 'meteo', 'securite']),
+    )
+
+
+def build_reunion(plan, rng, index):
+    return Reunion(
+        id_reunion=plan.pk('reunions', index), date_reunion=random_date(rng), numpv_reunion=plan.pk('reunions', index),
+        ordre_de_jour='Avancement des travaux de la %s' % rng.choice(ROADS),
+        id_projet_id=plan.pk('projets', plan.pick_projet(rng)), id_utilisateur_id=plan.chef_pk(rng),
+    )
+
+
+def build_document(plan, rng, index):
+    projet = plan.pick_projet(rng)
+    return Document(
+        id_document=plan.pk('documents', index), titre='Document %d' % index, date_ajout=random_date(rng),
+        description=rng.choice(['PV', 'Plan', 'Rapport', 'Attachement']), id_projet_id=plan.pk('projets', projet),
+        id_sous_projet_id=plan.pick_child(rng, 'sous_projets', plan.sous_projets_by_projet[projet]),
+    )
+
+
+def build_etat_davancement(plan, rng, index):
+    prevu = random_date(rng, date(2022, 1, 1), 1500)
+    return EtatDavancementDeprojet(
+        id_etat=plan.pk('etats_davancement', index), type_etat='etape %d' % rng.randint(1, 12),
+        id_projet_id=plan.pk('projets', plan.pick_projet(rng)), date_prevu=prevu,
+        date_realiser=prevu + timedelta(days=int(rng.gauss(10, 20))) if rng.random() < 0.75 else None,
+    )
+
+
+def build_suivi(plan, rng, index):
+    prevu = random_date(rng, date(2022, 1, 1), 1500)
+    return SuivieSousProjet(
+        id_suivie_sous_projet=plan.pk('suivis', index), description_suivie_sousprojet='Suivi %d' % index,
+        id_sous_projet_id=plan.pk('sous_projets', plan.pick_sous_projet(rng)), date_prevu=prevu,
+        date_realiser=prevu + timedelta(days=int(rng.gauss(10, 20))) if rng.random() < 0.75 else None,
+    )
+
+
+SeedTable = namedtuple('SeedTable', ['model', 'build'])
+
+# In foreign key order. chefs and employes are the utilisateurs, so they
+# have no primary keys of their own.
+SEED_TABLES = OrderedDict([
+    ('utilisateurs', SeedTable(Utilisateur, build_utilisateur)),
+    ('chefs', SeedTable(Chefprojet, build_chef)),
+    ('projets', SeedTable(Projet, build_projet)),
+    ('sous_projets', SeedTable(SousProjet, build_sous_projet)),
+    ('employes', SeedTable(Employe, build_employe)),
+    ('maitres_ouvrage', SeedTable(MaitreOuvrage, build_maitre_ouvrage)),
+    ('maitres_doeuvre', SeedTable(MaitreDoeuve, build_maitre_doeuvre)),
+    ('marches', SeedTable(Marche, build_marche)),
+    ('aps', SeedTable(Ap, build_ap)),
+    ('factures', SeedTable(Facture, build_facture)),
+    ('incidents', SeedTable(Incident, build_incident)),
+    ('reunions', SeedTable(Reunion, build_reunion)),
+    ('documents', SeedTable(Document, build_document)),
+    ('etats_davancement', SeedTable(EtatDavancementDeprojet, build_etat_davancement)),
+    ('suivis', SeedTable(SuivieSousProjet, build_suivi)),
+])
+
+
+def get_offsets(using=DEFAULT_DB_ALIAS):
+    """The first free primary key of every table of DEFAULT_SIZES."""
+    return {
+        name: (SEED_TABLES[name].model.objects.using(using).aggregate(last=Max('pk'))['last'] or 0) + 1
+        for name in DEFAULT_SIZES
+    }
+
+
+def write_chunk(plan, name, chunk):
+    table = SEED_TABLES[name]
+    rng = random.Random('%d:%s:%d' % (plan.seed, name, chunk))
+    rows = [
+        table.build(plan, rng, index)
+        for index in range(chunk * CHUNK_SIZE, min((chunk + 1) * CHUNK_SIZE, plan.sizes[name]))
+    ]
+    with transaction.atomic(using=plan.using):
+        table.model.objects.using(plan.using).bulk_create(rows, batch_size=plan.batch_size)
+    return len(rows)
+
+
+# The plan of a worker process, set once by its pool initializer.
+worker_plan = None
+
+
+def init_worker(plan):
+    global worker_plan
+    worker_plan = plan
+
+
+def write_worker_chunk(task):
+    return write_chunk(worker_plan, *task)
+
+
+def seed_database(plan, workers=1, progress=None):
+    """
+    Writes the rows of ``plan``, table after table, in transactions of
+    CHUNK_SIZE rows; with ``workers`` > 1 the chunks of a table are written
+    by that many processes at once. Bulk inserts bypass the financial rollup
+    and the search index: rebuild them afterwards.
+
+    ``progress(name, rows, seconds)`` is called after each table.
+    """
+    pool = None
+    if workers > 1:
+        # The forked processes must not share the parent's connections.
+        connections.close_all()
+        pool = multiprocessing.get_context('fork').Pool(workers, initializer=init_worker, initargs=(plan,))
+    try:
+        for name in SEED_TABLES:
+            started = time.monotonic()
+            tasks = [(name, chunk) for chunk in range(-(-plan.sizes[name] // CHUNK_SIZE))]
+            if pool:
+                rows = sum(pool.map(write_worker_chunk, tasks))
+            else:
+                rows = sum(write_chunk(plan, *task) for task in tasks)
+            if progress:
+                progress(name, rows, time.monotonic() - started)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
@@ -2,4 +2,12 @@ from ..serializers.utilisateur_serializer import UtilisateurSerializer
 from .sub_project_serializer import SousProjetSerializer
 from ..serializers.maitre_doeuvre_serializer import MaitreDoeuvreSerializer
 from ..serializers.maitre_ouvrage_serializer import MaitreOuvrageSerializer
-from ..serializers.Projects_serializers import ProjetSerializer
\ No newline at end of file
+from ..serializers.Projects_serializers import ProjetSerializer
+from ..serializers.facture_export_serializer import FactureExportQuerySerializer
+from ..serializers.project_summary_serializer import ProjectSummaryQuerySerializer, ProjectSummarySerializer
+from ..serializers.fields import PrefetchedPrimaryKeyRelatedField
+from ..serializers.values_list_serializer import ValuesListSerializer, get_values_list_serializer
+from ..serializers.search_serializer import SearchQuerySerializer
+from ..serializers.list_filter_serializer import ListFilterQuerySerializer
+from ..serializers.project_tree_serializer import ProjectTreeQuerySerializer, ProjectTreeSerializer
+from ..serializers.project_timeline_serializer import DelayStatsSerializer, ProjectTimelineSerializer
@@ -0,0 +1,13 @@
+from rest_framework import serializers
+
+
+class FactureExportQuerySerializer(serializers.Serializer):
+    export_format = serializers.ChoiceField(choices=['csv', 'ndjson'], default='csv')
+    projet = serializers.IntegerField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('date_from') and attrs.get('date_to') and attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError('date_from must be before date_to')
+        return attrs
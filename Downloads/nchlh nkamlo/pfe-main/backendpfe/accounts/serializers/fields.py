@@ -0,0 +1,42 @@
+from django.core.exceptions import ValidationError
+from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField that first looks the pk up in ``objects``, a
+    ``{pk: instance}`` map loaded once for a whole batch, and only queries
+    the database for pks that are not in it.
+    """
+
+    def __init__(self, objects=None, **kwargs):
+        self.objects = objects or {}
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        try:
+            return self.objects[self.get_queryset().model._meta.pk.to_python(data)]
+        except (KeyError, TypeError, ValidationError):
+            return super().to_internal_value(data)
+
+
+class PrefetchedUniqueValidator(UniqueValidator):
+    """
+    UniqueValidator that first looks the value up in ``owners``, a
+    ``{value: pk}`` map of the rows holding the values of a whole batch,
+    loaded with one query, and only queries the database for values that
+    were not looked up.
+    """
+
+    def __init__(self, queryset, values, field_name, **kwargs):
+        super().__init__(queryset, **kwargs)
+        self.values = set(values)
+        self.owners = dict(queryset.filter(**{field_name + '__in': self.values}).values_list(field_name, 'pk'))
+
+    def __call__(self, value, serializer_field):
+        if value not in self.values:
+            return super().__call__(value, serializer_field)
+        instance = getattr(serializer_field.parent, 'instance', None)
+        if value in self.owners and (instance is None or self.owners[value] != instance.pk):
+            raise serializers.ValidationError(self.message, code='unique')
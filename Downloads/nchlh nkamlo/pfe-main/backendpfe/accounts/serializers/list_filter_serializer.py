@@ -0,0 +1,80 @@
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework import serializers
+
+FILTER_FIELD_CLASSES = {
+    'AutoField': serializers.IntegerField,
+    'IntegerField': serializers.IntegerField,
+    'DateField': serializers.DateField,
+    'DateTimeField': serializers.DateTimeField,
+}
+
+
+class CommaSeparatedListField(serializers.ListField):
+    """``?name=a,b`` (or ``?name=a&name=b``) as a list of ``child`` values."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [data]
+        items = [item.strip() for value in data for item in str(value).split(',') if item.strip()]
+        return super().to_internal_value(items)
+
+
+def get_filter_param(name, lookup):
+    return name if lookup == 'exact' else name + LOOKUP_SEP + lookup
+
+
+def get_filter_field(model_field, lookup):
+    while model_field.is_relation:
+        model_field = model_field.target_field
+    field_class = FILTER_FIELD_CLASSES.get(model_field.get_internal_type(), serializers.CharField)
+    if lookup == 'in':
+        return CommaSeparatedListField(child=field_class(), allow_empty=False, required=False)
+    return field_class(required=False)
+
+
+class ListFilterQuerySerializer(serializers.Serializer):
+    """
+    The filters and ordering a list endpoint accepts, as declared by its view:
+    ``context['filter_fields']`` maps model fields to their allowed lookups
+    (``{'statut': ['exact', 'in'], 'date_debut_de_projet': ['gte', 'lte']}``
+    gives ``?statut=``, ``?statut__in=a,b``, ``?date_debut_de_projet__gte=``
+    ...) and ``context['ordering_fields']`` lists what ``?ordering=-a,b``
+    may sort by. Any other lookup on a field of ``context['model']`` is
+    rejected rather than ignored.
+
+    ``validated_data`` is ``{'filters': {lookup: value}, 'ordering': [...]}``.
+    With ``context['keyset']``, the ordering columns must not be NULL.
+    """
+    ordering = CommaSeparatedListField(child=serializers.CharField(), allow_empty=False, required=False)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        opts = self.context['model']._meta
+        for name, lookups in self.context['filter_fields'].items():
+            for lookup in lookups:
+                fields[get_filter_param(name, lookup)] = get_filter_field(opts.get_field(name), lookup)
+        return fields
+
+    def validate_ordering(self, value):
+        unknown = [field for field in value if field.lstrip('-') not in self.context['ordering_fields']]
+        if unknown:
+            raise serializers.ValidationError('Cannot sort by: %s' % ', '.join(unknown))
+        if self.context.get('keyset'):
+            opts = self.context['model']._meta
+            nullable = [field.lstrip('-') for field in value if opts.get_field(field.lstrip('-')).null]
+            if nullable:
+                raise serializers.ValidationError(
+                    'Cannot sort by %s with ?cursor= (it can be empty)' % ', '.join(nullable))
+        return value
+
+    def validate(self, attrs):
+        opts = self.context['model']._meta
+        field_names = {field.name for field in opts.concrete_fields} | {field.attname for field in opts.concrete_fields}
+        not_allowed = {
+            param: ['Filtering on this field is not allowed']
+            for param in self.initial_data
+            if param not in self.fields and param.split(LOOKUP_SEP)[0] in field_names
+        }
+        if not_allowed:
+            raise serializers.ValidationError(not_allowed)
+        return {'ordering': attrs.pop('ordering', []), 'filters': attrs}
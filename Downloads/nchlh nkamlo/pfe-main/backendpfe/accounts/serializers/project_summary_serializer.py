@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+
+class ProjectSummaryQuerySerializer(serializers.Serializer):
+    statut = serializers.CharField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('date_from') and attrs.get('date_to') and attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError('date_from must be before date_to')
+        return attrs
+
+
+class ProjectSummarySerializer(serializers.Serializer):
+    id_projet = serializers.IntegerField()
+    nom_projet = serializers.CharField()
+    statut = serializers.CharField()
+    total_ap = serializers.DecimalField(max_digits=65, decimal_places=30)
+    total_marche = serializers.DecimalField(max_digits=65, decimal_places=30)
+    total_facture_ttc = serializers.DecimalField(max_digits=65, decimal_places=30)
+    total_facture_net_ht = serializers.DecimalField(max_digits=65, decimal_places=30)
+    total_paye = serializers.DecimalField(max_digits=65, decimal_places=30)
@@ -0,0 +1,39 @@
+from rest_framework import serializers
+
+
+class MilestoneSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    label = serializers.CharField()
+    date_prevu = serializers.DateField()
+    date_realiser = serializers.DateField(allow_null=True)
+    delay_days = serializers.IntegerField()
+
+
+class WorstMilestoneSerializer(MilestoneSerializer):
+    type = serializers.CharField()
+    id_projet = serializers.IntegerField(allow_null=True)
+    id_sous_projet = serializers.IntegerField(allow_null=True)
+
+
+class SousProjetTimelineSerializer(serializers.Serializer):
+    id_sous_projet = serializers.IntegerField()
+    nom_sous_projet = serializers.CharField()
+    delay_days = serializers.IntegerField(allow_null=True)
+    milestones = MilestoneSerializer(many=True)
+
+
+class ProjectTimelineSerializer(serializers.Serializer):
+    id_projet = serializers.IntegerField()
+    nom_projet = serializers.CharField()
+    statut = serializers.CharField()
+    delay_days = serializers.IntegerField(allow_null=True)
+    milestones = MilestoneSerializer(many=True)
+    sous_projets = SousProjetTimelineSerializer(many=True)
+
+
+class DelayStatsSerializer(serializers.Serializer):
+    milestones = serializers.IntegerField()
+    late = serializers.IntegerField()
+    mean_delay_days = serializers.FloatField(allow_null=True)
+    p90_delay_days = serializers.IntegerField(allow_null=True)
+    worst = WorstMilestoneSerializer(many=True)
@@ -0,0 +1,74 @@
+from collections import OrderedDict, namedtuple
+
+from rest_framework import serializers
+from ..models import Document, EtatDavancementDeprojet, Marche, MaitreDoeuve, MaitreOuvrage, SousProjet
+from ..serializers.Projects_serializers import ProjetSerializer
+from ..serializers.maitre_doeuvre_serializer import MaitreDoeuvreSerializer
+from ..serializers.maitre_ouvrage_serializer import MaitreOuvrageSerializer
+from ..serializers.sub_project_serializer import SousProjetSerializer
+
+
+class MarcheSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Marche
+        fields = '__all__'
+
+
+class DocumentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Document
+        fields = '__all__'
+
+
+class EtatDavancementSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EtatDavancementDeprojet
+        fields = '__all__'
+
+
+TreeBranch = namedtuple('TreeBranch', ['model', 'serializer_class', 'ordering'])
+
+# The children of a Projet that /projects/<pk>/tree/ can nest, by output key.
+# Each branch is loaded with one query on its (id_projet, ...) index.
+TREE_BRANCHES = OrderedDict([
+    ('sous_projets', TreeBranch(SousProjet, SousProjetSerializer, ['id_sous_projet'])),
+    ('maitres_ouvrage', TreeBranch(MaitreOuvrage, MaitreOuvrageSerializer, ['id_mo'])),
+    ('maitres_doeuvre', TreeBranch(MaitreDoeuve, MaitreDoeuvreSerializer, ['id_md'])),
+    ('marches', TreeBranch(Marche, MarcheSerializer, ['date_marche', 'id_marche'])),
+    ('documents', TreeBranch(Document, DocumentSerializer, ['date_ajout', 'id_document'])),
+    ('etats_davancement', TreeBranch(EtatDavancementDeprojet, EtatDavancementSerializer, ['id_etat'])),
+])
+
+
+class ProjectTreeQuerySerializer(serializers.Serializer):
+    """``?include=`` comma-separated branches to nest (all by default)."""
+    include = serializers.CharField(required=False)
+
+    def validate_include(self, value):
+        branches = {branch.strip() for branch in value.split(',') if branch.strip()}
+        unknown = sorted(branches - set(TREE_BRANCHES))
+        if unknown:
+            raise serializers.ValidationError('Unknown branch(es): %s' % ', '.join(unknown))
+        return [branch for branch in TREE_BRANCHES if branch in branches]
+
+    def validate(self, attrs):
+        attrs.setdefault('include', list(TREE_BRANCHES))
+        return attrs
+
+
+class ProjectTreeSerializer(ProjetSerializer):
+    """
+    A Projet with its children nested. Each branch reads the list the view
+    loaded into the attribute of the same name; leave out the branches that
+    were not loaded with ``include``.
+    """
+
+    def __init__(self, *args, include=tuple(TREE_BRANCHES), **kwargs):
+        self.include = include
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.include:
+            fields[name] = TREE_BRANCHES[name].serializer_class(many=True, read_only=True)
+        return fields
@@ -0,0 +1,34 @@
+from rest_framework import serializers
+from ..search import MIN_TERM_LENGTH, SEARCH_SOURCES, tokenize
+
+# Deeper pages would make every ranking query read too many rows.
+MAX_SEARCH_RESULTS = 1000
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """
+    ``?q=`` words to look for, ``?type=`` comma-separated kinds of documents
+    (all by default), ``?page=`` / ``?per_page=``.
+    """
+    q = serializers.CharField(max_length=200)
+    type = serializers.CharField(required=False)
+    page = serializers.IntegerField(min_value=1, default=1)
+    per_page = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+    def validate_q(self, value):
+        if not tokenize(value):
+            raise serializers.ValidationError('Enter at least one word of %d letters or more' % MIN_TERM_LENGTH)
+        return value
+
+    def validate_type(self, value):
+        kinds = {kind.strip() for kind in value.split(',') if kind.strip()}
+        unknown = sorted(kinds - set(SEARCH_SOURCES))
+        if unknown:
+            raise serializers.ValidationError('Unknown type(s): %s' % ', '.join(unknown))
+        return [kind for kind in SEARCH_SOURCES if kind in kinds]
+
+    def validate(self, attrs):
+        if attrs['page'] * attrs['per_page'] > MAX_SEARCH_RESULTS:
+            raise serializers.ValidationError('Only the first %d hits can be paged through' % MAX_SEARCH_RESULTS)
+        attrs.setdefault('type', list(SEARCH_SOURCES))
+        return attrs
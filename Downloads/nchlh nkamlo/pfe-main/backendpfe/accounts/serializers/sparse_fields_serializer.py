@@ -0,0 +1,38 @@
+from functools import lru_cache
+
+from rest_framework import serializers
+
+
+@lru_cache(maxsize=None)
+def get_readable_field_names(serializer_class):
+    return tuple(name for name, field in serializer_class().fields.items() if not field.write_only)
+
+
+class SparseFieldsQuerySerializer(serializers.Serializer):
+    """
+    ``?fields=a,b`` keeps only these fields of the output, ``?exclude=c``
+    drops some. ``validated_data['fields']`` is the resulting tuple of names,
+    in serializer order, or is absent when neither parameter is given.
+    Expects the available names as ``context['field_names']``.
+    """
+    fields = serializers.CharField(required=False)
+    exclude = serializers.CharField(required=False)
+
+    def parse_names(self, value):
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.context['field_names']]
+        if unknown:
+            raise serializers.ValidationError('Unknown field(s): %s' % ', '.join(unknown))
+        return names
+
+    def validate_fields(self, value):
+        return self.parse_names(value)
+
+    def validate_exclude(self, value):
+        return self.parse_names(value)
+
+    def validate(self, attrs):
+        if 'fields' not in attrs and 'exclude' not in attrs:
+            return {}
+        kept = set(attrs.get('fields') or self.context['field_names']) - set(attrs.get('exclude', ()))
+        return {'fields': tuple(name for name in self.context['field_names'] if name in kept)}
@@ -5,7 +5,8 @@ from django.contrib.auth.hashers import make_password
 class UtilisateurSerializer(serializers.ModelSerializer):
     class Meta:
         model = Utilisateur
-        fields = ['id', 'email', 'first_name', 'last_name', 'role_de_utilisateur', 'password']
+        fields = ['id_utilisateur', 'email', 'nom', 'prenom', 'role_de_utilisateur', 'password']
+        extra_kwargs = {'password': {'write_only': True}}
 
     def create(self, validated_data):
         # Hash password before saving it to the database
@@ -0,0 +1,74 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+
+
+class ValuesListSerializer:
+    """
+    Read-only, ``many=True`` stand-in for a ModelSerializer.
+
+    It maps the rows of ``queryset.values_list(*self.columns)`` to the same
+    output as ``serializer_class(queryset, many=True).data``, without
+    building a model instance per row. Each value goes through the
+    ``to_representation()`` of its serializer field, except for the fields
+    that would return it unchanged (integers, strings, primary keys).
+    Only fields mapped to a concrete model column are supported.
+
+    ``fields`` restricts the output (and the columns) to these names.
+    """
+
+    def __init__(self, serializer_class, fields=None):
+        model = serializer_class.Meta.model
+        self.names, self.columns, self.conversions = [], [], []
+        for name, field in serializer_class().fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                model_field = None
+            if model_field is None or not model_field.concrete or model_field.many_to_many:
+                raise ImproperlyConfigured(
+                    '%s.%s is not a model column; it cannot be read with values_list()'
+                    % (serializer_class.__name__, name))
+            self.names.append(name)
+            self.columns.append(model_field.attname)
+            if not self.is_passthrough(field):
+                self.conversions.append((name, field.to_representation))
+
+    def is_passthrough(self, field):
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            return field.pk_field is None
+        return isinstance(field, (serializers.IntegerField, serializers.CharField))
+
+    def get_columns(self, queryset):
+        """``columns`` plus the pk and ordering columns the paginators read."""
+        opts = queryset.model._meta
+        columns = list(self.columns)
+        for name in ['pk'] + [field.lstrip('-') for field in queryset.query.order_by]:
+            try:
+                attname = opts.pk.attname if name == 'pk' else opts.get_field(name).attname
+            except FieldDoesNotExist:
+                continue
+            if attname not in columns:
+                columns.append(attname)
+        return columns
+
+    def to_representation(self, rows):
+        names, conversions = self.names, self.conversions
+        data = []
+        for row in rows:
+            # zip() stops at the serialized columns; extra columns are ignored.
+            item = dict(zip(names, row))
+            for name, to_representation in conversions:
+                value = item[name]
+                if value is not None:
+                    item[name] = to_representation(value)
+            data.append(item)
+        return data
+
+
+@lru_cache(maxsize=256)
+def get_values_list_serializer(serializer_class, fields=None):
+    return ValuesListSerializer(serializer_class, fields)
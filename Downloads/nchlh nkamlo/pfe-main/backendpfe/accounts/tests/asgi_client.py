@@ -0,0 +1,67 @@
+"""
+Requests sent through Django's ASGIHandler and the MIDDLEWARE of the
+settings, as an ASGI server would, to check that slow reads overlap.
+
+The tests that use it set ``ROOT_URLCONF`` to this module: its project
+detail route is an async read view that sleeps SLOW_READ_SECONDS first.
+"""
+import asyncio
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.urls import path
+from rest_framework_simplejwt.tokens import AccessToken
+from ..views import ProjectView
+from ..views.async_views import async_read_view
+
+SLOW_READ_SECONDS = 0.5
+
+
+class SlowProjectView(ProjectView):
+
+    def get(self, request, *args, **kwargs):
+        time.sleep(SLOW_READ_SECONDS)  # Stands for a slow query.
+        return super().get(request, *args, **kwargs)
+
+
+urlpatterns = [
+    path('api/projects/<int:pk>/', async_read_view(SlowProjectView), name='project-detail'),
+]
+
+
+async def asgi_request(handler, method, url, user=None):
+    """``(status, body)`` of one request through ``handler``."""
+    path, _, query = url.partition('?')
+    headers = [(b'host', b'testserver')]
+    if user is not None:
+        headers.append((b'authorization', b'Bearer %s' % str(AccessToken.for_user(user)).encode()))
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method, 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': query.encode(), 'root_path': '',
+        'headers': headers, 'server': ('testserver', 80), 'client': ('127.0.0.1', 50000),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await handler(scope, receive, send)
+    status = next(message['status'] for message in messages if message['type'] == 'http.response.start')
+    body = b''.join(message.get('body', b'') for message in messages if message['type'] == 'http.response.body')
+    return status, body
+
+
+def get_concurrently(urls, user=None):
+    """``([(status, body)], seconds)`` of GETs of ``urls`` sent all at once to one ASGIHandler."""
+    handler = ASGIHandler()
+
+    async def main():
+        return await asyncio.gather(*[asgi_request(handler, 'GET', url, user) for url in urls])
+
+    started = time.monotonic()
+    responses = async_to_sync(main)()
+    return responses, time.monotonic() - started
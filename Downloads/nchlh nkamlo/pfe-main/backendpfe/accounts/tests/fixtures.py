@@ -0,0 +1,52 @@
+from datetime import date
+from decimal import Decimal
+
+from ..models import (
+    Document, Employe, Facture, Incident, MaitreDoeuve, MaitreOuvrage, Marche, Projet, SousProjet, Utilisateur
+)
+
+
+def make_user(email='admin@example.com', role='admin'):
+    return Utilisateur.objects.create_user(email, 'secret', nom='Test', role_de_utilisateur=role)
+
+
+def make_projet(index=0, **fields):
+    values = dict(
+        nom_projet='Projet %d' % index,
+        description_de_projet='Description',
+        date_debut_de_projet=date(2024, 1, 1),
+        date_fin_de_projet=date(2024, 12, 31),
+        statut='en cours',
+    )
+    values.update(fields)
+    return Projet.objects.create(**values)
+
+
+def make_projet_tree(projet, size=3):
+    """Creates ``size`` rows of every table that hangs off ``projet``."""
+    for index in range(size):
+        sous_projet = SousProjet.objects.create(
+            nom_sous_projet='Sous projet %d' % index,
+            date_debut_sousprojet=date(2024, 1, 1),
+            date_finsousprojet=date(2024, 6, 30),
+            statut_sous_projet='en cours',
+            id_projet=projet,
+            description_sous_projet='Description %d' % index,
+        )
+        MaitreOuvrage.objects.create(id_projet=projet, description_mo='MO %d' % index)
+        maitre_doeuvre = MaitreDoeuve.objects.create(id_projet=projet, nom_fournisseur='MD %d' % index)
+        marche = Marche.objects.create(
+            date_marche=date(2024, 2, 1), description_marche='Marche %d' % index, id_projet=projet,
+            numero_marche=index, numero_appel_dof=index, visa_cme='visa', prix_da=Decimal('1000'),
+            id_md=maitre_doeuvre,
+        )
+        Facture.objects.create(
+            numero_facture=index, date_facturation=date(2024, 3, 1), montant_ttc=Decimal('119'),
+            montant_net_ht=Decimal('100'), id_projet=projet, id_sous_projet=sous_projet, id_marche=marche,
+        )
+        Document.objects.create(titre='Doc %d' % index, date_ajout=date(2024, 1, 2), description='Doc',
+                                id_projet=projet, id_sous_projet=sous_projet)
+        Incident.objects.create(description_incident='Incident %d' % index, date_incident=date(2024, 4, 1),
+                                id_projet=projet, id_sous_projet=sous_projet)
+        Employe.objects.create(id_utilisateur=make_user('employe%d-%d@example.com' % (projet.pk, index), 'employee'),
+                               id_projet=projet, id_sous_projet=sous_projet)
@@ -0,0 +1,99 @@
+import os
+import re
+import sys
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.db import connection, transaction
+from .. import metrics
+
+PROJECT_DIR = str(settings.BASE_DIR) + os.sep
+# Execute wrappers sit between the code that queries and the database.
+SKIPPED_FILES = {os.path.abspath(module.__file__).replace('.pyc', '.py') for module in (metrics, sys.modules[__name__])}
+
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def get_query_location():
+    """``path:line in function`` of the innermost project frame on the stack."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if path.startswith(PROJECT_DIR) and path not in SKIPPED_FILES:
+            return '%s:%d in %s' % (os.path.relpath(path, PROJECT_DIR), frame.f_lineno, frame.f_code.co_name)
+        frame = frame.f_back
+    return '(outside the project)'
+
+
+class QueryRecorder:
+    """Execute wrapper keeping the SQL of every query with where it was sent from."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, get_query_location()))
+        return execute(sql, params, many, context)
+
+
+def describe_queries(queries, limit=3):
+    """The queries grouped by stack location, most frequent first, with their distinct SQL shapes."""
+    by_location = OrderedDict()
+    for sql, location in queries:
+        by_location.setdefault(location, Counter())[LITERALS.sub('?', sql)] += 1
+    lines = []
+    for location, shapes in sorted(by_location.items(), key=lambda item: -sum(item[1].values())):
+        lines.append('  %4d x %s' % (sum(shapes.values()), location))
+        for sql, count in shapes.most_common(limit):
+            lines.append('         %4d x %s' % (count, sql[:300]))
+    return '\n'.join(lines)
+
+
+class QueryBudgetMixin:
+    """
+    Pins the number of queries of endpoints at several data sizes, to catch
+    N+1 patterns: a count over its budget, or one that grows with the number
+    of rows, fails with the SQL of the largest size grouped by the line of
+    project code that sent it.
+
+    ``populate(size)`` creates the rows of one size and returns the values
+    the URLs are formatted with; each size is rolled back afterwards. The
+    data of a request may be a function of those values, e.g. a bulk
+    payload of ``size`` items; it is sent as JSON to the writes.
+    """
+    budget_sizes = (1, 10, 100)
+
+    def measure_queries(self, requests, populate):
+        """``{name: [(size, queries)]}`` of ``requests``, ``(name, method, url, data)`` tuples, at every size."""
+        measured = {name: [] for name, _, _, _ in requests}
+        for size in self.budget_sizes:
+            with transaction.atomic():
+                values = populate(size)
+                for name, method, url, data in requests:
+                    if callable(data):
+                        data = data(values)
+                    options = {} if method == 'get' else {'format': 'json'}
+                    recorder = QueryRecorder()
+                    with connection.execute_wrapper(recorder):
+                        response = getattr(self.client, method)(url.format(**values), data, **options)
+                        if response.status_code >= 400:
+                            self.fail('%s returned %d: %s' % (name, response.status_code, response.content[:500]))
+                        if response.streaming:
+                            b''.join(response.streaming_content)
+                    measured[name].append((size, recorder.queries))
+                transaction.set_rollback(True)
+        return measured
+
+    def assertQueryBudget(self, name, measurements, budget):
+        counts = [len(queries) for _, queries in measurements]
+        problems = []
+        if max(counts) > budget:
+            problems.append('over its budget of %d' % budget)
+        if counts[-1] > counts[0]:
+            problems.append('growing with the number of rows')
+        if problems:
+            size, queries = measurements[-1]
+            self.fail('%s made %s queries at %s rows: %s. The %d queries at %d rows:\n%s' % (
+                name, ' / '.join(map(str, counts)), ' / '.join(str(size) for size, _ in measurements),
+                ' and '.join(problems), len(queries), size, describe_queries(queries),
+            ))
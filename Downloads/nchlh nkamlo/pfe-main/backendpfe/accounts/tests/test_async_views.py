@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test import TransactionTestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from ..concurrency import run_concurrently
+from ..models import Projet
+from ..views import ProjectTreeView, ProjectView
+from ..views.async_views import async_read_view
+from .asgi_client import SLOW_READ_SECONDS, get_concurrently
+from .fixtures import make_projet, make_projet_tree, make_user
+
+
+class AsyncReadViewTests(TransactionTestCase):
+    # Worker threads have their own connections, which only see committed rows.
+
+    def setUp(self):
+        self.user = make_user()
+        self.projet = make_projet()
+        make_projet_tree(self.projet, size=2)
+        self.factory = APIRequestFactory()
+
+    def call(self, view, method, url, **kwargs):
+        view_kwargs = kwargs.pop('view_kwargs', {})
+        request = getattr(self.factory, method)(url, format='json', **kwargs)
+        force_authenticate(request, self.user)
+        return async_to_sync(view)(request, **view_kwargs)
+
+    def test_read_view(self):
+        view = async_read_view(ProjectView)
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+        response = self.call(view, 'get', '/api/projects/%d/' % self.projet.pk, view_kwargs={'pk': self.projet.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_rendered)
+        self.assertIn(b'"nom_projet":"Projet 0"', response.content)
+
+        response = self.call(view, 'put', '/api/projects/%d/' % self.projet.pk, view_kwargs={'pk': self.projet.pk},
+                             data={'nom_projet': 'Renamed', 'description_de_projet': 'Description', 'statut': 'en cours',
+                                   'date_debut_de_projet': '2024-01-01', 'date_fin_de_projet': '2024-12-31'})
+        self.assertEqual(response.status_code, 200)
+        self.projet.refresh_from_db()
+        self.assertEqual(self.projet.nom_projet, 'Renamed')
+
+    def test_tree(self):
+        response = self.call(async_read_view(ProjectTreeView), 'get', '/api/projects/%d/tree/' % self.projet.pk,
+                             view_kwargs={'pk': self.projet.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'"Sous projet 1"', response.content)
+
+    def test_run_concurrently(self):
+        caller = threading.get_ident()
+        threads = run_concurrently(threading.get_ident, threading.get_ident)
+        self.assertNotIn(caller, threads)
+        with transaction.atomic():
+            self.assertEqual(run_concurrently(threading.get_ident, threading.get_ident), [caller, caller])
+
+    def test_run_concurrently_closes_connections(self):
+        def query():
+            # The connection of the worker thread.
+            Projet.objects.count()
+            return connections[DEFAULT_DB_ALIAS]
+
+        closed = []
+        wrapper_class = type(connections[DEFAULT_DB_ALIAS])
+        close = wrapper_class.close
+        # Persistent connections, as in production, are closed all the same.
+        with mock.patch.dict(connections.databases[DEFAULT_DB_ALIAS], CONN_MAX_AGE=60), \
+                mock.patch.object(wrapper_class, 'close', autospec=True,
+                                  side_effect=lambda wrapper: closed.append(wrapper) or close(wrapper)):
+            wrappers = run_concurrently(query, query)
+        self.assertNotIn(connections[DEFAULT_DB_ALIAS], wrappers)
+        for wrapper in wrappers:
+            self.assertIn(wrapper, closed)
+            if not wrapper.is_in_memory_db():  # SQLite would lose the test database.
+                self.assertIsNone(wrapper.connection)
+
+
+@override_settings(ROOT_URLCONF='accounts.tests.asgi_client')
+class ASGIConcurrencyTests(TransactionTestCase):
+    """Slow reads through ASGIHandler and the whole MIDDLEWARE of the settings."""
+
+    def test_reads_overlap(self):
+        user = make_user()
+        url = '/api/projects/%d/' % make_projet().pk
+        responses, seconds = get_concurrently([url] * 4, user)
+        self.assertEqual([status for status, _ in responses], [200] * 4)
+        self.assertIn(b'"nom_projet":"Projet 0"', responses[0][1])
+        # A sync-only middleware would run them one after the other, in
+        # 4 * SLOW_READ_SECONDS.
+        self.assertLess(seconds, 2 * SLOW_READ_SECONDS)
@@ -0,0 +1,52 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ..authentication import user_cache
+from .fixtures import make_user
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user()
+        cls.chef = make_user('chef@example.com', 'chef de projet')
+
+    def setUp(self):
+        user_cache.clear()
+
+    def authenticate(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer %s' % AccessToken.for_user(user))
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        return response, [query for query in context.captured_queries if '"utilisateur"' in query['sql']
+                          or '`utilisateur`' in query['sql']]
+
+    def test_user_is_read_once(self):
+        self.authenticate(self.admin)
+        response, queries = self.user_queries('/api/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 1)
+
+        response, queries = self.user_queries('/api/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+
+    def test_update_user_invalidates_cache(self):
+        self.authenticate(self.chef)
+        response = self.client.get('/api/auth/')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), {'success': False, 'message': 'Permission denied'})
+
+        self.authenticate(self.admin)
+        response = self.client.post('/api/auth/', {
+            'action': 'update_user', 'user_id': self.chef.pk, 'role_de_utilisateur': 'admin'
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.authenticate(self.chef)
+        self.assertEqual(self.client.get('/api/auth/').status_code, 200)
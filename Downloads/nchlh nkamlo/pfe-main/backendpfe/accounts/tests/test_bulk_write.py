@@ -0,0 +1,140 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from ..models import Chefprojet, MaitreOuvrage, SousProjet
+from ..views.bulk_write_mixin import BulkWriteMixin
+from .fixtures import make_projet, make_user
+
+
+class BulkWriteTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.chef = Chefprojet.objects.create(id_utilisateur=make_user('chef@example.com', 'chef de projet'))
+        cls.projet = make_projet()
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def sous_projet(self, index, **fields):
+        item = {
+            'nom_sous_projet': 'Sous projet %d' % index, 'date_debut_sousprojet': '2024-01-01',
+            'date_finsousprojet': '2024-06-30', 'statut_sous_projet': 'en cours',
+            'id_projet': self.projet.pk, 'id_utilisateur': self.chef.pk,
+        }
+        item.update(fields)
+        return item
+
+    def maitre_ouvrage(self, index, **fields):
+        item = {'description_mo': 'MO %d' % index, 'email_mo': 'mo%d@example.com' % index, 'id_projet': self.projet.pk}
+        item.update(fields)
+        return item
+
+    def test_create(self):
+        response = self.client.post('/api/sous-projet/', [self.sous_projet(0), self.sous_projet(1)], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['message'], '2 items created, 0 rejected')
+        self.assertEqual(
+            list(SousProjet.objects.order_by('nom_sous_projet').values_list('nom_sous_projet', flat=True)),
+            ['Sous projet 0', 'Sous projet 1']
+        )
+
+    def test_invalid_item_rejects_batch(self):
+        items = [self.sous_projet(0), self.sous_projet(1, statut_sous_projet=None), self.sous_projet(2)]
+        response = self.client.post('/api/sous-projet/', items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+        self.assertFalse(SousProjet.objects.exists())
+
+    def test_constraint_rolls_back_batch(self):
+        # All three pass validation, but the third repeats the unique
+        # email_mo of the first.
+        items = [self.maitre_ouvrage(0), self.maitre_ouvrage(1), self.maitre_ouvrage(2, email_mo='mo0@example.com')]
+        response = self.client.post('/api/maitre-ouvrage/', items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.data['success'])
+        self.assertFalse(MaitreOuvrage.objects.exists())
+
+    def test_partial_mode(self):
+        items = [
+            self.maitre_ouvrage(0),
+            self.maitre_ouvrage(1, description_mo=''),
+            self.maitre_ouvrage(2, email_mo='mo0@example.com'),
+            self.maitre_ouvrage(3),
+        ]
+        response = self.client.post('/api/maitre-ouvrage/?mode=partial', items, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertFalse(response.data['success'])
+        self.assertEqual(response.data['message'], '2 items created, 2 rejected')
+        errors = response.data['errors']
+        self.assertEqual([error['index'] for error in errors], [1, 2])
+        self.assertIn('description_mo', errors[0]['errors'])
+        self.assertIn('non_field_errors', errors[1]['errors'])
+        self.assertEqual(
+            sorted(MaitreOuvrage.objects.values_list('description_mo', flat=True)), ['MO 0', 'MO 3']
+        )
+
+    def test_unique_fields(self):
+        existing = MaitreOuvrage.objects.create(description_mo='MO 9', email_mo='mo9@example.com', id_projet=self.projet)
+        items = [self.maitre_ouvrage(0), self.maitre_ouvrage(1, email_mo='mo9@example.com')]
+        response = self.client.post('/api/maitre-ouvrage/', items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][0]['index'], 1)
+        self.assertEqual(list(response.data['errors'][0]['errors']), ['email_mo'])
+
+        # A row keeps its own value.
+        items = [self.maitre_ouvrage(9, id_mo=existing.pk, description_mo='Renamed')]
+        response = self.client.put('/api/maitre-ouvrage/', items, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        existing.refresh_from_db()
+        self.assertEqual(existing.description_mo, 'Renamed')
+
+    def test_update(self):
+        SousProjet.objects.bulk_create([SousProjet(**self.sous_projet(index, id_projet=self.projet, id_utilisateur=None))
+                                        for index in range(3)])
+        pks = list(SousProjet.objects.order_by('pk').values_list('pk', flat=True))
+        items = [self.sous_projet(index, id_sous_projet=pk, statut_sous_projet='fini') for index, pk in enumerate(pks)]
+        items.append(self.sous_projet(3, id_sous_projet=pks[-1] + 1))
+        response = self.client.put('/api/sous-projet/?mode=partial', items, format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['errors'], [{'index': 3, 'errors': {'id_sous_projet': ['Not found.']}}])
+        self.assertEqual(set(SousProjet.objects.values_list('statut_sous_projet', flat=True)), {'fini'})
+
+    def test_max_items(self):
+        items = [self.sous_projet(index) for index in range(BulkWriteMixin.bulk_max_items + 1)]
+        with self.assertNumQueries(0):
+            response = self.client.post('/api/sous-projet/', items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['message'], 'A batch cannot hold more than 1000 items')
+        self.assertFalse(SousProjet.objects.exists())
+
+    def test_queries_independent_of_batch_size(self):
+        def count_queries(method, items):
+            with CaptureQueriesContext(connection) as context:
+                response = getattr(self.client, method)('/api/sous-projet/', items, format='json')
+            self.assertLess(response.status_code, 300, response.data)
+            return len(context.captured_queries)
+
+        created, updated = [], []
+        for size in (1, 10, 100):
+            SousProjet.objects.all().delete()
+            created.append(count_queries('post', [self.sous_projet(index) for index in range(size)]))
+            pks = SousProjet.objects.values_list('pk', flat=True)
+            updated.append(count_queries('put', [self.sous_projet(0, id_sous_projet=pk) for pk in pks]))
+        self.assertEqual(len(set(created)), 1, created)
+        self.assertEqual(len(set(updated)), 1, updated)
+
+    def test_unique_queries_independent_of_batch_size(self):
+        # email_mo is unique: its uniqueness is checked for the whole batch at once.
+        counts = []
+        for size in (1, 10, 100):
+            MaitreOuvrage.objects.all().delete()
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post(
+                    '/api/maitre-ouvrage/', [self.maitre_ouvrage(index) for index in range(size)], format='json'
+                )
+            self.assertEqual(response.status_code, 201, response.data)
+            counts.append(len(context.captured_queries))
+        self.assertEqual(len(set(counts)), 1, counts)
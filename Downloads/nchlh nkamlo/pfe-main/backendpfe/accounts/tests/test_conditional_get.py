@@ -0,0 +1,88 @@
+import time
+from unittest import mock
+
+from django.utils.http import http_date
+from rest_framework.test import APITestCase
+
+from ..models import MaitreOuvrage, SousProjet
+from ..serializers import ProjetSerializer
+from ..serializers.values_list_serializer import ValuesListSerializer
+from .fixtures import make_projet, make_projet_tree, make_user
+
+
+class ConditionalGetTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.projet = make_projet()
+        make_projet_tree(cls.projet, size=2)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_detail(self):
+        url = '/api/projects/%d/' % self.projet.pk
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        with mock.patch.object(ProjetSerializer, 'to_representation', side_effect=AssertionError):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], etag)
+            self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        self.assertEqual(self.client.get(url, {'fields': 'nom_projet'}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.projet.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list(self):
+        url = '/api/sous-projet/projet/%d/' % self.projet.pk
+        etag = self.client.get(url)['ETag']
+
+        with mock.patch.object(ValuesListSerializer, 'to_representation', side_effect=AssertionError):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        sous_projet = SousProjet.objects.filter(id_projet=self.projet).first()
+        response = self.client.put('/api/sous-projet/', [{
+            'id_sous_projet': sous_projet.pk, 'nom_sous_projet': 'Renamed', 'date_debut_sousprojet': '2024-01-01',
+            'date_finsousprojet': '2024-06-30', 'statut_sous_projet': 'en cours', 'id_projet': self.projet.pk,
+        }], format='json')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # Deleting an older row leaves max(updated_at) as is; the count differs.
+        older, _ = [SousProjet.objects.create(
+            nom_sous_projet='Extra', date_debut_sousprojet='2024-01-01', date_finsousprojet='2024-06-30',
+            statut_sous_projet='en cours', id_projet=self.projet) for _ in range(2)]
+        response = self.client.get(url)
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+        older.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_after_delete(self):
+        # A delete leaves max(updated_at) as it was: a list validated with
+        # If-Modified-Since would answer 304 with the deleted row still in it.
+        url = '/api/sous-projet/projet/%d/' % self.projet.pk
+        extra = SousProjet.objects.create(
+            nom_sous_projet='Extra', date_debut_sousprojet='2024-01-01', date_finsousprojet='2024-06-30',
+            statut_sous_projet='en cours', id_projet=self.projet)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        extra.delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_unmanaged_model(self):
+        item = MaitreOuvrage.objects.filter(id_projet=self.projet).first()
+        url = '/api/maitre-ouvrage/%d/' % item.pk
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        item.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
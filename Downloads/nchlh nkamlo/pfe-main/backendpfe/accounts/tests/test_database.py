@@ -0,0 +1,135 @@
+import asyncio
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.contrib.contenttypes.models import ContentType
+from django.http import HttpResponse
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from ..database import PrimaryPinningMiddleware, close_unusable_connections, primary_pinned
+from ..models import Projet
+from .fixtures import make_projet, make_user
+
+
+@override_settings(READ_REPLICA_ALIAS='replica')
+class PrimaryReplicaRouterTests(TransactionTestCase):
+    # Not a TestCase: its transaction would keep every read on the primary.
+
+    def setUp(self):
+        self.pin = primary_pinned.set(False)
+
+    def tearDown(self):
+        primary_pinned.reset(self.pin)
+
+    def test_reads(self):
+        self.assertEqual(Projet.objects.all().db, 'replica')
+        self.assertEqual(ContentType.objects.all().db, DEFAULT_DB_ALIAS)
+        with transaction.atomic():
+            self.assertEqual(Projet.objects.all().db, DEFAULT_DB_ALIAS)
+        with override_settings(READ_REPLICA_ALIAS=None):
+            self.assertEqual(Projet.objects.all().db, DEFAULT_DB_ALIAS)
+
+    def test_reads_after_write(self):
+        seen = []
+
+        def view(request):
+            seen.append(Projet.objects.all().db)
+            Projet.objects.filter(pk=0).update(statut='termine')
+            seen.append(Projet.objects.all().db)
+
+        middleware = PrimaryPinningMiddleware(view)
+        middleware(RequestFactory().post('/'))
+        middleware(RequestFactory().get('/'))
+        self.assertEqual(seen, ['replica', DEFAULT_DB_ALIAS, 'replica', DEFAULT_DB_ALIAS])
+        self.assertEqual(Projet.objects.all().db, 'replica')
+
+    def test_async_middleware(self):
+        seen = []
+
+        async def view(request):
+            seen.append(Projet.objects.all().db)
+            primary_pinned.set(True)
+            return 'response'
+
+        middleware = PrimaryPinningMiddleware(view)
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        primary_pinned.set(True)
+        self.assertEqual(async_to_sync(middleware)(RequestFactory().get('/')), 'response')
+        self.assertEqual(seen, ['replica'])
+        self.assertTrue(primary_pinned.get())
+
+
+@skipUnless('replica' in settings.DATABASES, 'Needs the replica alias of backendpfe.test_settings')
+@override_settings(READ_REPLICA_ALIAS='replica')
+class ReplicaReadTests(TransactionTestCase):
+    """Reads against a real second database that lags behind the primary."""
+    databases = '__all__'
+    client_class = APIClient
+
+    def setUp(self):
+        # The schema and the rows reach a replica by replication, not by
+        # migrate (see PrimaryReplicaRouter.allow_migrate). Only the projet
+        # table is copied, so its foreign keys point at missing tables.
+        with connections['replica'].schema_editor() as editor:
+            editor.create_model(Projet)
+        self.client.force_authenticate(make_user())
+        self.projet = make_projet()
+        with connections['replica'].constraint_checks_disabled():
+            Projet.objects.using('replica').bulk_create([Projet.objects.using(DEFAULT_DB_ALIAS).get(pk=self.projet.pk)])
+        self.pin = primary_pinned.set(False)
+
+    def tearDown(self):
+        primary_pinned.reset(self.pin)
+        with connections['replica'].schema_editor() as editor:
+            editor.delete_model(Projet)
+
+    def test_read_after_write(self):
+        seen = []
+
+        def view(request):
+            seen.append(Projet.objects.get(pk=self.projet.pk).nom_projet)
+            Projet.objects.filter(pk=self.projet.pk).update(nom_projet='Renamed')
+            seen.append(Projet.objects.get(pk=self.projet.pk).nom_projet)
+            return HttpResponse()
+
+        PrimaryPinningMiddleware(view)(RequestFactory().post('/'))
+        self.assertEqual(seen, ['Projet 0', 'Renamed'])
+
+        # The next request reads the replica again, which has not caught up.
+        response = self.client.get('/api/projects/%d/' % self.projet.pk)
+        self.assertEqual(response.json()['data']['nom_projet'], 'Projet 0')
+        Projet.objects.using('replica').filter(pk=self.projet.pk).update(nom_projet='Renamed')
+        response = self.client.get('/api/projects/%d/' % self.projet.pk)
+        self.assertEqual(response.json()['data']['nom_projet'], 'Renamed')
+
+    @override_settings(RESPONSE_CACHE_ALIAS='default')
+    def test_cache_filled_from_primary(self):
+        # The replica has not caught up with the rename when the entry of
+        # the new version is built.
+        cache.clear()
+        url = '/api/projects/%d/' % self.projet.pk
+        Projet.objects.filter(pk=self.projet.pk).update(nom_projet='Renamed')
+        miss = self.client.get(url)
+        self.assertEqual(miss['X-Cache'], 'MISS')
+        self.assertEqual(miss.json()['data']['nom_projet'], 'Renamed')
+        hit = self.client.get(url)
+        self.assertEqual(hit['X-Cache'], 'HIT')
+        self.assertEqual(hit.json()['data']['nom_projet'], 'Renamed')
+
+
+class HealthCheckTests(TransactionTestCase):
+
+    def test_close_unusable_connections(self):
+        connection.ensure_connection()
+        with mock.patch.object(connection, 'is_usable', return_value=False), \
+                mock.patch.object(connection, 'close') as close:
+            close_unusable_connections()
+            close.assert_not_called()
+            with mock.patch.dict(connection.settings_dict, CONN_HEALTH_CHECKS=True):
+                close_unusable_connections()
+            close.assert_called_once_with()
@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+
+from rest_framework.test import APITestCase
+
+from ..models import Facture
+from ..views.facture_export_view import EXPORT_COLUMNS, FactureExportView
+from .fixtures import make_projet, make_projet_tree, make_user
+
+HEADERS = [header for header, _ in EXPORT_COLUMNS]
+
+
+class FactureExportTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.projet, cls.other = make_projet(0), make_projet(1)
+        make_projet_tree(cls.projet, size=2)
+        make_projet_tree(cls.other, size=1)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def export(self, **params):
+        response = self.client.get('/api/factures/export/', params)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv(self):
+        response, content = self.export()
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="factures.csv"')
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(content.splitlines()[0].split(','), HEADERS)
+        facture = Facture.objects.filter(id_projet=self.projet).select_related('id_marche').order_by('pk').first()
+        self.assertEqual([int(row['id_facture']) for row in rows],
+                         list(Facture.objects.order_by('pk').values_list('pk', flat=True)))
+        self.assertEqual(rows[0]['numero_facture'], str(facture.numero_facture))
+        self.assertEqual(rows[0]['date_facturation'], '2024-03-01')
+        self.assertEqual(Decimal(rows[0]['montant_ttc']), Decimal('119'))
+        self.assertEqual(rows[0]['nom_projet'], 'Projet 0')
+        self.assertEqual(rows[0]['nom_sous_projet'], 'Sous projet 0')
+        self.assertEqual(rows[0]['numero_marche'], str(facture.id_marche.numero_marche))
+        self.assertEqual(rows[0]['nom_fournisseur'], '')
+        self.assertEqual(rows[0]['date_ordre_virement'], '')
+
+    def test_ndjson(self):
+        response, content = self.export(export_format='ndjson', projet=self.other.pk)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="factures.ndjson"')
+
+        lines = content.splitlines()
+        self.assertTrue(content.endswith('\n'))
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual(list(row), HEADERS)
+        self.assertEqual(row['id_projet'], self.other.pk)
+        self.assertEqual(row['nom_projet'], 'Projet 1')
+        self.assertEqual(row['date_facturation'], '2024-03-01')
+        self.assertEqual(Decimal(row['montant_ttc']), Decimal('119'))
+        self.assertIsNone(row['date_ordre_virement'])
+
+    def test_filters(self):
+        _, content = self.export(projet=self.projet.pk)
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual({row['id_projet'] for row in rows}, {str(self.projet.pk)})
+
+        Facture.objects.filter(id_projet=self.other).update(date_facturation=date(2024, 8, 1))
+        _, content = self.export(date_from='2024-07-01', date_to='2024-12-31')
+        self.assertEqual([row['id_projet'] for row in csv.DictReader(io.StringIO(content))], [str(self.other.pk)])
+
+        _, content = self.export(projet=0)
+        self.assertEqual(content.splitlines(), [','.join(HEADERS)])
+
+    def test_invalid_filters(self):
+        response = self.client.get('/api/factures/export/', {'date_from': '2024-02-01', 'date_to': '2024-01-01'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/factures/export/', {'export_format': 'xml'})
+        self.assertEqual(list(response.json()['errors']), ['export_format'])
+
+    def test_several_batches(self):
+        chunk_size = FactureExportView.chunk_size
+        Facture.objects.bulk_create([
+            Facture(numero_facture=1000 + index, date_facturation=date(2024, 3, 1), id_projet=self.projet)
+            for index in range(2 * chunk_size)
+        ])
+        expected = list(Facture.objects.filter(id_projet=self.projet).order_by('pk').values_list('pk', flat=True))
+        self.assertGreater(len(expected), 2 * chunk_size)
+
+        # One query per batch of chunk_size rows.
+        with self.assertNumQueries(3):
+            _, content = self.export(export_format='ndjson', projet=self.projet.pk)
+        self.assertEqual([json.loads(line)['id_facture'] for line in content.splitlines()], expected)
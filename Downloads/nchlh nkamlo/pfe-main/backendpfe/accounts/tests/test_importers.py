@@ -0,0 +1,118 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from openpyxl import Workbook
+from rest_framework.test import APITestCase
+
+from ..financials import compute_financial_rollup, get_stored_financial_rollup
+from ..models import Facture, Marche
+from .fixtures import make_projet, make_projet_tree, make_user
+
+FACTURES_CSV = (
+    'numero_facture,date_facturation,montant_ttc,montant_net_ht,date_ordre_virement,nom_projet,numero_marche\n'
+    '101,2024-05-01,120,100,2024-06-01,projet 0,\n'
+    '102,2024-05-02,60,50,,,1\n'
+    'abc,2024-05-03,10,10,,Inconnu,\n'
+    '104,2024-05-04,10,10,,,99\n'
+)
+
+
+class SpreadsheetImportTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.projet = make_projet()
+        make_projet_tree(cls.projet, size=2)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def upload(self, kind, content, name='import.csv'):
+        if isinstance(content, str):
+            content = content.encode()
+        return self.client.post('/api/import/%s/' % kind, {'file': SimpleUploadedFile(name, content)},
+                                format='multipart')
+
+    def test_import_factures(self):
+        marche = Marche.objects.get(numero_marche=1)
+        response = self.upload('factures', FACTURES_CSV)
+
+        self.assertEqual(response.status_code, 207)
+        data = response.json()['data']
+        self.assertEqual((data['rows'], data['imported'], data['rejected']), (4, 2, 2))
+        self.assertEqual([error['line'] for error in data['errors']], [4, 5])
+        self.assertEqual(set(data['errors'][0]['errors']), {'numero_facture', 'nom_projet'})
+        self.assertEqual(list(data['errors'][1]['errors']), ['numero_marche'])
+
+        factures = Facture.objects.filter(numero_facture__in=[101, 102])
+        by_number = {facture.numero_facture: facture for facture in factures}
+        self.assertEqual(by_number[101].id_projet_id, self.projet.pk)
+        self.assertEqual(by_number[102].id_marche_id, marche.pk)
+        # Without nom_projet the project of the marche is used.
+        self.assertEqual(by_number[102].id_projet_id, self.projet.pk)
+        self.assertEqual(by_number[101].montant_ttc, Decimal('120'))
+
+        self.assertEqual(get_stored_financial_rollup(), compute_financial_rollup())
+
+    def test_marche_of_another_project(self):
+        other = make_projet(1)
+        response = self.upload('factures', (
+            'numero_facture,date_facturation,nom_projet,numero_marche\n'
+            '301,2024-05-01,Projet 0,1\n'
+            '302,2024-05-01,Projet 1,1\n'
+        ))
+
+        self.assertEqual(response.status_code, 207)
+        errors = response.json()['data']['errors']
+        self.assertEqual(errors, [{'line': 3, 'errors': {'nom_projet': ['Marche "1" belongs to another project.']}}])
+        self.assertEqual(Facture.objects.get(numero_facture=301).id_projet_id, self.projet.pk)
+        self.assertFalse(Facture.objects.filter(id_projet=other).exists())
+
+    def test_import_xlsx(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['numero_facture', 'date_facturation', 'montant_ttc', 'montant_net_ht', 'nom_projet'])
+        sheet.append([201, date(2024, 5, 1), 120.5, 100, 'Projet 0'])
+        # Amounts with cents are not exact as the floats openpyxl reads.
+        sheet.append([202, date(2024, 5, 2), 19.99, 1234.56, 'Projet 0'])
+        sheet.append([None, None, None, None, None])
+        sheet.append(['abc', date(2024, 5, 3), 10, 10, 'Projet 0'])
+        content = io.BytesIO()
+        workbook.save(content)
+
+        response = self.upload('factures', content.getvalue(), name='factures.XLSX')
+
+        self.assertEqual(response.status_code, 207)
+        data = response.json()['data']
+        self.assertEqual((data['rows'], data['imported'], data['rejected']), (3, 2, 1))
+        self.assertEqual(data['errors'][0]['line'], 5)
+        self.assertEqual(list(data['errors'][0]['errors']), ['numero_facture'])
+        facture = Facture.objects.get(numero_facture=201)
+        self.assertEqual(facture.date_facturation, date(2024, 5, 1))
+        self.assertEqual(facture.montant_ttc, Decimal('120.5'))
+        self.assertEqual(facture.id_projet_id, self.projet.pk)
+        facture = Facture.objects.get(numero_facture=202)
+        self.assertEqual((facture.montant_ttc, facture.montant_net_ht), (Decimal('19.99'), Decimal('1234.56')))
+
+    def test_unreadable_xlsx(self):
+        response = self.upload('factures', FACTURES_CSV, name='factures.xlsx')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.json()['message'].startswith('Unreadable file'))
+
+    def test_ambiguous_project_name(self):
+        make_projet(nom_projet='Projet 0')
+        response = self.upload('marches', (
+            'numero_marche,date_marche,description_marche,numero_appel_dof,visa_cme,prix_da,nom_projet\n'
+            '7,2024-01-01,Marche,1,visa,500,Projet 0\n'
+        ))
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(list(response.json()['data']['errors'][0]['errors']), ['nom_projet'])
+        self.assertFalse(Marche.objects.filter(numero_marche=7).exists())
+
+    def test_unknown_kind(self):
+        response = self.upload('projets', FACTURES_CSV)
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,76 @@
+from datetime import date
+
+from rest_framework.test import APITestCase
+
+from ..models import MaitreOuvrage
+from .fixtures import make_projet, make_projet_tree, make_user
+
+
+class ListFilterTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.projets = [
+            make_projet(0, statut='en cours', date_debut_de_projet=date(2024, 3, 1)),
+            make_projet(1, statut='termine', date_debut_de_projet=date(2023, 1, 1)),
+            make_projet(2, statut='en cours', date_debut_de_projet=date(2024, 1, 1)),
+            make_projet(3, statut='suspendu', date_debut_de_projet=date(2024, 1, 1)),
+        ]
+        make_projet_tree(cls.projets[0], size=2)
+        MaitreOuvrage.objects.create(id_projet=cls.projets[0], description_mo='MO public', type_mo='public')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def get_ids(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row['id_projet'] for row in response.json()['data']['results']]
+
+    def test_filters(self):
+        pks = [projet.pk for projet in self.projets]
+        self.assertEqual(self.get_ids('/api/projects/', statut='en cours'), [pks[2], pks[0]])
+        self.assertEqual(self.get_ids('/api/projects/', statut__in='termine,suspendu'), [pks[3], pks[1]])
+        self.assertEqual(
+            self.get_ids('/api/projects/', date_debut_de_projet__gte='2024-01-01', date_debut_de_projet__lte='2024-02-01'),
+            [pks[3], pks[2]]
+        )
+
+        response = self.client.get('/api/maitre-ouvrage/', {'type_mo': 'public'})
+        self.assertEqual([row['description_mo'] for row in response.json()['data']['results']], ['MO public'])
+
+    def test_ordering(self):
+        pks = [projet.pk for projet in self.projets]
+        # Ties on the date are broken by primary key, in the same direction.
+        expected = [pks[0], pks[3], pks[2], pks[1]]
+        self.assertEqual(self.get_ids('/api/projects/', ordering='-date_debut_de_projet'), expected)
+        self.assertEqual(self.get_ids('/api/projects/', ordering='-date_debut_de_projet', per_page=2, page=2),
+                         expected[2:])
+
+        seen, url = [], '/api/projects/?ordering=-date_debut_de_projet&per_page=1&cursor='
+        while url:
+            data = self.client.get(url).json()['data']
+            seen.extend(row['id_projet'] for row in data['results'])
+            url = data['next']
+        self.assertEqual(seen, expected)
+
+    def test_not_allowed(self):
+        response = self.client.get('/api/projects/', {
+            'nom_projet': 'Projet 0', 'statut__icontains': 'cours', 'ordering': 'nom_projet',
+            'date_debut_de_projet__gte': 'demain',
+        })
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']
+        self.assertEqual(set(errors), {'ordering', 'date_debut_de_projet__gte'})
+
+        response = self.client.get('/api/projects/', {'nom_projet': 'Projet 0', 'statut__icontains': 'cours'})
+        self.assertEqual(response.json()['errors'], {
+            'nom_projet': ['Filtering on this field is not allowed'],
+            'statut__icontains': ['Filtering on this field is not allowed'],
+        })
+
+        # type_mo can be NULL, which keyset pagination cannot step over.
+        self.assertEqual(self.client.get('/api/maitre-ouvrage/', {'ordering': 'type_mo'}).status_code, 200)
+        response = self.client.get('/api/maitre-ouvrage/', {'ordering': 'type_mo', 'cursor': ''})
+        self.assertEqual(response.status_code, 400)
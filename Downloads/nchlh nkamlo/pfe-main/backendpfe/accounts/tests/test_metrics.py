@@ -0,0 +1,115 @@
+import threading
+
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from ..metrics import COUNT, QUERIES, SECONDS, EndpointMetrics, endpoint_metrics
+from .asgi_client import SLOW_READ_SECONDS, get_concurrently
+from .fixtures import make_projet, make_user
+
+
+@override_settings(METRICS_TOKEN='scrape')
+class MetricsMiddlewareTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        make_projet()
+
+    def setUp(self):
+        endpoint_metrics.reset()
+        self.client.force_authenticate(self.user)
+
+    def scrape(self):
+        response = self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer scrape')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        return response.content.decode()
+
+    def test_records_by_url_name(self):
+        response = self.client.get('/api/projects/')
+        self.client.get('/api/projects/')
+        self.client.get('/api/nowhere/')
+
+        metrics = self.scrape()
+        labels = '{endpoint="project-list-create",method="GET"}'
+        self.assertIn('http_request_duration_seconds_count%s 2' % labels, metrics)
+        self.assertIn('http_request_duration_seconds_bucket{endpoint="project-list-create",method="GET",le="+Inf"} 2',
+                      metrics)
+        self.assertIn('http_response_size_bytes_total%s %d' % (labels, 2 * len(response.content)), metrics)
+        self.assertIn('http_request_duration_seconds_count{endpoint="unmatched",method="GET"} 1', metrics)
+        queries = [line for line in metrics.splitlines() if line.startswith('http_request_db_queries_total' + labels)]
+        self.assertEqual(len(queries), 1)
+        self.assertGreater(int(queries[0].split()[-1]), 0)
+
+    def test_streaming_response_size(self):
+        response = self.client.get('/api/factures/export/')
+        size = len(b''.join(response.streaming_content))
+        self.assertIn('http_response_size_bytes_total{endpoint="facture-export",method="GET"} %d' % size, self.scrape())
+
+    def test_token(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+        self.assertEqual(self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer other').status_code, 403)
+        with override_settings(METRICS_TOKEN=None):
+            self.assertEqual(self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer None').status_code, 403)
+
+    @override_settings(METRICS_SAMPLE_RATE=0)
+    def test_disabled(self):
+        self.client.get('/api/projects/')
+        self.assertEqual(endpoint_metrics.collect(), {})
+
+
+@override_settings(ROOT_URLCONF='accounts.tests.asgi_client', MIDDLEWARE=['accounts.metrics.MetricsMiddleware'])
+class MetricsMiddlewareASGITests(TransactionTestCase):
+
+    def test_concurrent_reads(self):
+        endpoint_metrics.reset()
+        user = make_user()
+        url = '/api/projects/%d/' % make_projet().pk
+        responses, seconds = get_concurrently([url] * 4, user)
+        self.assertEqual([status for status, _ in responses], [200] * 4)
+        # One after the other they would take 4 * SLOW_READ_SECONDS.
+        self.assertLess(seconds, 2 * SLOW_READ_SECONDS)
+
+        row = endpoint_metrics.collect()[('project-detail', 'GET')]
+        self.assertEqual(row[COUNT], 4)
+        self.assertGreaterEqual(row[SECONDS], 4 * SLOW_READ_SECONDS)
+        self.assertGreater(row[QUERIES], 0)
+
+
+class EndpointMetricsTests(SimpleTestCase):
+
+    def test_histogram(self):
+        metrics = EndpointMetrics(buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.1, 0.5, 3):
+            metrics.record('search', 'GET', seconds, 2, 0.01, 10)
+        rendered = metrics.render(0.5)
+        for line in [
+            'http_request_duration_seconds_bucket{endpoint="search",method="GET",le="0.1"} 2',
+            'http_request_duration_seconds_bucket{endpoint="search",method="GET",le="1.0"} 3',
+            'http_request_duration_seconds_bucket{endpoint="search",method="GET",le="+Inf"} 4',
+            'http_request_duration_seconds_count{endpoint="search",method="GET"} 4',
+            'http_request_db_queries_total{endpoint="search",method="GET"} 8',
+            'http_response_size_bytes_total{endpoint="search",method="GET"} 40',
+            'http_metrics_sample_rate 0.5',
+        ]:
+            self.assertIn(line, rendered)
+
+    def test_finished_threads(self):
+        metrics = EndpointMetrics()
+
+        def record():
+            metrics.record('search', 'GET', 0.01, 1, 0.001, 10)
+
+        for _ in range(3):
+            threads = [threading.Thread(target=record) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            del threads, thread
+        record()
+        # Only the shard of this thread is left, the others are in retired.
+        self.assertEqual(len(metrics.shards), 1)
+        self.assertEqual(metrics.collect()[('search', 'GET')][COUNT], 13)
+        self.assertEqual(metrics.retired[('search', 'GET')][COUNT], 12)
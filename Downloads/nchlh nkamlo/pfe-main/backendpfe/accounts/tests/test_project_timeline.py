@@ -0,0 +1,61 @@
+from datetime import date
+
+from rest_framework.test import APITestCase
+
+from ..models import EtatDavancementDeprojet, SousProjet, SuivieSousProjet
+from .fixtures import make_projet, make_projet_tree, make_user
+
+
+class ProjectTimelineTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.projet, cls.other = make_projet(0), make_projet(1)
+        make_projet_tree(cls.projet, size=1)
+        cls.sous_projet = SousProjet.objects.get(id_projet=cls.projet)
+        for projet, prevu, realiser in [
+            (cls.projet, date(2024, 3, 1), date(2024, 3, 11)),
+            (cls.projet, date(2024, 5, 1), date(2024, 4, 29)),
+            (cls.other, date(2024, 1, 1), date(2024, 1, 6)),
+            (cls.other, None, None),
+        ]:
+            EtatDavancementDeprojet.objects.create(
+                type_etat='etat', id_projet=projet, date_prevu=prevu, date_realiser=realiser)
+        cls.late = SuivieSousProjet.objects.create(
+            id_sous_projet=cls.sous_projet, description_suivie_sousprojet='Fondations',
+            date_prevu=date(2024, 2, 1), date_realiser=date(2024, 3, 2))
+        # Not due yet: not late.
+        SuivieSousProjet.objects.create(
+            id_sous_projet=cls.sous_projet, description_suivie_sousprojet='Reception', date_prevu=date(2100, 1, 1))
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_timeline(self):
+        # Statistics (2 per table), count, page, sous-projets, milestones (1 per table).
+        with self.assertNumQueries(9):
+            response = self.client.get('/api/projects/timeline/')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        projet, other = body['data']['results'][1], body['data']['results'][0]
+        self.assertEqual(projet['delay_days'], 30)
+        self.assertEqual([milestone['delay_days'] for milestone in projet['milestones']], [10, -2])
+        sous_projet = projet['sous_projets'][0]
+        self.assertEqual(sous_projet['delay_days'], 30)
+        self.assertEqual([milestone['delay_days'] for milestone in sous_projet['milestones']], [30, 0])
+        self.assertEqual(sous_projet['milestones'][1]['date_realiser'], None)
+        self.assertEqual(other['delay_days'], 5)
+
+        stats = body['stats']
+        self.assertEqual({name: stats[name] for name in ['milestones', 'late', 'mean_delay_days', 'p90_delay_days']},
+                         {'milestones': 5, 'late': 3, 'mean_delay_days': 8.6, 'p90_delay_days': 30})
+        # Only the late ones: not the milestone on time (0) nor the early one (-2).
+        self.assertEqual([(row['type'], row['delay_days']) for row in stats['worst']], [
+            ('sous_projet', 30), ('projet', 10), ('projet', 5),
+        ])
+        self.assertEqual(stats['worst'][0], {
+            'id': self.late.pk, 'label': 'Fondations', 'date_prevu': '2024-02-01', 'date_realiser': '2024-03-02',
+            'delay_days': 30, 'type': 'sous_projet', 'id_projet': self.projet.pk,
+            'id_sous_projet': self.sous_projet.pk,
+        })
@@ -0,0 +1,50 @@
+from datetime import date
+
+from rest_framework.test import APITestCase
+
+from ..models import EtatDavancementDeprojet
+from .fixtures import make_projet, make_projet_tree, make_user
+
+
+class ProjectTreeTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.projet = make_projet()
+        make_projet_tree(cls.projet, size=3)
+        make_projet_tree(make_projet(1), size=1)
+        for index in range(2):
+            EtatDavancementDeprojet.objects.create(
+                type_etat='etat %d' % index, id_projet=cls.projet, date_prevu=date(2024, 5, 1))
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_tree(self):
+        # The projet, then one query per branch, whatever the number of children.
+        with self.assertNumQueries(7):
+            response = self.client.get('/api/projects/%d/tree/' % self.projet.pk)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['nom_projet'], 'Projet 0')
+        self.assertEqual({name: len(data[name]) for name in [
+            'sous_projets', 'maitres_ouvrage', 'maitres_doeuvre', 'marches', 'documents', 'etats_davancement',
+        ]}, {
+            'sous_projets': 3, 'maitres_ouvrage': 3, 'maitres_doeuvre': 3, 'marches': 3, 'documents': 3,
+            'etats_davancement': 2,
+        })
+        self.assertEqual([row['nom_sous_projet'] for row in data['sous_projets']],
+                         ['Sous projet 0', 'Sous projet 1', 'Sous projet 2'])
+
+    def test_include(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/projects/%d/tree/' % self.projet.pk, {'include': 'marches,sous_projets'})
+        data = response.json()['data']
+        self.assertIn('marches', data)
+        self.assertNotIn('documents', data)
+
+        response = self.client.get('/api/projects/%d/tree/' % self.projet.pk, {'include': 'factures'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'], {'include': ['Unknown branch(es): factures']})
+        self.assertEqual(self.client.get('/api/projects/0/tree/').status_code, 404)
@@ -0,0 +1,181 @@
+from datetime import date
+from unittest import mock
+
+from django.db import connection
+from rest_framework import serializers
+from rest_framework.test import APITestCase
+
+from ..models import Chefprojet, EtatDavancementDeprojet, MaitreDoeuve, MaitreOuvrage, Projet, SousProjet
+from ..serializers.Projects_serializers import ProjetSerializer
+from ..views import ProjectView
+from .fixtures import make_projet, make_projet_tree, make_user
+from .query_budget import QueryBudgetMixin
+
+# (url name, method, url, data, most queries at any size). The URLs are
+# formatted with the ids returned by populate(); lists ask for 100 rows.
+# The import and metrics endpoints read no rows to list.
+ENDPOINTS = [
+    ('auth', 'get', '/api/auth/', None, 1),
+    ('auth login', 'post', '/api/auth/', {'action': 'login', 'email': 'admin@example.com', 'password': 'secret'}, 1),
+    ('project_view', 'get', '/api/sub-project?per_page=100', None, 3),
+    ('project-list-create', 'get', '/api/projects/?per_page=100', None, 3),
+    ('project-list-create cursor', 'get', '/api/projects/?cursor=&per_page=100', None, 2),
+    ('project-detail', 'get', '/api/projects/{projet}/', None, 1),
+    ('project-summary', 'get', '/api/projects/summary/?per_page=100', None, 3),
+    ('project-summary-detail', 'get', '/api/projects/{projet}/summary/', None, 2),
+    ('project-timeline', 'get', '/api/projects/timeline/?per_page=100', None, 9),
+    ('project-tree', 'get', '/api/projects/{projet}/tree/', None, 7),
+    ('sous_projet_list', 'get', '/api/sous-projet/?per_page=100', None, 3),
+    ('sous_projet_detail', 'get', '/api/sous-projet/{sous_projet}/', None, 1),
+    ('sous_projet_by_project', 'get', '/api/sous-projet/projet/{projet}/?per_page=100', None, 3),
+    ('maitre_ouvrage_list', 'get', '/api/maitre-ouvrage/?per_page=100', None, 3),
+    ('maitre_ouvrage_detail', 'get', '/api/maitre-ouvrage/{maitre_ouvrage}/', None, 1),
+    ('maitre_ouvrage_by_project', 'get', '/api/maitre-ouvrage/projet/{projet}/?per_page=100', None, 3),
+    ('maitre-doeuvre-list', 'get', '/api/maitre-doeuvre/?per_page=100', None, 3),
+    ('maitre-doeuvre-detail', 'get', '/api/maitre-doeuvre/{maitre_doeuvre}/', None, 1),
+    ('maitre-doeuvre-by-project', 'get', '/api/maitre-doeuvre/projet/{projet}/?per_page=100', None, 3),
+    ('facture-export', 'get', '/api/factures/export/?projet={projet}', None, 1),
+    ('facture-export ndjson', 'get', '/api/factures/export/?export_format=ndjson', None, 1),
+    ('search', 'get', '/api/search/?q=description&per_page=100', None, 2),
+]
+
+
+
+class ChefProjetSerializer(ProjetSerializer):
+    chef = serializers.SerializerMethodField()
+
+    def get_chef(self, projet):
+        return Chefprojet.objects.filter(pk=projet.id_utilisateur_id).values_list('pk', flat=True).first()
+
+
+def sous_projet_data(projet, chef, index=0, **fields):
+    data = {
+        'nom_sous_projet': 'Nouveau %d' % index, 'date_debut_sousprojet': '2024-01-01',
+        'date_finsousprojet': '2024-06-30', 'statut_sous_projet': 'en cours',
+        'id_projet': projet, 'id_utilisateur': chef,
+    }
+    data.update(fields)
+    return data
+
+
+PROJET_DATA = {
+    'nom_projet': 'Nouveau', 'description_de_projet': 'Description', 'date_debut_de_projet': '2024-01-01',
+    'date_fin_de_projet': '2024-12-31', 'statut': 'en cours',
+}
+
+# The same for the writes. populate_writes() gives each write its own rows,
+# with ``size`` rows under the project; the bulk writes send ``size`` items.
+WRITE_ENDPOINTS = [
+    ('project create', 'post', '/api/projects/', PROJET_DATA, 5),
+    ('project update', 'put', '/api/projects/{projet}/', PROJET_DATA, 6),
+    ('project delete', 'delete', '/api/projects/{spare_projet}/', None, 6),
+    ('sous-projet create', 'post', '/api/sous-projet/',
+     lambda values: sous_projet_data(values['projet'], values['chef']), 6),
+    ('sous-projet update', 'put', '/api/sous-projet/{sous_projet}/',
+     lambda values: sous_projet_data(values['projet'], values['chef']), 8),
+    ('sous-projet delete', 'delete', '/api/sous-projet/{spare_sous_projet}/', None, 6),
+    ('sous-projet bulk create', 'post', '/api/sous-projet/',
+     lambda values: [sous_projet_data(values['projet'], values['chef'], index) for index in range(values['size'])], 5),
+    ('sous-projet bulk update', 'put', '/api/sous-projet/',
+     lambda values: [sous_projet_data(values['projet'], values['chef'], index, id_sous_projet=pk)
+                     for index, pk in enumerate(values['sous_projets'])], 8),
+    ('maitre-ouvrage create', 'post', '/api/maitre-ouvrage/',
+     lambda values: {'description_mo': 'Nouveau', 'id_projet': values['projet']}, 2),
+    ('maitre-ouvrage update', 'put', '/api/maitre-ouvrage/{maitre_ouvrage}/',
+     lambda values: {'description_mo': 'Nouveau', 'id_projet': values['projet']}, 3),
+    ('maitre-ouvrage delete', 'delete', '/api/maitre-ouvrage/{spare_maitre_ouvrage}/', None, 2),
+    ('maitre-ouvrage bulk create', 'post', '/api/maitre-ouvrage/',
+     lambda values: [{'description_mo': 'MO %d' % index, 'email_mo': 'mo%d@example.com' % index,
+                      'id_projet': values['projet']} for index in range(values['size'])], 5),
+    ('maitre-doeuvre create', 'post', '/api/maitre-doeuvre/',
+     lambda values: {'nom_fournisseur': 'Nouveau', 'id_projet': values['projet']}, 2),
+    ('maitre-doeuvre update', 'put', '/api/maitre-doeuvre/{maitre_doeuvre}/',
+     lambda values: {'nom_fournisseur': 'Nouveau', 'id_projet': values['projet']}, 3),
+    ('maitre-doeuvre delete', 'delete', '/api/maitre-doeuvre/{spare_maitre_doeuvre}/', None, 2),
+    ('maitre-doeuvre bulk update', 'put', '/api/maitre-doeuvre/',
+     lambda values: [{'id_md': pk, 'nom_fournisseur': 'MD', 'id_projet': values['projet']}
+                     for pk in values['maitres_doeuvre']], 5),
+]
+
+
+class QueryBudgetTests(QueryBudgetMixin, APITestCase):
+    """The most queries every accounts endpoint may make, with 1, 10 and 100 rows to list."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.chef = Chefprojet.objects.create(id_utilisateur=make_user('chef@example.com', 'chef de projet'))
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def populate(self, size):
+        """``size`` projets, and ``size`` rows of every table under the first one."""
+        projets = [make_projet(index, id_utilisateur=self.chef) for index in range(size)]
+        projet = projets[0]
+        make_projet_tree(projet, size)
+        EtatDavancementDeprojet.objects.bulk_create([
+            EtatDavancementDeprojet(type_etat='etat', id_projet=projet, date_prevu=date(2024, 5, 1))
+            for projet in projets
+        ])
+        return {
+            'projet': projet.pk,
+            'sous_projet': SousProjet.objects.filter(id_projet=projet).values_list('pk', flat=True)[0],
+            'maitre_ouvrage': MaitreOuvrage.objects.filter(id_projet=projet).values_list('pk', flat=True)[0],
+            'maitre_doeuvre': MaitreDoeuve.objects.filter(id_projet=projet).values_list('pk', flat=True)[0],
+        }
+
+    def populate_writes(self, size):
+        """populate() plus rows without children for the deletes, and the pks the bulk updates send."""
+        values = self.populate(size)
+        projet = Projet.objects.get(pk=values['projet'])
+        spare = make_projet(size)
+        values.update(
+            size=size,
+            chef=self.chef.pk,
+            spare_projet=spare.pk,
+            spare_sous_projet=SousProjet.objects.create(
+                nom_sous_projet='Spare', date_debut_sousprojet=date(2024, 1, 1), date_finsousprojet=date(2024, 6, 30),
+                statut_sous_projet='en cours', id_projet=spare,
+            ).pk,
+            spare_maitre_ouvrage=MaitreOuvrage.objects.create(id_projet=spare, description_mo='Spare').pk,
+            spare_maitre_doeuvre=MaitreDoeuve.objects.create(id_projet=spare, nom_fournisseur='Spare').pk,
+            sous_projets=list(SousProjet.objects.filter(id_projet=projet).values_list('pk', flat=True)),
+            maitres_doeuvre=list(MaitreDoeuve.objects.filter(id_projet=projet).values_list('pk', flat=True)),
+        )
+        return values
+
+    def test_endpoints(self):
+        measured = self.measure_queries([endpoint[:4] for endpoint in ENDPOINTS], self.populate)
+        for name, _, _, _, budget in ENDPOINTS:
+            with self.subTest(endpoint=name):
+                self.assertQueryBudget(name, measured[name], budget)
+
+    def test_write_endpoints(self):
+        measured = self.measure_queries([endpoint[:4] for endpoint in WRITE_ENDPOINTS], self.populate_writes)
+        for name, _, _, _, budget in WRITE_ENDPOINTS:
+            with self.subTest(endpoint=name):
+                self.assertQueryBudget(name, measured[name], budget)
+
+    def test_failure_report(self):
+        # A serializer following id_utilisateur row by row is reported at
+        # the line that does it.
+        def populate(size):
+            for index in range(size):
+                make_projet(index, id_utilisateur=self.chef)
+            return {}
+
+        with mock.patch.multiple(ProjectView, serializer_class=ChefProjetSerializer, use_values_list=False):
+            measured = self.measure_queries([('projects', 'get', '/api/projects/?per_page=100', None)], populate)
+        with self.assertRaises(AssertionError) as context:
+            self.assertQueryBudget('projects', measured['projects'], 3)
+
+        message = str(context.exception)
+        size = self.budget_sizes[-1]
+        location = 'accounts/tests/test_query_budgets.py:%d in get_chef' % (
+            ChefProjetSerializer.get_chef.__code__.co_firstlineno + 1)
+        self.assertIn('over its budget of 3 and growing with the number of rows', message)
+        self.assertIn('%4d x %s\n' % (size, location), message)
+        quote = connection.ops.quote_name
+        sql = 'SELECT %s.%s FROM %s WHERE' % (quote('chefprojet'), quote('id_utilisateur'), quote('chefprojet'))
+        self.assertIn('%4d x %s' % (size, sql), message)
@@ -0,0 +1,103 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from ..models import Document, Employe, Facture, Incident, MaitreDoeuve, MaitreOuvrage, SousProjet
+from .fixtures import make_projet, make_projet_tree, make_user
+
+
+def full_table_scans(sql):
+    """Tables that the database would read in full to run ``sql``."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute('EXPLAIN ' + sql)
+            columns = [column[0] for column in cursor.description]
+            plan = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            # On tiny test tables MySQL may prefer a scan anyway; what matters
+            # is that no usable index exists.
+            return [step['table'] for step in plan if step['type'] == 'ALL' and not step['possible_keys']]
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+        return [row[-1] for row in cursor.fetchall() if row[-1].startswith('SCAN') and 'INDEX' not in row[-1]]
+
+
+class QueryPlanTests(APITestCase):
+    """Every filtered query of the by-project endpoints must be served by an index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.projet = make_projet()
+        make_projet_tree(cls.projet)
+        make_projet_tree(make_projet(1))
+
+    def setUp(self):
+        if connection.vendor not in ('mysql', 'sqlite'):
+            self.skipTest('EXPLAIN parsing is only implemented for MySQL and SQLite')
+        self.client.force_authenticate(self.user)
+
+    def assertIndexedQueries(self, queries):
+        checked = 0
+        for query in queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT') or ' WHERE ' not in sql:
+                continue
+            checked += 1
+            self.assertEqual(full_table_scans(sql), [], 'Full table scan for: %s' % sql)
+        self.assertGreater(checked, 0)
+
+    def assertIndexedEndpoint(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertIndexedQueries(context.captured_queries)
+
+    def test_by_project_endpoints(self):
+        for url in [
+            '/api/sous-projet/projet/%d/' % self.projet.pk,
+            '/api/maitre-ouvrage/projet/%d/' % self.projet.pk,
+            '/api/maitre-doeuvre/projet/%d/' % self.projet.pk,
+            '/api/projects/%d/' % self.projet.pk,
+            '/api/projects/%d/tree/' % self.projet.pk,
+        ]:
+            with self.subTest(url=url):
+                self.assertIndexedEndpoint(url)
+
+    def test_summary_endpoint(self):
+        self.assertIndexedEndpoint('/api/projects/summary/?statut=en%20cours')
+        self.assertIndexedEndpoint('/api/projects/summary/?date_from=2024-01-01&date_to=2024-12-31')
+
+    def test_facture_export(self):
+        self.assertIndexedEndpoint(
+            '/api/factures/export/?projet=%d&date_from=2024-01-01&date_to=2024-12-31' % self.projet.pk
+        )
+
+    def test_cursor_pages(self):
+        response = self.client.get('/api/projects/?cursor=&per_page=1')
+        self.assertIndexedEndpoint(response.data['data']['next'])
+
+    def test_list_filters(self):
+        for url in [
+            '/api/projects/?statut=en%20cours',
+            '/api/projects/?date_debut_de_projet__gte=2024-01-01&ordering=-date_debut_de_projet',
+            '/api/sous-projet/?statut_sous_projet=en%20cours',
+            '/api/sous-projet/?date_finsousprojet__gte=2024-06-01&date_finsousprojet__lte=2024-06-30',
+            '/api/maitre-ouvrage/?type_mo__in=public,prive',
+            '/api/maitre-doeuvre/?nom_fournisseur=MD%200',
+        ]:
+            with self.subTest(url=url):
+                self.assertIndexedEndpoint(url)
+
+    def test_by_project_lookups(self):
+        for queryset in [
+            SousProjet.objects.filter(id_projet=self.projet.pk).order_by('id_sous_projet'),
+            MaitreOuvrage.objects.filter(id_projet=self.projet.pk).order_by('id_mo'),
+            MaitreDoeuve.objects.filter(id_projet=self.projet.pk).order_by('id_md'),
+            Facture.objects.filter(id_projet=self.projet.pk).order_by('date_facturation'),
+            Document.objects.filter(id_projet=self.projet.pk).order_by('date_ajout'),
+            Incident.objects.filter(id_projet=self.projet.pk).order_by('date_incident'),
+            Employe.objects.filter(id_projet=self.projet.pk),
+        ]:
+            with self.subTest(model=queryset.model.__name__):
+                self.assertIndexedQueries([{'sql': str(queryset.query)}])
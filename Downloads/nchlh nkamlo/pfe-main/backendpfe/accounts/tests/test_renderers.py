@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.test import APITestCase
+
+from ..renderers import FastJSONRenderer, MoneyJSONRenderer
+from .fixtures import make_projet, make_projet_tree, make_user
+
+
+class FastJSONRendererTests(SimpleTestCase):
+
+    def test_same_bytes_as_json_renderer(self):
+        def payload(money):
+            return OrderedDict([
+                ('success', True),
+                ('message', gettext_lazy('Projet créé')),
+                ('data', [{'id': 1, 'montant': money, 'note': 'a b', 'ratio': 0.5, 'vide': None}]),
+                ('errors', {'field': [ErrorDetail('Invalid', code='invalid')], 3: 'int key'}),
+                ('dates', [date(2024, 1, 2), datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)]),
+            ])
+
+        amount = Decimal('1000.000000000000000000000000000000')
+        # With COERCE_DECIMAL_TO_STRING, DRF would have handed JSONRenderer the string.
+        self.assertEqual(FastJSONRenderer().render(payload(amount)),
+                         JSONRenderer().render(payload(format(amount, 'f'))))
+
+    def test_money_json_renderer(self):
+        amount = Decimal('1000.000000000000000000000000000000')
+        self.assertEqual(MoneyJSONRenderer().render({'montant': amount, 'ratio': 0.5}),
+                         JSONRenderer().render({'montant': format(amount, 'f'), 'ratio': 0.5}))
+        # The browsable API renders its raw data form with the parser's renderer.
+        self.assertIs(api_settings.DEFAULT_PARSER_CLASSES[0].renderer_class, MoneyJSONRenderer)
+
+    def test_money_formats(self):
+        renderer = FastJSONRenderer()
+        amount = Decimal('12345678901234567890123456789012345.125000000000000000000000000000')
+        self.assertEqual(renderer.money_formats['compact'](amount), '12345678901234567890123456789012345.125')
+        self.assertEqual(renderer.money_formats['rounded'](amount), '12345678901234567890123456789012345.13')
+        self.assertEqual(renderer.money_formats['compact'](Decimal('0E-30')), '0')
+
+
+class MoneyFormatTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.projet = make_projet()
+        make_projet_tree(cls.projet)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def get_totals(self, query=''):
+        response = self.client.get('/api/projects/%d/summary/%s' % (self.projet.pk, query))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        return data['total_facture_ttc'], data['total_paye']
+
+    def test_money_query_param(self):
+        self.assertEqual(self.get_totals(), ('357.' + '0' * 30, '0.' + '0' * 30))
+        self.assertEqual(self.get_totals('?money=compact'), ('357', '0'))
+        self.assertEqual(self.get_totals('?money=rounded'), ('357.00', '0.00'))
+
+    def test_browsable_api(self):
+        response = self.client.get('/api/projects/%d/summary/' % self.projet.pk, HTTP_ACCEPT='text/html')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '&quot;total_facture_ttc&quot;: &quot;357.%s&quot;' % ('0' * 30))
@@ -0,0 +1,93 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from ..models import SousProjet
+from ..response_cache import check_response_cache, response_cache
+from .fixtures import make_projet, make_projet_tree, make_user
+
+
+@override_settings(RESPONSE_CACHE_ALIAS='default')
+class ResponseCacheTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.projet, cls.other = make_projet(0), make_projet(1)
+        make_projet_tree(cls.projet, size=2)
+        make_projet_tree(cls.other, size=1)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def put_sous_projet(self, sous_projet, **fields):
+        data = {
+            'nom_sous_projet': sous_projet.nom_sous_projet, 'date_debut_sousprojet': '2024-01-01',
+            'date_finsousprojet': '2024-06-30', 'statut_sous_projet': 'en cours', 'id_projet': self.projet.pk,
+        }
+        data.update(fields)
+        response = self.client.put('/api/sous-projet/%d/' % sous_projet.pk, data, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_hit(self):
+        url = '/api/sous-projet/projet/%d/' % self.projet.pk
+        miss = self.client.get(url)
+        self.assertEqual(miss['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            hit = self.client.get(url)
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=miss['ETag']).status_code, 304)
+        self.assertEqual(hit['X-Cache'], 'HIT')
+        self.assertEqual(hit.content, miss.content)
+        self.assertEqual(hit['ETag'], miss['ETag'])
+        self.assertEqual(self.client.get(url, {'fields': 'id_sous_projet'})['X-Cache'], 'MISS')
+        self.assertEqual(response_cache.stats(), {'hits': 2, 'misses': 2, 'hit_ratio': 0.5})
+
+    def test_role(self):
+        self.client.get('/api/projects/')
+        self.client.force_authenticate(make_user('employe@example.com', 'employee'))
+        self.assertEqual(self.client.get('/api/projects/')['X-Cache'], 'MISS')
+
+    def test_write_bumps_projects(self):
+        sous_projet = SousProjet.objects.filter(id_projet=self.projet).first()
+        urls = {
+            'projet': '/api/sous-projet/projet/%d/' % self.projet.pk,
+            'other': '/api/sous-projet/projet/%d/' % self.other.pk,
+            'all': '/api/sous-projet/',
+            'detail': '/api/sous-projet/%d/' % sous_projet.pk,
+        }
+        for url in urls.values():
+            self.client.get(url)
+
+        self.put_sous_projet(sous_projet, nom_sous_projet='Renamed')
+        self.assertEqual(self.client.get(urls['other'])['X-Cache'], 'HIT')
+        for name in ['projet', 'all', 'detail']:
+            response = self.client.get(urls[name])
+            self.assertEqual(response['X-Cache'], 'MISS', name)
+            self.assertIn(b'Renamed', response.content)
+
+        # Moving the row to the other project retires the lists of both.
+        self.client.get(urls['projet'])
+        self.client.get(urls['other'])
+        self.put_sous_projet(sous_projet, id_projet=self.other.pk)
+        self.assertEqual(self.client.get(urls['projet'])['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(urls['other'])['X-Cache'], 'MISS')
+
+
+class ResponseCacheCheckTests(SimpleTestCase):
+
+    def check_ids(self):
+        return [error.id for error in check_response_cache(None)]
+
+    def test_shared_cache(self):
+        self.assertEqual(self.check_ids(), [])
+        caches = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'shared': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'response_cache'},
+        }
+        with self.settings(CACHES=caches, RESPONSE_CACHE_ALIAS='shared'):
+            self.assertEqual(self.check_ids(), [])
+        with self.settings(CACHES=caches, RESPONSE_CACHE_ALIAS='default'):
+            self.assertEqual(self.check_ids(), ['accounts.E002'])
+        with self.settings(CACHES=caches, RESPONSE_CACHE_ALIAS='missing'):
+            self.assertEqual(self.check_ids(), ['accounts.E001'])
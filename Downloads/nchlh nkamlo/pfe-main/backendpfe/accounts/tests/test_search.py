@@ -0,0 +1,84 @@
+from datetime import date
+
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from ..models import Incident, Reunion, SearchTerm, SousProjet
+from .fixtures import make_projet, make_user
+
+
+class SearchTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.projet = make_projet(nom_projet='Route nationale')
+        cls.sous_projet = SousProjet.objects.create(
+            nom_sous_projet='Lot 1', date_debut_sousprojet=date(2024, 1, 1), date_finsousprojet=date(2024, 6, 30),
+            statut_sous_projet='en cours', id_projet=cls.projet,
+            description_sous_projet='Coulage du béton de la route, puis béton du pont ' + 'x' * 300,
+        )
+        cls.incident = Incident.objects.create(
+            description_incident='Fissure dans le BETON', date_incident=date(2024, 4, 1), id_projet=cls.projet)
+        cls.reunion = Reunion.objects.create(ordre_de_jour='Planning du pont', id_projet=cls.projet)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def search(self, **params):
+        response = self.client.get('/api/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def test_ranking(self):
+        with self.assertNumQueries(4):  # ranking, then one query per kind found
+            results = self.search(q='béton route')['results']
+        # Ties are broken by type.
+        self.assertEqual([(hit['type'], hit['id']) for hit in results], [
+            ('sous_projet', self.sous_projet.pk), ('incident', self.incident.pk), ('projet', self.projet.pk),
+        ])
+        self.assertEqual(results[0]['label'], 'Lot 1')
+        self.assertEqual(results[0]['id_projet'], self.projet.pk)
+        self.assertTrue(results[0]['snippet'].startswith('Coulage du béton'))
+
+    def test_pagination_and_type(self):
+        data = self.search(q='pont', per_page=1)
+        self.assertEqual(data['results'][0]['type'], 'reunion')
+        self.assertIsNone(data['previous'])
+        data = self.client.get(data['next']).json()['data']
+        self.assertEqual(data['results'][0]['type'], 'sous_projet')
+        self.assertIsNone(data['next'])
+        self.assertIsNotNone(data['previous'])
+
+        self.assertEqual([hit['type'] for hit in self.search(q='pont', type='reunion')['results']], ['reunion'])
+
+    def test_index_follows_writes(self):
+        self.incident.description_incident = 'Glissement de terrain'
+        self.incident.save()
+        self.assertEqual(self.search(q='fissure')['results'], [])
+        self.assertEqual(len(self.search(q='glissement')['results']), 1)
+
+        self.reunion.delete()
+        self.assertFalse(SearchTerm.objects.filter(kind='reunion').exists())
+
+        response = self.client.put('/api/sous-projet/', [{
+            'id_sous_projet': self.sous_projet.pk, 'nom_sous_projet': 'Lot 1', 'date_debut_sousprojet': '2024-01-01',
+            'date_finsousprojet': '2024-06-30', 'statut_sous_projet': 'en cours',
+            'description_sous_projet': 'Terrassement',
+        }], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.search(q='terrassement')['results'][0]['id'], self.sous_projet.pk)
+        self.assertEqual(self.search(q='coulage')['results'], [])
+
+    def test_rebuild(self):
+        SearchTerm.objects.all().delete()
+        call_command('rebuild_search_index', stdout=open('/dev/null', 'w'))
+        self.assertEqual(len(self.search(q='pont')['results']), 2)
+
+    def test_invalid_query(self):
+        response = self.client.get('/api/search/', {'q': 'de', 'type': 'facture'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'], {
+            'q': ['Enter at least one word of 3 letters or more'],
+            'type': ['Unknown type(s): facture'],
+        })
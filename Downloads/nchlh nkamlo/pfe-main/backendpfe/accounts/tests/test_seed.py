@@ -0,0 +1,77 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count, F
+from django.test import TestCase
+from django.utils.connection import ConnectionDoesNotExist
+
+from ..models import Employe, Facture, Marche, Projet, ProjetFinancialRollup, SousProjet, SuivieSousProjet, Utilisateur
+
+SIZES = ['--scale', '0.001', '--size', 'factures=3000', '--size', 'projets=20']
+
+
+def seed(*args):
+    call_command('seed', *SIZES, *args, stdout=StringIO())
+
+
+class SeedCommandTests(TestCase):
+
+    def test_sizes_and_foreign_keys(self):
+        seed('--seed', '1')
+        self.assertEqual(Projet.objects.count(), 20)
+        self.assertEqual(SousProjet.objects.count(), 50)
+        self.assertEqual(Facture.objects.count(), 3000)
+        self.assertEqual(Utilisateur.objects.count(), 2)
+        self.assertEqual(Employe.objects.count(), 1)
+        self.assertFalse(Facture.objects.exclude(id_projet__in=Projet.objects.all()).exists())
+        # A facture's sous-projet and marche belong to its projet.
+        self.assertFalse(Facture.objects.exclude(id_sous_projet=None)
+                         .exclude(id_sous_projet__id_projet=F('id_projet')).exists())
+        self.assertFalse(Facture.objects.exclude(id_marche=None).exclude(id_marche__id_projet=F('id_projet')).exists())
+        self.assertTrue(ProjetFinancialRollup.objects.exists())
+
+    def test_skew(self):
+        seed()
+        sizes = sorted(Facture.objects.values('id_projet').annotate(rows=Count('pk')).values_list('rows', flat=True))
+        self.assertGreater(sizes[-1], 10 * sizes[len(sizes) // 2])
+
+    def test_skewed_suivis(self):
+        seed('--size', 'suivis=2000')
+        sizes = sorted(SuivieSousProjet.objects.values('id_sous_projet').annotate(rows=Count('pk'))
+                       .values_list('rows', flat=True))
+        self.assertGreater(sizes[-1], 10 * sizes[len(sizes) // 2])
+
+    def test_numero_marche_unique_across_runs(self):
+        seed('--size', 'marches=50', '--skip-rebuild')
+        seed('--size', 'marches=50', '--skip-rebuild')
+        numeros = list(Marche.objects.values_list('numero_marche', flat=True))
+        self.assertEqual(len(numeros), 100)
+        self.assertEqual(len(set(numeros)), 100)
+
+    def test_deterministic(self):
+        def factures():
+            return list(Facture.objects.order_by('pk').values_list('id_projet', 'id_sous_projet', 'montant_ttc'))
+
+        seed('--seed', '7')
+        first = factures()
+        for model in (Facture, SousProjet, Projet):
+            model.objects.all().delete()
+        seed('--seed', '7', '--skip-rebuild', '--batch-size', '100')
+        self.assertEqual(factures(), first)
+
+    def test_invalid_size(self):
+        with self.assertRaisesMessage(CommandError, 'Invalid --size'):
+            seed('--size', 'factures=many')
+        with self.assertRaisesMessage(CommandError, 'At least one row is needed in projets'):
+            seed('--size', 'projets=0')
+
+    def test_rebuild_database(self):
+        with mock.patch('accounts.management.commands.seed.call_command', wraps=call_command) as rebuild:
+            seed('--database', DEFAULT_DB_ALIAS)
+        self.assertEqual(rebuild.call_args_list[0][0], ('rebuild_financial_rollup',))
+        self.assertEqual(rebuild.call_args_list[0][1]['database'], DEFAULT_DB_ALIAS)
+        with self.assertRaises(ConnectionDoesNotExist):
+            call_command('rebuild_financial_rollup', '--database', 'nowhere', stdout=StringIO())
@@ -0,0 +1,57 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from .fixtures import make_projet, make_projet_tree, make_user
+
+
+class SparseFieldsTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        cls.projet = make_projet()
+        make_projet_tree(cls.projet, size=2)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        selects = [query['sql'] for query in context.captured_queries if query['sql'].startswith('SELECT')]
+        return response, selects[-1]
+
+    def test_list_fields(self):
+        response, sql = self.get('/api/projects/', fields='id_projet,nom_projet,statut')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()['data']['results'][0]), ['id_projet', 'nom_projet', 'statut'])
+        self.assertNotIn('description_de_projet', sql)
+
+    def test_list_exclude(self):
+        response, sql = self.get('/api/sous-projet/projet/%d/' % self.projet.pk, exclude='description_sous_projet')
+        self.assertEqual(response.status_code, 200)
+        row = response.json()['data']['results'][0]
+        self.assertNotIn('description_sous_projet', row)
+        self.assertIn('nom_sous_projet', row)
+        self.assertNotIn('description_sous_projet', sql)
+
+    def test_detail_fields(self):
+        response, sql = self.get('/api/projects/%d/' % self.projet.pk, fields='nom_projet')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'], {'nom_projet': 'Projet 0'})
+        self.assertNotIn('description_de_projet', sql)
+
+    def test_summary_fields(self):
+        response, _ = self.get('/api/projects/summary/', fields='id_projet,total_paye', money='compact')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['results'], [{'id_projet': self.projet.pk, 'total_paye': '0'}])
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/maitre-ouvrage/', {'fields': 'id_mo,secret', 'exclude': 'nope'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {
+            'success': False,
+            'message': 'Invalid data',
+            'errors': {'fields': ['Unknown field(s): secret'], 'exclude': ['Unknown field(s): nope']},
+        })
@@ -0,0 +1,55 @@
+from decimal import Decimal
+
+from rest_framework import serializers
+from rest_framework.test import APITestCase
+
+from ..models import Facture, MaitreDoeuve, MaitreOuvrage, Projet, SousProjet
+from ..renderers import FastJSONRenderer
+from ..serializers import MaitreDoeuvreSerializer, MaitreOuvrageSerializer, ProjetSerializer, SousProjetSerializer
+from ..serializers.values_list_serializer import ValuesListSerializer
+from .fixtures import make_projet, make_projet_tree, make_user
+
+
+class FactureSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Facture
+        fields = '__all__'
+
+
+class ValuesListSerializerTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+        projet = make_projet()
+        make_projet_tree(projet)
+        make_projet_tree(make_projet(1, description_de_projet='Équipements "lot"'), size=2)
+        SousProjet.objects.create(nom_sous_projet='Orphelin', date_debut_sousprojet='2024-01-01',
+                                  date_finsousprojet='2024-02-01', statut_sous_projet='en cours')
+        MaitreOuvrage.objects.create(description_mo='Sans projet')
+        MaitreDoeuve.objects.create()
+        Facture.objects.create(brut_ht=Decimal('0.1'), montant_ttc=Decimal('12345678901234567890.5'))
+
+    def assertSameOutput(self, serializer_class, queryset):
+        expected = FastJSONRenderer().render(serializer_class(queryset, many=True).data)
+        fast = ValuesListSerializer(serializer_class)
+        rows = queryset.values_list(*fast.get_columns(queryset), named=True)
+        self.assertEqual(FastJSONRenderer().render(fast.to_representation(rows)), expected)
+
+    def test_same_bytes_as_model_serializer(self):
+        self.assertSameOutput(ProjetSerializer, Projet.objects.order_by('-id_projet'))
+        self.assertSameOutput(SousProjetSerializer, SousProjet.objects.order_by('id_sous_projet'))
+        self.assertSameOutput(MaitreOuvrageSerializer, MaitreOuvrage.objects.order_by('id_mo'))
+        self.assertSameOutput(MaitreDoeuvreSerializer, MaitreDoeuve.objects.order_by('id_md'))
+        self.assertSameOutput(FactureSerializer, Facture.objects.order_by('id_facture'))
+
+    def test_list_endpoints_with_cursor(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/sous-projet/', {'cursor': '', 'per_page': 4})
+        self.assertEqual(response.status_code, 200)
+        first_page = response.json()['data']
+        self.assertEqual(len(first_page['results']), 4)
+
+        response = self.client.get(first_page['next'])
+        ids = [row['id_sous_projet'] for row in first_page['results'] + response.json()['data']['results']]
+        self.assertEqual(ids, list(SousProjet.objects.order_by('id_sous_projet').values_list('pk', flat=True)))
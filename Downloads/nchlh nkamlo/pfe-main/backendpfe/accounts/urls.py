@@ -1,28 +1,58 @@
+from django.conf import settings
 from django.urls import path
+from .views.async_views import async_read_view
 from .views.auth_views import AuthView
 from .views.sub_project_view import SubProjectView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .views.project_view import ProjectView 
 from .views.maitre_ouvrage_view import MaitreOuvrageView
 from .views.maitre_doeuvre_view import MaitreDoeuvreView
+from .views.facture_export_view import FactureExportView
+from .views.project_summary_view import ProjectSummaryView
+from .views.spreadsheet_import_view import SpreadsheetImportView
+from .views.search_view import SearchView
+from .views.project_tree_view import ProjectTreeView
+from .views.project_timeline_view import ProjectTimelineView
+from .views.metrics_view import metrics_view
+
+
+def read_view(view_class):
+    """The view of ``view_class``; under ASGI its reads run as an async view (see async_read_view)."""
+    if settings.ASYNC_READ_VIEWS:
+        return async_read_view(view_class)
+    return view_class.as_view()
+
 
 urlpatterns = [
     #sign in
     path('auth/', AuthView.as_view(), name='auth'),
-    path('sub-project', SubProjectView.as_view(), name='project_view'),
+    path('sub-project', read_view(SubProjectView), name='project_view'),
 
-     path('projects/', ProjectView.as_view(), name='project-list-create'),
-    path('projects/<int:pk>/', ProjectView.as_view(), name='project-detail'),
+     path('projects/', read_view(ProjectView), name='project-list-create'),
+    path('projects/<int:pk>/', read_view(ProjectView), name='project-detail'),
+    path('projects/summary/', read_view(ProjectSummaryView), name='project-summary'),
+    path('projects/<int:pk>/summary/', read_view(ProjectSummaryView), name='project-summary-detail'),
+    path('projects/timeline/', read_view(ProjectTimelineView), name='project-timeline'),
+    # A project with its children, in one response
+    path('projects/<int:pk>/tree/', read_view(ProjectTreeView), name='project-tree'),
     #sous projets
-    path('sous-projet/', SubProjectView.as_view(), name='sous_projet_list'),
-    path('sous-projet/<int:pk>/', SubProjectView.as_view(), name='sous_projet_detail'),
-    path('sous-projet/projet/<int:projet_id>/', SubProjectView.as_view(), name='sous_projet_by_project'),
+    path('sous-projet/', read_view(SubProjectView), name='sous_projet_list'),
+    path('sous-projet/<int:pk>/', read_view(SubProjectView), name='sous_projet_detail'),
+    path('sous-projet/projet/<int:projet_id>/', read_view(SubProjectView), name='sous_projet_by_project'),
     # Maitre d'Ouvrage endpoints
-    path('maitre-ouvrage/', MaitreOuvrageView.as_view(), name='maitre_ouvrage_list'),
-   path('maitre-ouvrage/<int:pk>/', MaitreOuvrageView.as_view(), name='maitre_ouvrage_detail'),
-     path('maitre-ouvrage/projet/<int:projet_id>/', MaitreOuvrageView.as_view(), name='maitre_ouvrage_by_project'),
+    path('maitre-ouvrage/', read_view(MaitreOuvrageView), name='maitre_ouvrage_list'),
+   path('maitre-ouvrage/<int:pk>/', read_view(MaitreOuvrageView), name='maitre_ouvrage_detail'),
+     path('maitre-ouvrage/projet/<int:projet_id>/', read_view(MaitreOuvrageView), name='maitre_ouvrage_by_project'),
     # Retrieve all, by project, or a single maitre d'oeuvre
-    path('maitre-doeuvre/', MaitreDoeuvreView.as_view(), name='maitre-doeuvre-list'),
-    path('maitre-doeuvre/<int:pk>/', MaitreDoeuvreView.as_view(), name='maitre-doeuvre-detail'),
-    path('maitre-doeuvre/projet/<int:projet_id>/', MaitreDoeuvreView.as_view(), name='maitre-doeuvre-by-project'),
+    path('maitre-doeuvre/', read_view(MaitreDoeuvreView), name='maitre-doeuvre-list'),
+    path('maitre-doeuvre/<int:pk>/', read_view(MaitreDoeuvreView), name='maitre-doeuvre-detail'),
+    path('maitre-doeuvre/projet/<int:projet_id>/', read_view(MaitreDoeuvreView), name='maitre-doeuvre-by-project'),
+    # Factures export (CSV / NDJSON stream)
+    path('factures/export/', FactureExportView.as_view(), name='facture-export'),
+    # Bulk import of factures / marches (CSV / XLSX upload)
+    path('import/<str:kind>/', SpreadsheetImportView.as_view(), name='spreadsheet-import'),
+    # Full-text search across projets, sous-projets, incidents and reunions
+    path('search/', read_view(SearchView), name='search'),
+    # Prometheus metrics of this process
+    path('metrics/', metrics_view, name='metrics'),
 ]
\ No newline at end of file
@@ -4,4 +4,10 @@ from .auth_views import AuthView
 from .sub_project_view import SubProjectView
 from .project_view import ProjectView
 from .maitre_ouvrage_view import MaitreOuvrageView
-from .maitre_doeuvre_view import MaitreDoeuvreView
\ No newline at end of file
+from .maitre_doeuvre_view import MaitreDoeuvreView
+from .facture_export_view import FactureExportView
+from .project_summary_view import ProjectSummaryView
+from .spreadsheet_import_view import SpreadsheetImportView
+from .search_view import SearchView
+from .project_tree_view import ProjectTreeView
+from .project_timeline_view import ProjectTimelineView
\ No newline at end of file
@@ -0,0 +1,42 @@
+from asgiref.sync import sync_to_async
+from ..concurrency import call_with_own_connection
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def render_view(view, request, *args, **kwargs):
+    response = view(request, *args, **kwargs)
+    # Rendering here keeps the serialization off the thread shared by the
+    # sync code of every request.
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.render()
+    return response
+
+
+def async_read_view(view_class, **initkwargs):
+    """
+    ``view_class.as_view()`` as an async view, for the ASGI server.
+
+    Under ASGI, Django 3.2 runs every sync view on one shared thread
+    (thread_sensitive), so a request waiting on MySQL holds up all the
+    others. Here reads run, and render, in the executor's thread pool
+    instead, each thread with its own connection, and are awaited. Writes
+    keep the shared thread, like any sync view, since they may use
+    transactions.
+
+    Django 3.2 has no async ORM (and mysqlclient no async API), so the
+    queries themselves still block a pool thread.
+    """
+    view = view_class.as_view(**initkwargs)
+    run_read = sync_to_async(call_with_own_connection, thread_sensitive=False)
+    run_write = sync_to_async(render_view)
+
+    async def async_view(request, *args, **kwargs):
+        if request.method in READ_METHODS:
+            return await run_read(render_view, view, request, *args, **kwargs)
+        return await run_write(view, request, *args, **kwargs)
+
+    async_view.view_class = view_class
+    async_view.view_initkwargs = initkwargs
+    async_view.csrf_exempt = True  # Like APIView.as_view(); DRF authenticates.
+    return async_view
@@ -0,0 +1,213 @@
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from rest_framework import serializers, status
+from rest_framework.validators import UniqueValidator
+from ..responses.api_response import api_response, error_response
+from ..search import KINDS_BY_MODEL, index_documents
+from ..serializers.fields import PrefetchedPrimaryKeyRelatedField, PrefetchedUniqueValidator
+
+
+class BulkWriteMixin:
+    """
+    List-payload variants of ``post`` and ``put``.
+
+    ``POST [...]`` creates and ``PUT [...]`` (every item carrying its primary
+    key) updates all the items with one ``bulk_create`` / ``bulk_update`` in
+    a single transaction. By default the batch is all-or-nothing; with
+    ``?mode=partial`` the valid items are written and the rejected ones are
+    reported by index.
+
+    Note that on MySQL ``bulk_create`` cannot return the new primary keys.
+    """
+    bulk_batch_size = 500
+    bulk_max_items = 1000
+
+    def is_partial_mode(self):
+        return self.request.query_params.get('mode') == 'partial'
+
+    def bulk_create(self, request):
+        invalid_payload = self.check_bulk_payload(request.data)
+        if invalid_payload:
+            return invalid_payload
+
+        model = self.serializer_class.Meta.model
+        serializer = self.get_bulk_serializer(request.data)
+        instances, errors = [], []
+        for index, item in enumerate(request.data):
+            validated_data, item_errors = self.validate_item(serializer, item)
+            if item_errors:
+                errors.append({'index': index, 'errors': item_errors})
+            else:
+                instances.append((index, model(**validated_data)))
+
+        return self.bulk_write_response(
+            instances, errors,
+            lambda batch: model.objects.bulk_create(batch, batch_size=self.bulk_batch_size),
+            creating=True
+        )
+
+    def bulk_update(self, request):
+        invalid_payload = self.check_bulk_payload(request.data)
+        if invalid_payload:
+            return invalid_payload
+
+        model = self.serializer_class.Meta.model
+        pk_name = model._meta.pk.name
+        pks = []
+        for item in request.data:
+            try:
+                pks.append(model._meta.pk.to_python(item.get(pk_name)))
+            except ValidationError:
+                pks.append(None)
+        existing = model.objects.in_bulk([pk for pk in pks if pk is not None])
+        # The projects the rows belong to before the update.
+        self.invalidate_cached_responses(*existing.values())
+
+        serializer = self.get_bulk_serializer(request.data)
+        instances, errors, fields = [], [], set()
+        for index, (item, pk) in enumerate(zip(request.data, pks)):
+            instance = existing.get(pk)
+            if instance is None:
+                errors.append({'index': index, 'errors': {pk_name: ['Not found.']}})
+                continue
+            validated_data, item_errors = self.validate_item(serializer, item, instance)
+            if item_errors:
+                errors.append({'index': index, 'errors': item_errors})
+                continue
+            for field, value in validated_data.items():
+                setattr(instance, field, value)
+            fields.update(validated_data)
+            instances.append((index, instance))
+
+        fields.discard(pk_name)
+        # bulk_update() skips pre_save(), which is what sets the auto_now fields.
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                for _, instance in instances:
+                    field.pre_save(instance, add=False)
+                fields.add(field.name)
+        return self.bulk_write_response(
+            instances, errors,
+            lambda batch: model.objects.bulk_update(batch, sorted(fields), batch_size=self.bulk_batch_size),
+            creating=False
+        )
+
+    def get_bulk_serializer(self, items):
+        """
+        One serializer validates every item of the batch (a ListSerializer
+        would drop all the valid items as soon as one is invalid). Its related
+        fields get the rows they reference preloaded with one query per field
+        instead of one query per item, and so do the uniqueness checks of its
+        unique fields.
+        """
+        serializer = self.serializer_class()
+        for name, field in list(serializer.fields.items()):
+            if field.read_only:
+                continue
+            if not isinstance(field, serializers.RelatedField):
+                field.validators = [self.prefetch_unique_validator(validator, name, field, items)
+                                    for validator in field.validators]
+                continue
+            if type(field) is not serializers.PrimaryKeyRelatedField:
+                continue
+            related_model = field.get_queryset().model
+            pks = set()
+            for item in items:
+                try:
+                    pks.add(related_model._meta.pk.to_python(item.get(name)))
+                except ValidationError:
+                    pass
+            pks.discard(None)
+            objects = field.get_queryset().in_bulk(list(pks)) if pks else {}
+            serializer.fields[name] = PrefetchedPrimaryKeyRelatedField(objects=objects, **field._kwargs)
+        return serializer
+
+    def prefetch_unique_validator(self, validator, name, field, items):
+        if type(validator) is not UniqueValidator or validator.lookup != 'exact':
+            return validator
+        values = set()
+        for item in items:
+            try:
+                values.add(field.to_internal_value(item[name]))
+            except (KeyError, TypeError, serializers.ValidationError):
+                pass
+        values.discard(None)
+        return PrefetchedUniqueValidator(
+            validator.queryset, values, field.source_attrs[-1], message=validator.message
+        )
+
+    def validate_item(self, serializer, item, instance=None):
+        serializer.instance = instance
+        serializer.initial_data = item
+        try:
+            return serializer.run_validation(item), None
+        except serializers.ValidationError as exc:
+            return None, serializers.as_serializer_error(exc)
+
+    def check_bulk_payload(self, items):
+        if not items or not all(isinstance(item, dict) for item in items):
+            message = 'Expected a non-empty list of objects'
+        elif len(items) > self.bulk_max_items:
+            message = 'A batch cannot hold more than %d items' % self.bulk_max_items
+        else:
+            return None
+        return error_response(message)
+
+    def bulk_write_response(self, instances, errors, write, creating):
+        partial = self.is_partial_mode()
+        if errors and not partial:
+            return error_response('Invalid data', errors)
+
+        try:
+            written, write_errors = self.write_bulk(instances, write, creating, partial)
+        except IntegrityError as exc:
+            return error_response('Invalid data', [{'index': None, 'errors': {'non_field_errors': [str(exc)]}}])
+
+        self.invalidate_cached_responses(*written)
+        errors = sorted(errors + write_errors, key=lambda error: error['index'])
+        if errors:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED if creating else status.HTTP_200_OK
+        return api_response(
+            not errors,
+            '%d items %s, %d rejected' % (len(written), 'created' if creating else 'updated', len(errors)),
+            response_status,
+            data=self.serializer_class(written, many=True).data,
+            errors=errors
+        )
+
+    def write_bulk(self, indexed_instances, write, creating, partial):
+        instances = [instance for _, instance in indexed_instances]
+        if not instances:
+            return [], []
+        try:
+            with transaction.atomic():
+                self.write_batch(instances, write)
+            return instances, []
+        except IntegrityError:
+            if not partial:
+                raise
+
+        # Partial mode: the batch hit a constraint, so find the offending rows
+        # by writing them one by one, each in its own savepoint.
+        written, errors = [], []
+        with transaction.atomic():
+            for index, instance in indexed_instances:
+                if creating:
+                    instance.pk = None
+                try:
+                    with transaction.atomic():
+                        self.write_batch([instance], write)
+                    written.append(instance)
+                except IntegrityError as exc:
+                    errors.append({'index': index, 'errors': {'non_field_errors': [str(exc)]}})
+        return written, errors
+
+    def write_batch(self, instances, write):
+        write(instances)
+        # bulk_create() / bulk_update() skip save(), which maintains the search
+        # index. Rows created without getting their primary key back (MySQL,
+        # SQLite) are only indexed by the next rebuild_search_index.
+        if type(instances[0]) in KINDS_BY_MODEL:
+            index_documents([instance for instance in instances if instance.pk is not None])
@@ -0,0 +1,105 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from ..models import Facture
+from ..serializers.facture_export_serializer import FactureExportQuerySerializer
+from ..responses.api_response import error_response
+
+# (column header, values_list lookup). The FK names are resolved by JOIN in
+# the same query as the invoice rows.
+EXPORT_COLUMNS = [
+    ('id_facture', 'id_facture'),
+    ('numero_facture', 'numero_facture'),
+    ('designation', 'designation'),
+    ('date_facturation', 'date_facturation'),
+    ('date_reception', 'date_reception'),
+    ('brut_ht', 'brut_ht'),
+    ('montant_net_ht', 'montant_net_ht'),
+    ('montant_tva', 'montant_tva'),
+    ('montant_ttc', 'montant_ttc'),
+    ('date_ordre_virement', 'date_ordre_virement'),
+    ('numero_ordre_virement', 'numero_ordre_virement'),
+    ('id_projet', 'id_projet'),
+    ('nom_projet', 'id_projet__nom_projet'),
+    ('id_sous_projet', 'id_sous_projet'),
+    ('nom_sous_projet', 'id_sous_projet__nom_sous_projet'),
+    ('id_marche', 'id_marche'),
+    ('numero_marche', 'id_marche__numero_marche'),
+    ('id_ap', 'id_ap'),
+    ('montant_ap', 'id_ap__montant_ap'),
+    ('id_md', 'id_md'),
+    ('nom_fournisseur', 'id_md__nom_fournisseur'),
+]
+
+
+class Echo:
+    """File-like object whose write() hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+class FactureExportView(APIView):
+    """
+    Streams every Facture matching the filters as CSV or NDJSON.
+
+    Rows are read in primary-key batches of ``chunk_size`` (MySQLdb buffers
+    a whole result set client-side, even through ``iterator()``), so memory
+    stays flat whatever the size of the export and the first bytes go out
+    as soon as the first batch is read.
+    """
+    permission_classes = [IsAuthenticated]
+    chunk_size = 2000
+
+    def get(self, request):
+        query = FactureExportQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return error_response('Invalid data', query.errors)
+
+        filters = query.validated_data
+        rows = self.iter_rows(self.get_queryset(filters))
+
+        if filters['export_format'] == 'ndjson':
+            response = StreamingHttpResponse(self.stream_ndjson(rows), content_type='application/x-ndjson')
+            filename = 'factures.ndjson'
+        else:
+            response = StreamingHttpResponse(self.stream_csv(rows), content_type='text/csv')
+            filename = 'factures.csv'
+        response['Content-Disposition'] = 'attachment; filename="%s"' % filename
+        return response
+
+    def get_queryset(self, filters):
+        factures = Facture.objects.all()
+        if 'projet' in filters:
+            factures = factures.filter(id_projet=filters['projet'])
+        if 'date_from' in filters:
+            factures = factures.filter(date_facturation__gte=filters['date_from'])
+        if 'date_to' in filters:
+            factures = factures.filter(date_facturation__lte=filters['date_to'])
+        return factures
+
+    def iter_rows(self, factures):
+        lookups = [lookup for _, lookup in EXPORT_COLUMNS]
+        last_pk = None
+        while True:
+            batch = factures if last_pk is None else factures.filter(id_facture__gt=last_pk)
+            rows = list(batch.order_by('id_facture').values_list(*lookups)[:self.chunk_size])
+            yield from rows
+            if len(rows) < self.chunk_size:
+                return
+            last_pk = rows[-1][0]
+
+    def stream_csv(self, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow([header for header, _ in EXPORT_COLUMNS])
+        for row in rows:
+            yield writer.writerow(row)
+
+    def stream_ndjson(self, rows):
+        headers = [header for header, _ in EXPORT_COLUMNS]
+        for row in rows:
+            yield json.dumps(dict(zip(headers, row)), cls=DjangoJSONEncoder) + '\n'
@@ -1,32 +1,20 @@
 from rest_framework import status
-from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.views import APIView
-from rest_framework.pagination import PageNumberPagination
 from ..models import MaitreOuvrage
 from ..serializers.maitre_ouvrage_serializer import MaitreOuvrageSerializer
-from ..responses.success_api_response import SuccessAPIResponse
-from ..responses.error_api_response import ErrorAPIResponse
+from ..response_cache import cached_get
+from ..responses.api_response import error_response, success_response
+from .bulk_write_mixin import BulkWriteMixin
+from .paginated_list_view import PaginatedListView
 
 
-class MaitreOuvragePagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'per_page'
-    page_query_param = 'page'
-    max_page_size = 100
-
-
-class MaitreOuvrageView(APIView):
-    permission_classes = [IsAuthenticated]
-    pagination_class = MaitreOuvragePagination
-
-    def get_paginated_response(self, data):
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(data, self.request)
-        if page is not None:
-            return paginator.get_paginated_response(page)
-        return Response(data)
+class MaitreOuvrageView(BulkWriteMixin, PaginatedListView):
+    serializer_class = MaitreOuvrageSerializer
+    use_values_list = True
+    last_modified_field = 'updated_at'
+    filter_fields = {'type_mo': ['exact', 'in']}
+    ordering_fields = ('id_mo', 'type_mo')
 
+    @cached_get
     def get(self, request, projet_id=None, pk=None):
         if projet_id:
             return self.get_by_projet_id(request, projet_id)
@@ -35,98 +23,67 @@ class MaitreOuvrageView(APIView):
         return self.get_all()
 
     def get_all(self):
-        items = MaitreOuvrage.objects.all()
-        serializer = MaitreOuvrageSerializer(items, many=True)
-        return Response({
-            'success': True,
-            'message': 'Maitres d\'Ouvrage retrieved successfully',
-            'data': serializer.data
-        }, status=status.HTTP_200_OK)
+        items = MaitreOuvrage.objects.all().order_by('id_mo')
+        return self.get_paginated_list_response(items, 'Maitres d\'Ouvrage retrieved successfully')
 
     def get_single(self, request, pk):
         item = self.get_object(pk)
         if not item:
-            return Response({
-                'success': False,
-                'message': 'Maitre d\'Ouvrage not found'
-            }, status=status.HTTP_404_NOT_FOUND)
-
-        serializer = MaitreOuvrageSerializer(item)
-        return Response({
-            'success': True,
-            'message': 'Maitre d\'Ouvrage retrieved successfully',
-            'data': serializer.data
-        }, status=status.HTTP_200_OK)
+            return error_response('Maitre d\'Ouvrage not found', status=status.HTTP_404_NOT_FOUND)
+
+        not_modified = self.get_object_not_modified_response(item)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(item)
+        return success_response('Maitre d\'Ouvrage retrieved successfully', serializer.data)
 
     def post(self, request):
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
+
         serializer = MaitreOuvrageSerializer(data=request.data)
         if serializer.is_valid():
             item = serializer.save()
-            return Response({
-                'success': True,
-                'message': 'Maitre d\'Ouvrage created successfully',
-                'data': MaitreOuvrageSerializer(item).data
-            }, status=status.HTTP_201_CREATED)
-
-        return Response({
-            'success': False,
-            'message': 'Invalid data',
-            'errors': serializer.errors
-        }, status=status.HTTP_400_BAD_REQUEST)
-
-    def put(self, request, pk):
+            self.invalidate_cached_responses(item)
+            return success_response(
+                'Maitre d\'Ouvrage created successfully', MaitreOuvrageSerializer(item).data, status=status.HTTP_201_CREATED
+            )
+
+        return error_response('Invalid data', serializer.errors)
+
+    def put(self, request, pk=None):
+        if pk is None:
+            return self.bulk_update(request)
+
         item = self.get_object(pk)
         if not item:
-            return Response({
-                'success': False,
-                'message': 'Maitre d\'Ouvrage not found'
-            }, status=status.HTTP_404_NOT_FOUND)
+            return error_response('Maitre d\'Ouvrage not found', status=status.HTTP_404_NOT_FOUND)
 
         serializer = MaitreOuvrageSerializer(item, data=request.data)
         if serializer.is_valid():
+            self.invalidate_cached_responses(item)
             item = serializer.save()
-            return Response({
-                'success': True,
-                'message': 'Maitre d\'Ouvrage updated successfully',
-                'data': MaitreOuvrageSerializer(item).data
-            }, status=status.HTTP_200_OK)
-
-        return Response({
-            'success': False,
-            'message': 'Invalid data',
-            'errors': serializer.errors
-        }, status=status.HTTP_400_BAD_REQUEST)
+            self.invalidate_cached_responses(item)
+            return success_response('Maitre d\'Ouvrage updated successfully', MaitreOuvrageSerializer(item).data)
+
+        return error_response('Invalid data', serializer.errors)
 
     def delete(self, request, pk):
         item = self.get_object(pk)
         if not item:
-            return Response({
-                'success': False,
-                'message': 'Maitre d\'Ouvrage not found'
-            }, status=status.HTTP_404_NOT_FOUND)
+            return error_response('Maitre d\'Ouvrage not found', status=status.HTTP_404_NOT_FOUND)
 
+        self.invalidate_cached_responses(item)
         item.delete()
-        return Response({
-            'success': True,
-            'message': 'Maitre d\'Ouvrage deleted successfully'
-        }, status=status.HTTP_204_NO_CONTENT)
+        return success_response('Maitre d\'Ouvrage deleted successfully', status=status.HTTP_204_NO_CONTENT)
 
     def get_by_projet_id(self, request, projet_id):
-        items = MaitreOuvrage.objects.filter(id_projet=projet_id)
-        serializer = MaitreOuvrageSerializer(items, many=True)
-        paginated_response = self.get_paginated_response(serializer.data)
-
-        if isinstance(paginated_response, Response):
-            return Response({
-                'success': True,
-                'message': 'Maitres d\'Ouvrage retrieved successfully',
-                'data': paginated_response.data
-            }, status=status.HTTP_200_OK)
-
-        return paginated_response
+        items = MaitreOuvrage.objects.filter(id_projet=projet_id).order_by('id_mo')
+        return self.get_paginated_list_response(items, 'Maitres d\'Ouvrage retrieved successfully')
 
     def get_object(self, pk):
         try:
-            return MaitreOuvrage.objects.get(pk=pk)
+            return self.narrow_queryset(MaitreOuvrage.objects.all()).get(pk=pk)
         except MaitreOuvrage.DoesNotExist:
             return None
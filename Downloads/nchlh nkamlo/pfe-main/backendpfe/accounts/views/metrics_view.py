@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from ..metrics import endpoint_metrics
+
+
+def metrics_view(request):
+    """
+    The request metrics of this process (see MetricsMiddleware) for
+    Prometheus, to the bearer of ``settings.METRICS_TOKEN``. A plain Django
+    view: scrapes need neither JWT authentication nor content negotiation.
+
+    Every worker process keeps its own metrics: scrape each of them.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if not token or not constant_time_compare(request.META.get('HTTP_AUTHORIZATION', ''), 'Bearer %s' % token):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        endpoint_metrics.render(getattr(settings, 'METRICS_SAMPLE_RATE', 1.0)),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -0,0 +1,189 @@
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from ..pagination import KeysetPagination, StandardPagination
+from ..response_cache import get_project_id, response_cache
+from ..responses.api_response import error_response, success_response
+from ..serializers.list_filter_serializer import ListFilterQuerySerializer
+from ..serializers.sparse_fields_serializer import SparseFieldsQuerySerializer, get_readable_field_names
+from ..serializers.values_list_serializer import get_values_list_serializer
+
+
+class PaginatedListView(APIView):
+    """
+    Base view for the accounts list endpoints.
+
+    The queryset is paginated *before* it is serialized, so a request for one
+    page only fetches (LIMIT/OFFSET) and serializes the rows of that page.
+    Passing ``?cursor=`` switches to keyset pagination, which skips the
+    COUNT(*) and the OFFSET scan.
+
+    With ``use_values_list``, list pages are read as column tuples and
+    mapped by a ValuesListSerializer (same output as ``serializer_class``)
+    instead of building and serializing model instances.
+
+    GET requests accept ``?fields=`` / ``?exclude=`` (see
+    SparseFieldsQuerySerializer). The output is trimmed with
+    ``get_serializer()``, and the SELECT with ``narrow_queryset()`` or, for
+    values_list() pages, by reading only the requested columns.
+
+    With a ``last_modified_field``, GET responses carry ETag / Last-Modified
+    validators built from that column, and a request whose If-None-Match /
+    If-Modified-Since still matches gets a 304 before anything is
+    serialized. A list only gets an ETag, from the count and the max of the
+    column: deleting a row leaves the max, hence Last-Modified, as it was.
+
+    Lists accept the filters of ``filter_fields`` (model field -> allowed
+    lookups) and ``?ordering=`` on ``ordering_fields`` (see
+    ListFilterQuerySerializer); ``filter_queryset()`` turns them into the
+    WHERE and ORDER BY of the list queryset, so declare only indexed columns.
+
+    Views whose ``get`` is wrapped in ``cached_get`` serve it from the
+    response cache; their writes pass the rows they change, before and/or
+    after the change, to ``invalidate_cached_responses()``.
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = StandardPagination
+    cursor_pagination_class = KeysetPagination
+    serializer_class = None
+    use_values_list = False
+    last_modified_field = None
+    validators = None
+    filter_fields = {}
+    ordering_fields = ()
+    cache_project_kwarg = 'projet_id'
+    stale_projects = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.sparse_fields = None
+        if request.method in ('GET', 'HEAD') and self.serializer_class is not None:
+            query = SparseFieldsQuerySerializer(
+                data=request.query_params,
+                context={'field_names': get_readable_field_names(self.serializer_class)}
+            )
+            query.is_valid(raise_exception=True)
+            self.sparse_fields = query.validated_data.get('fields')
+        self.list_filters, self.list_ordering = {}, []
+        if request.method in ('GET', 'HEAD') and (self.filter_fields or self.ordering_fields):
+            query = ListFilterQuerySerializer(data=request.query_params, context={
+                'model': self.serializer_class.Meta.model,
+                'filter_fields': self.filter_fields,
+                'ordering_fields': self.ordering_fields,
+                'keyset': isinstance(self.get_paginator(), KeysetPagination),
+            })
+            query.is_valid(raise_exception=True)
+            self.list_filters = query.validated_data['filters']
+            self.list_ordering = query.validated_data['ordering']
+
+    def handle_exception(self, exc):
+        if isinstance(exc, ValidationError):
+            return error_response('Invalid data', exc.detail)
+        return super().handle_exception(exc)
+
+    def invalidate_cached_responses(self, *instances):
+        """Marks the projects of ``instances`` as changed once the handler is done."""
+        self.stale_projects = set(self.stale_projects) | {get_project_id(instance) for instance in instances}
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.stale_projects:
+            response_cache.invalidate(self.stale_projects)
+        if self.validators and response.status_code in (200, 304):
+            etag, last_modified = self.validators
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            # Browsers must revalidate instead of guessing a freshness lifetime.
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_not_modified_response(self, *state, last_modified=None):
+        """
+        Sets the validators of the response, the ETag from ``state`` and
+        Last-Modified from ``last_modified`` when given, and returns a 304
+        response when the request's conditions match them. The ETag also
+        covers the query string and the renderer, which change the body as
+        well.
+        """
+        key = repr(state + (last_modified, sorted(self.request.query_params.lists()),
+                            self.request.accepted_renderer.format))
+        etag = 'W/"%s"' % hashlib.md5(key.encode()).hexdigest()
+        if last_modified is not None:
+            last_modified = timegm(last_modified.utctimetuple())
+        self.validators = (etag, last_modified)
+        return get_conditional_response(self.request, etag=etag, last_modified=last_modified)
+
+    def get_object_not_modified_response(self, instance):
+        return self.get_not_modified_response(instance.pk, last_modified=getattr(instance, self.last_modified_field))
+
+    def get_list_not_modified_response(self, queryset):
+        stats = queryset.order_by().aggregate(count=Count('pk'), last_modified=Max(self.last_modified_field))
+        return self.get_not_modified_response(stats['count'], stats['last_modified'])
+
+    def filter_queryset(self, queryset):
+        """Applies the request's filters and ordering; the primary key breaks ties."""
+        if self.list_filters:
+            queryset = queryset.filter(**self.list_filters)
+        if self.list_ordering:
+            ordering = list(self.list_ordering)
+            pk_name = queryset.model._meta.pk.name
+            if not {'pk', pk_name} & {field.lstrip('-') for field in ordering}:
+                ordering.append(('-' if ordering[0].startswith('-') else '') + pk_name)
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = self.serializer_class(*args, **kwargs)
+        if self.sparse_fields is not None:
+            fields = serializer.child.fields if kwargs.get('many') else serializer.fields
+            for name in [name for name in fields if name not in self.sparse_fields]:
+                fields.pop(name)
+        return serializer
+
+    def narrow_queryset(self, queryset):
+        """Loads only the columns of the requested fields (and the primary key and modification time)."""
+        if self.sparse_fields is None:
+            return queryset
+        columns = get_values_list_serializer(self.serializer_class, self.sparse_fields).columns
+        if self.last_modified_field:
+            columns = columns + [self.last_modified_field]
+        return queryset.only(*columns)
+
+    def get_paginator(self):
+        cursor_pagination_class = self.cursor_pagination_class
+        if cursor_pagination_class and cursor_pagination_class.cursor_query_param in self.request.query_params:
+            return cursor_pagination_class()
+        return self.pagination_class()
+
+    def paginate_queryset(self, queryset):
+        self.paginator = self.get_paginator()
+        return self.paginator.paginate_queryset(queryset, self.request, view=self)
+
+    def serialize_page(self, page):
+        if self.use_values_list:
+            return get_values_list_serializer(self.serializer_class, self.sparse_fields).to_representation(page)
+        return self.get_serializer(page, many=True).data
+
+    def get_paginated_list_response(self, queryset, message, **fields):
+        queryset = self.filter_queryset(queryset)
+        if self.last_modified_field:
+            not_modified = self.get_list_not_modified_response(queryset)
+            if not_modified is not None:
+                return not_modified
+        if self.use_values_list:
+            columns = get_values_list_serializer(self.serializer_class, self.sparse_fields).get_columns(queryset)
+            queryset = queryset.values_list(*columns, named=True)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            data = self.serialize_page(queryset)
+        else:
+            data = self.paginator.get_paginated_response(self.serialize_page(page)).data
+
+        return success_response(message, data, **fields)
@@ -0,0 +1,50 @@
+from rest_framework import status
+from ..models import Projet
+from ..financials import get_project_financials
+from ..serializers.project_summary_serializer import ProjectSummaryQuerySerializer, ProjectSummarySerializer
+from ..responses.api_response import error_response, success_response
+from .paginated_list_view import PaginatedListView
+
+
+class ProjectSummaryView(PaginatedListView):
+    """
+    Financial summary (AP, marches, invoiced and paid amounts) per project.
+
+    The page of projects is read first, then the totals of the whole page
+    come from one grouped query per table.
+    """
+    serializer_class = ProjectSummarySerializer
+
+    def get(self, request, pk=None):
+        query = ProjectSummaryQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return error_response('Invalid data', query.errors)
+        self.filters = query.validated_data
+
+        projets = Projet.objects.only('id_projet', 'nom_projet', 'statut')
+        if 'statut' in self.filters:
+            projets = projets.filter(statut=self.filters['statut'])
+
+        if pk:
+            return self.get_single_summary(projets, pk)
+        return self.get_paginated_list_response(projets.order_by('-id_projet'), 'Project summaries retrieved successfully')
+
+    def get_single_summary(self, projets, pk):
+        projet = projets.filter(pk=pk).first()
+        if not projet:
+            return error_response('Projet not found', status=status.HTTP_404_NOT_FOUND)
+
+        return success_response('Project summary retrieved successfully', self.serialize_page([projet])[0])
+
+    def serialize_page(self, page):
+        totals = get_project_financials(
+            [projet.id_projet for projet in page],
+            self.filters.get('date_from'),
+            self.filters.get('date_to')
+        )
+        summaries = [
+            dict(id_projet=projet.id_projet, nom_projet=projet.nom_projet, statut=projet.statut,
+                 **totals[projet.id_projet])
+            for projet in page
+        ]
+        return self.get_serializer(summaries, many=True).data
@@ -0,0 +1,27 @@
+from django.utils import timezone
+from ..models import Projet
+from ..schedule import get_delay_stats, get_project_timelines
+from ..serializers.project_timeline_serializer import DelayStatsSerializer, ProjectTimelineSerializer
+from .paginated_list_view import PaginatedListView
+
+
+class ProjectTimelineView(PaginatedListView):
+    """
+    Planned vs. actual milestone dates of each project and sous-projet, with
+    their delay in days, and slip statistics over the whole portfolio under
+    ``stats``.
+
+    A page of projects costs three queries (sous-projets, then the milestones
+    of each table) and the statistics four, however many milestones there
+    are: the delays are computed in SQL (see ``accounts.schedule``).
+    """
+    serializer_class = ProjectTimelineSerializer
+
+    def get(self, request):
+        self.today = timezone.localdate()
+        projets = Projet.objects.only('id_projet', 'nom_projet', 'statut').order_by('-id_projet')
+        stats = DelayStatsSerializer(get_delay_stats(self.today)).data
+        return self.get_paginated_list_response(projets, 'Project timelines retrieved successfully', stats=stats)
+
+    def serialize_page(self, page):
+        return self.get_serializer(get_project_timelines(page, self.today), many=True).data
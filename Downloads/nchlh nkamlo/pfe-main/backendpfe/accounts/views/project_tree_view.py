@@ -0,0 +1,46 @@
+from functools import partial
+
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from ..concurrency import run_concurrently
+from ..models import Projet
+from ..responses.api_response import error_response, success_response
+from ..serializers.project_tree_serializer import TREE_BRANCHES, ProjectTreeQuerySerializer, ProjectTreeSerializer
+
+
+class ProjectTreeView(APIView):
+    """
+    A project with its sous-projets, maitres d'ouvrage and d'oeuvre,
+    marches, documents and etats d'avancement in one response, for the
+    project detail screen.
+
+    The project is read with one query and every branch asked for with
+    ``?include=`` with one more, however many children there are; these
+    queries are independent, so they run concurrently (see
+    run_concurrently). Foreign keys are output as primary keys, so nothing
+    else is joined.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        query = ProjectTreeQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return error_response('Invalid data', query.errors)
+        include = query.validated_data['include']
+
+        projet, *branches = run_concurrently(
+            Projet.objects.filter(pk=pk).first,
+            *[partial(self.get_branch, name, pk) for name in include]
+        )
+        if not projet:
+            return error_response('Projet not found', status=status.HTTP_404_NOT_FOUND)
+        for name, rows in zip(include, branches):
+            setattr(projet, name, rows)
+
+        serializer = ProjectTreeSerializer(projet, include=include)
+        return success_response('Projet tree retrieved successfully', serializer.data)
+
+    def get_branch(self, name, pk):
+        branch = TREE_BRANCHES[name]
+        return list(branch.model.objects.filter(id_projet=pk).order_by(*branch.ordering))
@@ -0,0 +1,39 @@
+from django.db import router
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
+from ..models import SearchTerm
+from ..responses.api_response import error_response, success_response
+from ..search import load_hits, search
+from ..serializers.search_serializer import SearchQuerySerializer
+
+
+class SearchView(APIView):
+    """
+    Ranked full-text search across projets, sous-projets, incidents and
+    reunions (see ``accounts.search``). Pages carry ``next`` / ``previous``
+    links but no total count, which full-text indexes cannot give cheaply.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = SearchQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return error_response('Invalid data', query.errors)
+        params = query.validated_data
+
+        page, per_page = params['page'], params['per_page']
+        using = router.db_for_read(SearchTerm)
+        hits = search(params['q'], params['type'], (page - 1) * per_page, per_page, using)
+        data = {
+            'next': self.get_page_link(page + 1) if len(hits) > per_page else None,
+            'previous': self.get_page_link(page - 1) if page > 1 else None,
+            'results': load_hits(hits[:per_page], params['q'], using),
+        }
+        return success_response('Search results retrieved successfully', data)
+
+    def get_page_link(self, page):
+        url = self.request.build_absolute_uri()
+        if page == 1:
+            return remove_query_param(url, 'page')
+        return replace_query_param(url, 'page', page)
@@ -0,0 +1,38 @@
+from rest_framework import status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from ..importers import IMPORTERS, ImportFileError, read_rows
+from ..responses.api_response import api_response, error_response
+
+
+class SpreadsheetImportView(APIView):
+    """
+    Imports the factures or marches of an uploaded CSV / XLSX file (field
+    ``file``). The file is read and written in chunks; valid rows are
+    imported even when others are rejected, and the response reports the
+    rejected rows by line number (see ``import_spreadsheet`` for a full
+    error file on large imports).
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, kind):
+        upload = request.FILES.get('file')
+        if kind not in IMPORTERS or upload is None:
+            return error_response(
+                'Invalid data', {'file': ['A CSV or XLSX file of %s is required.' % ' or '.join(IMPORTERS)]}
+            )
+
+        importer = IMPORTERS[kind]()
+        try:
+            report = importer.run(read_rows(upload.file, upload.name))
+        except ImportFileError as exc:
+            return error_response(str(exc))
+
+        return api_response(
+            not report.error_count,
+            '%d rows imported, %d rejected' % (report.imported, report.error_count),
+            status.HTTP_207_MULTI_STATUS if report.error_count else status.HTTP_201_CREATED,
+            data=report.as_dict()
+        )
@@ -1,30 +1,23 @@
 from rest_framework import status
-from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.views import APIView
-from rest_framework.pagination import PageNumberPagination
 from ..models import SousProjet
 from ..serializers.sub_project_serializer import SousProjetSerializer
-from ..responses.success_api_response import SuccessAPIResponse
-from ..responses.error_api_response import ErrorAPIResponse
-
-class SubProjectPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'per_page'
-    page_query_param = 'page'
-    max_page_size = 100
-
-class SubProjectView(APIView):
-    permission_classes = [IsAuthenticated]
-    pagination_class = SubProjectPagination
-
-    def get_paginated_response(self, data):
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(data, self.request)
-        if page is not None:
-            return paginator.get_paginated_response(page)
-        return Response(data)
-
+from ..response_cache import cached_get
+from ..responses.api_response import error_response, success_response
+from .bulk_write_mixin import BulkWriteMixin
+from .paginated_list_view import PaginatedListView
+
+class SubProjectView(BulkWriteMixin, PaginatedListView):
+    serializer_class = SousProjetSerializer
+    use_values_list = True
+    last_modified_field = 'updated_at'
+    filter_fields = {
+        'statut_sous_projet': ['exact', 'in'],
+        'date_finsousprojet': ['gte', 'lte'],
+        'id_utilisateur': ['exact'],
+    }
+    ordering_fields = ('id_sous_projet', 'statut_sous_projet', 'date_finsousprojet')
+
+    @cached_get
     def get(self, request, projet_id=None, pk=None):
         if projet_id:
             return self.get_sub_projects_by_project(request, projet_id)
@@ -37,96 +30,65 @@ class SubProjectView(APIView):
     def get_single_sub_project(self, request, pk):
         sous_projet = self.get_object(pk)
         if not sous_projet:
-            return Response({
-                'success': False,
-                'message': 'SousProjet not found'
-            }, status=status.HTTP_404_NOT_FOUND)
-
-        serializer = SousProjetSerializer(sous_projet)
-        return Response({
-            'success': True,
-            'message': 'SousProjet retrieved successfully',
-            'data': serializer.data
-        }, status=status.HTTP_200_OK)
+            return error_response('SousProjet not found', status=status.HTTP_404_NOT_FOUND)
+
+        not_modified = self.get_object_not_modified_response(sous_projet)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(sous_projet)
+        return success_response('SousProjet retrieved successfully', serializer.data)
 
     def get_all_sub_projects(self):
-        sous_projets = SousProjet.objects.all()
-        serializer = SousProjetSerializer(sous_projets, many=True)
-        return Response({
-            'success': True,
-            'message': 'SousProjets retrieved successfully',
-            'data': serializer.data
-        }, status=status.HTTP_200_OK)
+        sous_projets = SousProjet.objects.all().order_by('id_sous_projet')
+        return self.get_paginated_list_response(sous_projets, 'SousProjets retrieved successfully')
 
     def post(self, request):
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
+
         serializer = SousProjetSerializer(data=request.data)
         if serializer.is_valid():
             sous_projet = serializer.save()
-            return Response({
-                'success': True,
-                'message': 'SousProjet created successfully',
-                'data': SousProjetSerializer(sous_projet).data
-            }, status=status.HTTP_201_CREATED)
-
-        return Response({
-            'success': False,
-            'message': 'Invalid data',
-            'errors': serializer.errors
-        }, status=status.HTTP_400_BAD_REQUEST)
-
-    def put(self, request, pk):
+            self.invalidate_cached_responses(sous_projet)
+            return success_response(
+                'SousProjet created successfully', SousProjetSerializer(sous_projet).data, status=status.HTTP_201_CREATED
+            )
+
+        return error_response('Invalid data', serializer.errors)
+
+    def put(self, request, pk=None):
+        if pk is None:
+            return self.bulk_update(request)
+
         sous_projet = self.get_object(pk)
         if not sous_projet:
-            return Response({
-                'success': False,
-                'message': 'SousProjet not found'
-            }, status=status.HTTP_404_NOT_FOUND)
+            return error_response('SousProjet not found', status=status.HTTP_404_NOT_FOUND)
 
         serializer = SousProjetSerializer(sous_projet, data=request.data)
         if serializer.is_valid():
+            self.invalidate_cached_responses(sous_projet)
             sous_projet = serializer.save()
-            return Response({
-                'success': True,
-                'message': 'SousProjet updated successfully',
-                'data': SousProjetSerializer(sous_projet).data
-            }, status=status.HTTP_200_OK)
-
-        return Response({
-            'success': False,
-            'message': 'Invalid data',
-            'errors': serializer.errors
-        }, status=status.HTTP_400_BAD_REQUEST)
+            self.invalidate_cached_responses(sous_projet)
+            return success_response('SousProjet updated successfully', SousProjetSerializer(sous_projet).data)
+
+        return error_response('Invalid data', serializer.errors)
 
     def delete(self, request, pk):
         sous_projet = self.get_object(pk)
         if not sous_projet:
-            return Response({
-                'success': False,
-                'message': 'SousProjet not found'
-            }, status=status.HTTP_404_NOT_FOUND)
+            return error_response('SousProjet not found', status=status.HTTP_404_NOT_FOUND)
 
+        self.invalidate_cached_responses(sous_projet)
         sous_projet.delete()
-        return Response({
-            'success': True,
-            'message': 'SousProjet deleted successfully'
-        }, status=status.HTTP_204_NO_CONTENT)
+        return success_response('SousProjet deleted successfully', status=status.HTTP_204_NO_CONTENT)
 
     def get_sub_projects_by_project(self, request, projet_id):
-        sous_projets = SousProjet.objects.filter(id_projet=projet_id)
-        serializer = SousProjetSerializer(sous_projets, many=True)
-        
-        paginated_response = self.get_paginated_response(serializer.data)
-        if isinstance(paginated_response, Response):
-            return Response({
-                'success': True,
-                'message': 'SousProjets retrieved successfully',
-                'data': paginated_response.data
-            }, status=status.HTTP_200_OK)
-        
-        return paginated_response
+        sous_projets = SousProjet.objects.filter(id_projet=projet_id).order_by('id_sous_projet')
+        return self.get_paginated_list_response(sous_projets, 'SousProjets retrieved successfully')
 
     def get_object(self, pk):
         try:
-            return SousProjet.objects.get(pk=pk)
+            return self.narrow_queryset(SousProjet.objects.all()).get(pk=pk)
         except SousProjet.DoesNotExist:
             return None
\ No newline at end of file
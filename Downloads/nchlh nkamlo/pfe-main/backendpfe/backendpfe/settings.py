@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -53,15 +54,55 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),     
     'ROTATE_REFRESH_TOKENS': True,                   
     'BLACKLIST_AFTER_ROTATION': True,                
+    'USER_ID_FIELD': 'id_utilisateur',
 }
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'accounts.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'accounts.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Decimals are formatted by FastJSONRenderer (see its ?money= formats).
+    # Any other JSON rendering must use accounts.renderers.MoneyJSONRenderer,
+    # as the stock JSONRenderer writes Decimals as floats.
+    'COERCE_DECIMAL_TO_STRING': False,
 }
 
+# Users resolved from a JWT are cached this many seconds, in process and, if
+# AUTH_USER_CACHE_ALIAS names an entry of CACHES (e.g. Redis), in that cache
+# shared by all the workers.
+AUTH_USER_CACHE_TTL = 60
+AUTH_USER_CACHE_SIZE = 1024
+AUTH_USER_CACHE_ALIAS = None
+
+# GET responses of the project, sous-projet and maitre d'ouvrage/d'oeuvre
+# views are cached for RESPONSE_CACHE_TTL seconds in this entry of CACHES
+# (None disables it). It must be a cache shared by all the workers (Redis,
+# Memcached): a system check rejects the per-process local-memory one.
+RESPONSE_CACHE_ALIAS = None
+RESPONSE_CACHE_TTL = 300
+
+# The read endpoints are served by async views, which run them in a thread
+# pool instead of the single thread Django 3.2 gives the sync views of an
+# ASGI server. asgi.py turns this on; WSGI workers have no use for it.
+ASYNC_READ_VIEWS = os.environ.get('DJANGO_ASYNC_READ_VIEWS') == '1'
+
+# Share of the requests whose latency, queries and response size are
+# recorded by accounts.metrics.MetricsMiddleware (0 turns it off). They are
+# served to Prometheus at /api/metrics/ with METRICS_TOKEN as bearer token.
+METRICS_SAMPLE_RATE = 1.0
+METRICS_TOKEN = os.environ.get('DJANGO_METRICS_TOKEN')
+
 MIDDLEWARE = [
+    "accounts.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -70,6 +111,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "accounts.database.PrimaryPinningMiddleware",
 ]
 CORS_ALLOW_ALL_ORIGINS = True 
 ROOT_URLCONF = "backendpfe.urls"
@@ -91,6 +133,8 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "backendpfe.wsgi.application"
 
+TEST_RUNNER = 'accounts.test_runner.UnmanagedModelTestRunner'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -103,9 +147,23 @@ DATABASES = {
         'PASSWORD': 'sarasarsora1234',
         'HOST': 'localhost',
         'PORT': '3306',
+        # Keep connections open between requests instead of reconnecting
+        # (TCP + auth) for each one, and ping them before reuse (see
+        # accounts.database.close_unusable_connections). Keep it below
+        # MySQL's wait_timeout.
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Reads of the accounts models go to this alias of DATABASES, a read replica
+# of 'default', until the request writes (see accounts.database). None reads
+# from 'default'. To try it locally, point 'default' and 'replica' at two
+# SQLite files and copy the first into the second.
+READ_REPLICA_ALIAS = None
+
+DATABASE_ROUTERS = ['accounts.database.PrimaryReplicaRouter']
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
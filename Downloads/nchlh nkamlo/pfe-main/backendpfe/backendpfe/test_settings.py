@@ -0,0 +1,22 @@
+"""
+Runs the test suite on SQLite, without a MySQL server:
+
+    python manage.py test accounts --settings=backendpfe.test_settings
+
+'replica' is a database of its own, not a mirror of 'default', so that the
+tests of accounts.database can read from a replica that has not caught up
+with a write. Reads only go to it in the tests that set READ_REPLICA_ALIAS.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'primary.sqlite3',
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'replica.sqlite3',
+    },
+}
@@ -0,0 +1,316 @@
+"""
+Latency, throughput and queries per request of every read route of
+accounts/urls.py, written to JSON and compared with an earlier run.
+
+    python benchmarks/endpoints.py [--scale 0.02] [--requests 200] [--concurrency 8] \\
+        [--route project-list-create ...] [--response-cache] [--url http://127.0.0.1:8000 [--duration 10]] \\
+        [--output results.json] [--compare baseline.json] [--threshold 0.25]
+
+By default the app runs in-process against a throwaway test database (set
+up by the project's TEST_RUNNER, never the configured one) filled by
+``manage.py seed`` at ``--scale`` from a fixed seed, so two runs of the
+same commit on the same machine see the same data. Each route gets
+``--requests`` requests through APIClient (the Django test client), with
+no socket, HTTP parsing or application server, after a few warm-up
+requests per thread. With ``--concurrency`` above 1 the threads share one
+GIL with the app: these numbers compare commits with each other, as the
+cost of the views, serializers and queries, not the throughput of a
+deployment.
+
+With ``--url``, the routes are loaded over HTTP by benchmarks/loadtest.py
+instead: ``--concurrency`` connections for ``--duration`` seconds per
+route, after one second of warm-up. Serve the configured database, seeded
+the same way, with the production server and settings first, e.g.
+
+    python manage.py seed --scale 0.02 --seed 0
+    gunicorn backendpfe.wsgi -w 4 --threads 16 -b 127.0.0.1:8000
+
+The route ids are read from that database and the bench user is added to
+it. Queries per request are not known from outside the server, and the
+login route is left out (loadtest only sends GET requests; login mostly
+measures the password hasher anyway).
+
+Requests are authenticated with a JWT access token, as the frontend sends
+them. ``--compare`` prints the change of every route against an earlier
+``--output`` of the same mode and exits with status 1 when one regressed:
+p95 latency up or requests per second down by more than ``--threshold``,
+or any more queries per request. The import route is left out, it writes,
+and so is metrics. Queries that run_concurrently sends from threads of its
+own (the tree view) are not counted.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backendpfe.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import close_old_connections, connection  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from django.test.utils import get_runner, override_settings  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+from accounts.models import MaitreDoeuve, MaitreOuvrage, SousProjet, Utilisateur  # noqa: E402
+from accounts.urls import urlpatterns  # noqa: E402
+from loadtest import load  # noqa: E402
+
+PASSWORD = 'benchmark'
+
+# (url name, method, path, data); the path is formatted with the ids of a
+# seeded projet, sous-projet, maitre d'ouvrage and maitre d'oeuvre (see
+# get_route_ids).
+ROUTES = [
+    ('auth', 'post', '/api/auth/', {'action': 'login', 'email': 'bench@example.com', 'password': PASSWORD}),
+    ('project_view', 'get', '/api/sub-project', None),
+    ('project-list-create', 'get', '/api/projects/', None),
+    ('project-detail', 'get', '/api/projects/{projet}/', None),
+    ('project-summary', 'get', '/api/projects/summary/', None),
+    ('project-summary-detail', 'get', '/api/projects/{projet}/summary/', None),
+    ('project-timeline', 'get', '/api/projects/timeline/', None),
+    ('project-tree', 'get', '/api/projects/{projet}/tree/', None),
+    ('sous_projet_list', 'get', '/api/sous-projet/', None),
+    ('sous_projet_detail', 'get', '/api/sous-projet/{sous_projet}/', None),
+    ('sous_projet_by_project', 'get', '/api/sous-projet/projet/{projet}/', None),
+    ('maitre_ouvrage_list', 'get', '/api/maitre-ouvrage/', None),
+    ('maitre_ouvrage_detail', 'get', '/api/maitre-ouvrage/{maitre_ouvrage}/', None),
+    ('maitre_ouvrage_by_project', 'get', '/api/maitre-ouvrage/projet/{projet}/', None),
+    ('maitre-doeuvre-list', 'get', '/api/maitre-doeuvre/', None),
+    ('maitre-doeuvre-detail', 'get', '/api/maitre-doeuvre/{maitre_doeuvre}/', None),
+    ('maitre-doeuvre-by-project', 'get', '/api/maitre-doeuvre/projet/{projet}/', None),
+    ('facture-export', 'get', '/api/factures/export/?projet={projet}', None),
+    ('search', 'get', '/api/search/?q=travaux', None),
+]
+SKIPPED_ROUTES = {'spreadsheet-import', 'metrics'}
+
+
+def get_route_ids():
+    """The ids the routes are formatted with: the projet with the most sous-projets and its children."""
+    projet = SousProjet.objects.values('id_projet').annotate(rows=Count('pk')).order_by('-rows', 'id_projet')[0]['id_projet']
+    return {
+        'projet': projet,
+        'sous_projet': SousProjet.objects.filter(id_projet=projet).values_list('pk', flat=True).first(),
+        'maitre_ouvrage': MaitreOuvrage.objects.values_list('pk', flat=True).first(),
+        'maitre_doeuvre': MaitreDoeuve.objects.values_list('pk', flat=True).first(),
+    }
+
+
+def timed_request(client, method, path, data):
+    """(seconds, status code, number of queries) of one request, including streaming the body."""
+    connection.queries_log.clear()
+    started = time.perf_counter()
+    response = getattr(client, method)(path, data)
+    if response.streaming:
+        b''.join(response.streaming_content)
+    elapsed = time.perf_counter() - started
+    return elapsed, response.status_code, len(connection.queries_log)
+
+
+def run_worker(token, method, path, data, count, warmup):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Bearer %s' % token)
+    connection.force_debug_cursor = True  # Logs this thread's queries, whatever DEBUG is.
+    try:
+        for _ in range(warmup):
+            timed_request(client, method, path, data)
+        started = time.perf_counter()
+        samples = [timed_request(client, method, path, data) for _ in range(count)]
+        return samples, started, time.perf_counter()
+    finally:
+        connection.force_debug_cursor = False
+        close_old_connections()
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100.0))]
+
+
+def benchmark_route(token, method, path, data, requests, concurrency, warmup):
+    counts = [requests // concurrency + (1 if worker < requests % concurrency else 0) for worker in range(concurrency)]
+    with ThreadPoolExecutor(concurrency) as executor:
+        futures = [
+            executor.submit(run_worker, token, method, path, data, count, warmup) for count in counts if count
+        ]
+        workers = [future.result() for future in futures]
+    samples = [sample for worker_samples, _, _ in workers for sample in worker_samples]
+    duration = max(finished for _, _, finished in workers) - min(started for _, started, _ in workers)
+
+    latencies = [elapsed for elapsed, _, _ in samples]
+    return {
+        'path': path,
+        'requests': len(samples),
+        'errors': sum(1 for _, status, _ in samples if status >= 400),
+        'requests_per_second': round(len(samples) / duration, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'queries_per_request': round(sum(queries for _, _, queries in samples) / len(samples), 2),
+    }
+
+
+def benchmark_url(url, token, path, clients, duration):
+    """The results of ``path`` loaded over HTTP, as benchmark_route() gives them."""
+    asyncio.run(load(url, [path], token, clients, 1))  # Warm-up.
+    result = asyncio.run(load(url, [path], token, clients, duration))
+    return {
+        'path': path,
+        'requests': result['requests'],
+        'errors': result['errors'] + result['requests'] - result['ok'],
+        'requests_per_second': result['requests_per_second'],
+        'p50_ms': result['p50_ms'],
+        'p95_ms': result['p95_ms'],
+        'p99_ms': result['p99_ms'],
+        'queries_per_request': None,
+    }
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Prints the change of every route against ``baseline``; returns the names of those that regressed."""
+    regressions = []
+    print('\n%-28s %10s %10s %10s' % ('vs baseline', 'p95', 'req/s', 'queries'))
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            print('%-28s %10s' % (name, 'new'))
+            continue
+        p95 = result['p95_ms'] / before['p95_ms'] - 1 if before['p95_ms'] else 0
+        rps = result['requests_per_second'] / before['requests_per_second'] - 1 if before['requests_per_second'] else 0
+        queries = 0
+        if result['queries_per_request'] is not None and before['queries_per_request'] is not None:
+            queries = result['queries_per_request'] - before['queries_per_request']
+        regressed = p95 > threshold or rps < -threshold or queries > 0
+        if regressed:
+            regressions.append(name)
+        print('%-28s %+9.0f%% %+9.0f%% %+10.2f%s' % (name, p95 * 100, rps * 100, queries, '  REGRESSION' if regressed else ''))
+    return regressions
+
+
+def run_routes(routes, ids, measure):
+    """Measures every route with ``measure(method, path, data)``, printing the results as they come."""
+    results = {}
+    print('%-28s %9s %8s %8s %8s %8s %7s' % ('route', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'queries', 'errors'))
+    for name, method, path, data in routes:
+        result = results[name] = measure(method, path.format(**ids), data)
+        queries = result['queries_per_request']
+        print('%-28s %9.1f %8s %8s %8s %8s %7d' % (
+            name, result['requests_per_second'], result['p50_ms'], result['p95_ms'], result['p99_ms'],
+            '-' if queries is None else '%.2f' % queries, result['errors']))
+    return results
+
+
+def get_token():
+    user = Utilisateur.objects.filter(email='bench@example.com').first()
+    if user is None:
+        user = Utilisateur.objects.create_user('bench@example.com', PASSWORD, nom='Bench', role_de_utilisateur='admin')
+    return str(AccessToken.for_user(user))
+
+
+def run_in_process(args, routes):
+    runner = get_runner(settings)(verbosity=0)
+    runner.setup_test_environment()  # Lets the test client in (ALLOWED_HOSTS).
+    old_config = runner.setup_databases()
+    cache_settings = override_settings(RESPONSE_CACHE_ALIAS='default' if args.response_cache else None)
+    cache_settings.enable()
+    try:
+        call_command('seed', scale=args.scale, seed=args.seed, stdout=StringIO())
+        token = get_token()
+        return run_routes(routes, get_route_ids(), lambda method, path, data: benchmark_route(
+            token, method, path, data, args.requests, args.concurrency, args.warmup))
+    finally:
+        cache_settings.disable()
+        runner.teardown_databases(old_config)
+        runner.teardown_test_environment()
+
+
+def run_over_http(args, routes):
+    if not SousProjet.objects.exists():
+        sys.exit('The database of the server is empty: run manage.py seed first')
+    token = get_token()
+    return run_routes([route for route in routes if route[1] == 'get'], get_route_ids(), lambda method, path, data: (
+        benchmark_url(args.url, token, path, args.concurrency, args.duration)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scale', type=float, default=0.02, help='Dataset size, see manage.py seed')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per route (in-process)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=2, help='Unmeasured requests per thread and route')
+    parser.add_argument('--route', action='append', dest='routes', metavar='NAME',
+                        help='URL name of a route to run (repeatable, default all)')
+    parser.add_argument('--response-cache', action='store_true', help='Measure with the response cache on (in-process)')
+    parser.add_argument('--url', help='Load this running server over HTTP instead')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per route (with --url)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--compare', metavar='BASELINE', help='JSON file of an earlier --output')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    args = parser.parse_args()
+
+    uncovered = {pattern.name for pattern in urlpatterns} - {route[0] for route in ROUTES} - SKIPPED_ROUTES
+    if uncovered:
+        print('Not benchmarked: %s' % ', '.join(sorted(uncovered)), file=sys.stderr)
+    routes = [route for route in ROUTES if not args.routes or route[0] in args.routes]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if bool(baseline['meta'].get('url')) != bool(args.url):
+            sys.exit('%s was not measured the same way (in-process or over HTTP)' % args.compare)
+
+    results = run_over_http(args, routes) if args.url else run_in_process(args, routes)
+
+    report = {
+        'meta': {
+            'commit': get_commit(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'scale': args.scale,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'response_cache': args.response_cache,
+            'url': args.url,
+            'duration': args.duration if args.url else None,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+    if baseline:
+        regressions = compare(results, baseline['results'], args.threshold)
+        if regressions:
+            print('\nRegressed: %s' % ', '.join(regressions))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Per-response cost of the API envelope: the former SuccessAPIResponse /
+ErrorAPIResponse serializers against accounts.responses.api_response.
+
+    python benchmarks/envelope.py [--number 100000]
+
+No database is needed. Both variants wrap the same payload and build the
+DRF ``Response``; rendering is left out since it is identical.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backendpfe.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework import serializers, status  # noqa: E402
+from rest_framework.response import Response  # noqa: E402
+from accounts.responses.api_response import error_response, success_response  # noqa: E402
+
+
+# The envelope serializers as they were before accounts.responses.api_response.
+class SuccessAPIResponse(serializers.Serializer):
+    success = serializers.BooleanField(default=True)
+    message = serializers.CharField()
+    data = serializers.SerializerMethodField()
+
+    def get_data(self, obj):
+        if isinstance(obj, list):
+            return obj
+        return obj
+
+
+class ErrorAPIResponse(serializers.Serializer):
+    success = serializers.BooleanField(default=False)
+    message = serializers.CharField(default=None)
+    error_code = serializers.IntegerField(required=False)
+
+
+PAYLOAD = {'id_utilisateur': 1, 'email': 'admin@example.com', 'nom': 'Admin', 'role_de_utilisateur': 'admin'}
+
+CASES = [
+    ('success, before', lambda: Response(SuccessAPIResponse({'message': 'OK', 'user': PAYLOAD}).data)),
+    ('success, after', lambda: success_response('OK', PAYLOAD)),
+    ('error, before', lambda: Response(ErrorAPIResponse({'error': 'Permission denied'}).data,
+                                       status=status.HTTP_403_FORBIDDEN)),
+    ('error, after', lambda: error_response('Permission denied', status=status.HTTP_403_FORBIDDEN)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--number', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for name, build in CASES:
+        best = min(timeit.repeat(build, number=args.number, repeat=args.repeat))
+        print('%-16s %8.2f us/response' % (name, best / args.number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
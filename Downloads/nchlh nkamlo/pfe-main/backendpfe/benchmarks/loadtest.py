@@ -0,0 +1,156 @@
+"""
+Throughput of a running server under many concurrent clients, to compare
+the WSGI and the ASGI deployment of the API.
+
+    python benchmarks/loadtest.py --token <JWT> \\
+        --target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001 \\
+        [--clients 500] [--duration 30] [--path /api/projects/ ...]
+
+Start the servers first, on the same database and with the same number of
+processes, e.g.
+
+    gunicorn backendpfe.wsgi -w 4 --threads 16 -b 127.0.0.1:8000
+    uvicorn backendpfe.asgi:application --workers 4 --port 8001
+
+(backendpfe/asgi.py serves the read endpoints with async views, see
+ASYNC_READ_VIEWS.) Each client keeps one HTTP/1.1 connection open and sends
+its requests one after the other, cycling through the paths. Only the
+standard library is used, so the client itself needs no install.
+"""
+import argparse
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+
+    def add(self, status, latency):
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.latencies.append(latency)
+
+    def percentile(self, percent):
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100.0))]
+
+    def summary(self, duration):
+        ok = sum(count for status, count in self.statuses.items() if 200 <= status < 400)
+        return {
+            'requests': len(self.latencies),
+            'ok': ok,
+            'errors': self.errors,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'requests_per_second': round(ok / duration, 1),
+            'p50_ms': self.round_ms(self.percentile(50)),
+            'p90_ms': self.round_ms(self.percentile(90)),
+            'p95_ms': self.round_ms(self.percentile(95)),
+            'p99_ms': self.round_ms(self.percentile(99)),
+        }
+
+    @staticmethod
+    def round_ms(seconds):
+        return None if seconds is None else round(seconds * 1000, 1)
+
+
+async def read_response(reader):
+    """Reads one response off ``reader``; returns its status code."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Connection closed by the server')
+    status = int(status_line.split()[1])
+    length, chunked, close = 0, False, False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding' and 'chunked' in value:
+            chunked = True
+        elif name == 'connection' and value == 'close':
+            close = True
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length:
+        await reader.readexactly(length)
+    return status, close
+
+
+async def run_client(url, paths, headers, deadline, stats):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    requests = [
+        ('GET %s HTTP/1.1\r\nHost: %s\r\n%s\r\n' % (path, parts.netloc, headers)).encode('latin-1')
+        for path in paths
+    ]
+    writer = None
+    index = 0
+    while time.monotonic() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.monotonic()
+            writer.write(requests[index % len(requests)])
+            await writer.drain()
+            status, close = await read_response(reader)
+            stats.add(status, time.monotonic() - started)
+            index += 1
+            if close:
+                writer.close()
+                writer = None
+        except (OSError, ConnectionError, ValueError, IndexError, asyncio.IncompleteReadError):
+            stats.errors += 1
+            if writer is not None:
+                writer.close()
+                writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+
+async def load(url, paths, token, clients, duration):
+    headers = 'Accept: application/json\r\n'
+    if token:
+        headers += 'Authorization: Bearer %s\r\n' % token
+    stats = Stats()
+    started = time.monotonic()
+    deadline = started + duration
+    await asyncio.gather(*[run_client(url, paths, headers, deadline, stats) for _ in range(clients)])
+    return stats.summary(time.monotonic() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--target', action='append', required=True, metavar='NAME=URL',
+                        help='Server to load, e.g. wsgi=http://127.0.0.1:8000 (repeatable)')
+    parser.add_argument('--path', action='append', dest='paths', metavar='PATH',
+                        help='Path to request (repeatable, default /api/projects/)')
+    parser.add_argument('--token', help='JWT access token sent as a Bearer token')
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--duration', type=float, default=30, help='Seconds per target')
+    args = parser.parse_args()
+
+    paths = args.paths or ['/api/projects/']
+    print('%-8s %9s %8s %8s %8s %8s %7s' % ('target', 'req/s', 'p50 ms', 'p90 ms', 'p99 ms', 'requests', 'errors'))
+    for target in args.target:
+        name, _, url = target.partition('=')
+        result = asyncio.run(load(url, paths, args.token, args.clients, args.duration))
+        print('%-8s %9.1f %8s %8s %8s %8d %7d' % (
+            name, result['requests_per_second'], result['p50_ms'], result['p90_ms'], result['p99_ms'],
+            result['requests'], result['errors'] + result['requests'] - result['ok']))
+
+
+if __name__ == '__main__':
+    main()
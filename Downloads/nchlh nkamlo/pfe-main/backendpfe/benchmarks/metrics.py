@@ -0,0 +1,68 @@
+"""
+Overhead of MetricsMiddleware per request, and of its query counter per
+query, at a few sample rates.
+
+    python benchmarks/metrics.py [--requests 200000]
+
+The middleware wraps a view that returns a prebuilt response, so only its
+own work is timed; the query counter wraps a no-op execute. No database
+is needed.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backendpfe.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.http import HttpResponse  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import resolve  # noqa: E402
+from accounts.metrics import MetricsMiddleware, count_query, current_queries, endpoint_metrics  # noqa: E402
+
+
+def time_per_call(function, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - started) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=200000)
+    args = parser.parse_args()
+
+    request = RequestFactory().get('/api/projects/')
+    request.resolver_match = resolve('/api/projects/')
+    response = HttpResponse(b'{"success":true}' * 64, content_type='application/json')
+
+    def view(request):
+        return response
+
+    baseline = time_per_call(lambda: view(request), args.requests)
+    for rate in (1.0, 0.1, 0.01):
+        with override_settings(METRICS_SAMPLE_RATE=rate):
+            middleware = MetricsMiddleware(view)
+        overhead = time_per_call(lambda: middleware(request), args.requests) - baseline
+        print('sample rate %-5s %6.2f us per request' % (rate, overhead * 1e6))
+
+    def execute(sql, params, many, context):
+        return None
+
+    token = current_queries.set([0, 0.0])
+    overhead = time_per_call(lambda: count_query(execute, 'SELECT 1', (), False, {}), args.requests)
+    overhead -= time_per_call(lambda: execute('SELECT 1', (), False, {}), args.requests)
+    current_queries.reset(token)
+    print('query counter     %6.2f us per query' % (overhead * 1e6))
+    endpoint_metrics.reset()
+
+
+if __name__ == '__main__':
+    main()
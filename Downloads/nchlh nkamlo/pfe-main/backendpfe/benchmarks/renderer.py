@@ -0,0 +1,93 @@
+"""
+Render time and payload size of a list of invoices: DRF's JSONRenderer
+(money pre-formatted as strings by DecimalField) against FastJSONRenderer
+in each ?money= format.
+
+    python benchmarks/renderer.py [--rows 10000]
+
+No database is needed: the rows have the shape of a serialized Facture.
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import date, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backendpfe.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from accounts.renderers import MONEY_CONTEXT, FastJSONRenderer  # noqa: E402
+
+MONEY_PLACES = Decimal('1e-30')
+
+
+def make_invoices(rows):
+    invoices = []
+    for index in range(rows):
+        ht = (Decimal(index % 5000) * Decimal('1013.37')).quantize(MONEY_PLACES, context=MONEY_CONTEXT)
+        invoices.append({
+            'id_facture': index + 1,
+            'numero_facture': 100000 + index,
+            'designation': 'Travaux de terrassement lot %d' % (index % 40),
+            'date_facturation': (date(2024, 1, 1) + timedelta(days=index % 365)).isoformat(),
+            'date_reception': None,
+            'brut_ht': ht,
+            'montant_net_ht': ht,
+            'montant_tva': (ht * Decimal('0.19')).quantize(MONEY_PLACES, context=MONEY_CONTEXT),
+            'montant_ttc': (ht * Decimal('1.19')).quantize(MONEY_PLACES, context=MONEY_CONTEXT),
+            'date_ordre_virement': None,
+            'numero_ordre_virement': None,
+            'id_projet': index % 50 + 1,
+            'id_sous_projet': None,
+            'id_marche': index % 300 + 1,
+            'id_ap': None,
+            'id_md': None,
+        })
+    return invoices
+
+
+def as_drf_strings(invoices):
+    return [{key: format(value, 'f') if isinstance(value, Decimal) else value for key, value in row.items()}
+            for row in invoices]
+
+
+def renderer_context(money=None):
+    path = '/api/factures/' + ('?money=%s' % money if money else '')
+    return {'request': Request(APIRequestFactory().get(path))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    invoices = make_invoices(args.rows)
+    payload = {'success': True, 'message': 'Factures', 'data': invoices}
+    drf_payload = {'success': True, 'message': 'Factures', 'data': as_drf_strings(invoices)}
+
+    cases = [
+        ('JSONRenderer', JSONRenderer(), drf_payload, {}),
+        # orjson alone, on the same pre-formatted strings as JSONRenderer.
+        ('FastJSON strings', FastJSONRenderer(), drf_payload, {}),
+    ]
+    for money in ('exact', 'compact', 'rounded'):
+        cases.append(('FastJSON %s' % money, FastJSONRenderer(), payload, renderer_context(money)))
+
+    print('%d invoices' % args.rows)
+    for name, renderer, data, context in cases:
+        best = min(timeit.repeat(lambda: renderer.render(data, None, context), number=1, repeat=args.repeat))
+        size = len(renderer.render(data, None, context))
+        print('%-18s %8.1f ms %10.1f KiB' % (name, best * 1000, size / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+/api/search/ ranking and loading time over a synthetic corpus of
+sous-projet descriptions.
+
+    python benchmarks/search.py [--docs 100000] [--words 20]
+
+The documents are created in a throwaway test database (set up by the
+project's TEST_RUNNER), never in the configured one. On MySQL the FULLTEXT
+index is created as in migration 0006; elsewhere the search_term inverted
+index is built with rebuild_search_index.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backendpfe.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import get_runner  # noqa: E402
+from accounts.models import SousProjet  # noqa: E402
+from accounts.search import SEARCH_SOURCES, load_hits, rebuild_search_index, search, uses_fulltext  # noqa: E402
+
+SYLLABLES = ['ba', 'ton', 'rou', 'te', 'pont', 'ca', 'nal', 'ter', 'ras', 'se', 'ment', 'lot', 'vi', 'ra', 'ge']
+
+
+def make_vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def create_documents(count, words_per_doc, vocabulary, rng):
+    # Zipf-like: a few words are very common, most are rare.
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    batch = []
+    for index in range(count):
+        batch.append(SousProjet(
+            nom_sous_projet='Lot %d' % index, date_debut_sousprojet=date(2024, 1, 1),
+            date_finsousprojet=date(2024, 6, 30), statut_sous_projet='en cours',
+            description_sous_projet=' '.join(rng.choices(vocabulary, weights, k=words_per_doc)),
+        ))
+        if len(batch) == 5000:
+            SousProjet.objects.bulk_create(batch)
+            batch = []
+    SousProjet.objects.bulk_create(batch)
+
+
+def time_query(query, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        hits = search(query, list(SEARCH_SOURCES), 0, 10)
+        load_hits(hits[:10], query)
+        timings.append(time.perf_counter() - started)
+    return min(timings), len(hits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--docs', type=int, default=100000)
+    parser.add_argument('--words', type=int, default=20, help='Words per document')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    runner = get_runner(settings)(verbosity=0)
+    old_config = runner.setup_databases()
+    try:
+        rng = random.Random(42)
+        vocabulary = make_vocabulary(5000, rng)
+        started = time.perf_counter()
+        create_documents(args.docs, args.words, vocabulary, rng)
+        if uses_fulltext('default'):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'CREATE FULLTEXT INDEX sous_projet_description_ft ON sous_projet (description_sous_projet)')
+        else:
+            rebuild_search_index()
+        print('%d documents indexed in %.1f s' % (args.docs, time.perf_counter() - started))
+
+        queries = {
+            'common word': vocabulary[0],
+            'rare word': vocabulary[-1],
+            'two words': '%s %s' % (vocabulary[5], vocabulary[50]),
+            'no match': 'introuvable',
+        }
+        print('%-12s %10s %6s' % ('query', 'time', 'hits'))
+        for name, query in queries.items():
+            seconds, hits = time_query(query, args.repeat)
+            print('%-12s %7.1f ms %6d' % (name, seconds * 1000, hits))
+    finally:
+        runner.teardown_databases(old_config)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+/api/projects/timeline/ response time over a synthetic portfolio.
+
+    python benchmarks/timeline.py [--projects 1000] [--milestones 100000]
+
+Half of the milestones are etats d'avancement of the projects, half suivis
+of their sous-projets; a quarter of them are not reached yet. The rows are
+created in a throwaway test database (set up by the project's TEST_RUNNER),
+never in the configured one.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backendpfe.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.test.utils import get_runner  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from accounts.models import EtatDavancementDeprojet, Projet, SousProjet, SuivieSousProjet, Utilisateur  # noqa: E402
+
+
+def random_dates(rng):
+    planned = date(2023, 1, 1) + timedelta(days=rng.randint(0, 1000))
+    if rng.random() < 0.25:
+        return planned, None
+    return planned, planned + timedelta(days=int(rng.gauss(10, 20)))
+
+
+def create_portfolio(projects, milestones, rng):
+    Projet.objects.bulk_create([
+        Projet(nom_projet='Projet %d' % index, description_de_projet='Benchmark', statut='en cours',
+               date_debut_de_projet=date(2023, 1, 1), date_fin_de_projet=date(2025, 12, 31))
+        for index in range(projects)
+    ])
+    projet_ids = list(Projet.objects.values_list('pk', flat=True))
+    SousProjet.objects.bulk_create([
+        SousProjet(nom_sous_projet='Lot %d' % index, id_projet_id=rng.choice(projet_ids), statut_sous_projet='en cours',
+                   date_debut_sousprojet=date(2023, 1, 1), date_finsousprojet=date(2025, 12, 31))
+        for index in range(projects * 3)
+    ], batch_size=5000)
+    sous_projet_ids = list(SousProjet.objects.values_list('pk', flat=True))
+
+    etats, suivis = [], []
+    for index in range(milestones // 2):
+        planned, actual = random_dates(rng)
+        etats.append(EtatDavancementDeprojet(type_etat='etat %d' % index, id_projet_id=rng.choice(projet_ids),
+                                             date_prevu=planned, date_realiser=actual))
+        planned, actual = random_dates(rng)
+        suivis.append(SuivieSousProjet(description_suivie_sousprojet='suivi %d' % index,
+                                       id_sous_projet_id=rng.choice(sous_projet_ids),
+                                       date_prevu=planned, date_realiser=actual))
+    EtatDavancementDeprojet.objects.bulk_create(etats, batch_size=5000)
+    SuivieSousProjet.objects.bulk_create(suivis, batch_size=5000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--projects', type=int, default=1000)
+    parser.add_argument('--milestones', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    runner = get_runner(settings)(verbosity=0)
+    runner.setup_test_environment()  # Lets the test client in (ALLOWED_HOSTS).
+    old_config = runner.setup_databases()
+    try:
+        create_portfolio(args.projects, args.milestones, random.Random(42))
+        client = APIClient()
+        client.force_authenticate(Utilisateur.objects.create_user('bench@example.com', 'secret', nom='Bench'))
+
+        for per_page in (10, 100):
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                response = client.get('/api/projects/timeline/', {'per_page': per_page})
+                timings.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.content
+            print('per_page=%-4d %7.1f ms' % (per_page, min(timings) * 1000))
+        stats = response.json()['stats']
+        print('%d milestones, %d late, mean %s days, p90 %s days' % (
+            stats['milestones'], stats['late'], stats['mean_delay_days'], stats['p90_delay_days']))
+    finally:
+        runner.teardown_databases(old_config)
+        runner.teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
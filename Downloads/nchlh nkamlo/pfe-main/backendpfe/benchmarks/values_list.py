@@ -0,0 +1,74 @@
+"""
+List serialization: ModelSerializer(many=True) on model instances against
+ValuesListSerializer on values_list() rows, query included.
+
+    python benchmarks/values_list.py [--rows 1000 10000 100000]
+
+The rows are created in a throwaway test database (set up by the
+project's TEST_RUNNER), never in the configured one.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backendpfe.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.test.utils import get_runner  # noqa: E402
+from accounts.models import Projet  # noqa: E402
+from accounts.serializers import ProjetSerializer  # noqa: E402
+from accounts.serializers.values_list_serializer import ValuesListSerializer  # noqa: E402
+
+
+def create_projets(count):
+    Projet.objects.all().delete()
+    Projet.objects.bulk_create([
+        Projet(nom_projet='Projet %d' % index, description_de_projet='Route nationale %d' % (index % 58),
+               date_debut_de_projet=date(2024, 1, 1), date_fin_de_projet=date(2025, 6, 30), statut='en cours')
+        for index in range(count)
+    ], batch_size=500)
+
+
+def best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    runner = get_runner(settings)(verbosity=0)
+    old_config = runner.setup_databases()
+    try:
+        queryset = Projet.objects.order_by('-id_projet')
+        fast = ValuesListSerializer(ProjetSerializer)
+        columns = fast.get_columns(queryset)
+
+        print('%8s %16s %16s %8s' % ('rows', 'ModelSerializer', 'values_list', 'speedup'))
+        for count in args.rows:
+            create_projets(count)
+            model_time = best_time(lambda: ProjetSerializer(queryset.all(), many=True).data, args.repeat)
+            fast_time = best_time(
+                lambda: fast.to_representation(queryset.values_list(*columns, named=True)), args.repeat)
+            print('%8d %13.1f ms %13.1f ms %7.1fx' % (count, model_time * 1000, fast_time * 1000,
+                                                       model_time / fast_time))
+    finally:
+        runner.teardown_databases(old_config)
+
+
+if __name__ == '__main__':
+    main()